@@ -2,28 +2,35 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Awaitable, Callable, Iterable
 from typing import Any
 
 from homeassistant.components.frontend import (
     add_extra_js_url,
     async_register_built_in_panel,
     async_remove_panel,
+    remove_extra_js_url,
 )
 from homeassistant.components.http import StaticPathConfig
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, Event, callback
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
+    EVENT_PERMISSIONS_CHANGED,
+    MIGRATION_VERSION,
     PANEL_ICON,
     PANEL_TITLE,
     PANEL_TITLE_ZH,
     PANEL_URL,
-    PANEL_VERSION,
     PERM_CLOSED,
     PREFIX_AREA,
+    PREFIX_DEVICE,
+    PREFIX_FLOOR,
     PREFIX_LABEL,
     PREFIX_PANEL,
     STORAGE_KEY,
@@ -33,16 +40,37 @@ from .const import (
     CONTROL_PANEL_TITLE,
     CONTROL_PANEL_TITLE_ZH,
     CONTROL_PANEL_ICON,
+    CONTROL_PANEL_CHUNKS,
+    FRONTEND_FILES,
 )
+from .assets import async_setup_assets
+from .audit import AuditLog, async_audit
+from .coalesce import SingleFlight
+from .index import ScopeIndex
+from .ratelimit import RateLimiter
+from .roles import (
+    async_get_effective_permissions,
+    async_get_role_members,
+    async_invalidate_effective_permissions,
+)
+from .scheduler import PermissionScheduler, is_schedule_active
+from .snapshots import PermissionSnapshots, diff_permissions
+from .stats import HandlerStats, instrument_mutation
+from .summary import ScopeSummaries
+from .sweeper import Orphans, OrphanSweeper
+from .tracing import Tracer
 from .websocket_api import async_register_websocket_api
 
 _LOGGER = logging.getLogger(__name__)
 
+# Diagnostic statistics sensors (disabled by default)
+PLATFORMS = [Platform.SENSOR]
+
 async def _async_cleanup_obsolete_permissions(hass: HomeAssistant) -> None:
     """Remove orphaned script, automation, and custom permission entities.
 
     These resource types were discovered but never enforced in prior versions.
-    This cleanup runs once on component load to remove any leftover entities.
+    This is migration 1 and runs once; see _MIGRATIONS.
     """
     entity_registry = er.async_get(hass)
     entities_to_remove = []
@@ -82,6 +110,71 @@ async def _async_cleanup_obsolete_permissions(hass: HomeAssistant) -> None:
         _LOGGER.debug("No obsolete permission entities found")
 
 
+async def _async_migrate_scheduled_grants(hass: HomeAssistant) -> None:
+    """Remove the grants schedules wrote into the direct permissions.
+
+    Scheduled grants used to be written into the user's direct grants
+    (the schedule's level inside the window, Closed outside it). They are
+    now a separate layer (see scheduler.py), so cells still holding the
+    value a schedule would have written are removed and the schedule alone
+    decides the access. This is migration 2 and runs once; see _MIGRATIONS.
+    """
+    domain_data = hass.data[DOMAIN]
+    permissions = domain_data.get("permissions", {})
+    now = dt_util.utcnow()
+    changed_users: set[str] = set()
+    for schedule in domain_data.get("schedules", {}).values():
+        user_id = schedule["user_id"]
+        resource_id = schedule["resource_id"]
+        user_perms = permissions.get(user_id, {})
+        if resource_id not in user_perms:
+            continue
+        written = schedule["level"] if is_schedule_active(schedule, now) else PERM_CLOSED
+        if user_perms[resource_id] == written:
+            del user_perms[resource_id]
+            changed_users.add(user_id)
+
+    if changed_users:
+        _LOGGER.info(
+            "Moved scheduled grants of %d users out of their direct permissions",
+            len(changed_users),
+        )
+        async_invalidate_effective_permissions(hass, changed_users)
+        async_notify_permissions_changed(hass, changed_users)
+
+
+# Data migrations: (version, migration). Each runs once, in order, in a
+# background task after setup; the version reached is saved to the Store.
+_MIGRATIONS: tuple[tuple[int, Callable[[HomeAssistant], Awaitable[None]]], ...] = (
+    (1, _async_cleanup_obsolete_permissions),
+    (2, _async_migrate_scheduled_grants),
+)
+
+
+async def _async_run_migrations(hass: HomeAssistant, from_version: int) -> None:
+    """Run pending migrations and record each one as completed.
+
+    Args:
+        hass: Home Assistant instance.
+        from_version: Migration version recorded in the Store.
+    """
+    for version, migration in _MIGRATIONS:
+        if version <= from_version:
+            continue
+        _LOGGER.info("Running permission data migration %d", version)
+        try:
+            await migration(hass)
+        except Exception:
+            _LOGGER.exception("Permission data migration %d failed", version)
+            return
+        domain_data = hass.data.get(DOMAIN)
+        if domain_data is None:
+            # Unloaded while migrating
+            return
+        domain_data["migration_version"] = version
+        await async_save_permissions(hass)
+
+
 def _get_panel_title(hass: HomeAssistant) -> str:
     """Get panel title based on HA language setting."""
     language = hass.config.language or "en"
@@ -115,6 +208,8 @@ def _get_frontend_panels(hass: HomeAssistant) -> dict[str, Any]:
 # Event types
 EVENT_AREA_REGISTRY_UPDATED = "area_registry_updated"
 EVENT_LABEL_REGISTRY_UPDATED = "label_registry_updated"
+EVENT_FLOOR_REGISTRY_UPDATED = "floor_registry_updated"
+EVENT_DEVICE_REGISTRY_UPDATED = "device_registry_updated"
 EVENT_USER_ADDED = "user_added"
 EVENT_USER_REMOVED = "user_removed"
 EVENT_USER_UPDATED = "user_updated"
@@ -130,6 +225,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN]["entry"] = entry
     hass.data[DOMAIN]["unsubscribe"] = []
+    hass.data[DOMAIN]["stats"] = HandlerStats()
+    hass.data[DOMAIN]["tracer"] = Tracer()
+    hass.data[DOMAIN]["rate_limiter"] = RateLimiter()
 
     # Initialize Store for persistent permission storage
     store = Store[dict[str, Any]](hass, STORAGE_VERSION, STORAGE_KEY)
@@ -139,16 +237,69 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     stored_data = await store.async_load()
     if stored_data is not None:
         hass.data[DOMAIN]["permissions"] = stored_data.get("permissions", {})
+        hass.data[DOMAIN]["roles"] = stored_data.get("roles", {})
+        hass.data[DOMAIN]["schedules"] = stored_data.get("schedules", {})
         _LOGGER.debug(
-            "Loaded %d user permission sets from storage",
-            len(hass.data[DOMAIN]["permissions"])
+            "Loaded %d user permission sets, %d roles and %d schedules from storage",
+            len(hass.data[DOMAIN]["permissions"]),
+            len(hass.data[DOMAIN]["roles"]),
+            len(hass.data[DOMAIN]["schedules"]),
         )
     else:
+        stored_data = {}
         hass.data[DOMAIN]["permissions"] = {}
+        hass.data[DOMAIN]["roles"] = {}
+        hass.data[DOMAIN]["schedules"] = {}
         _LOGGER.debug("No existing permissions found, starting fresh")
 
-    # Cleanup obsolete script/automation permission entities (v1.0.0 migration)
-    await _async_cleanup_obsolete_permissions(hass)
+    # Compiled per-user view of direct grants + role grants
+    hass.data[DOMAIN]["effective_permissions"] = {}
+
+    # Run pending data migrations (e.g. v1.0.0 obsolete entity cleanup) in
+    # the background; completed ones are skipped on later starts
+    migration_version = stored_data.get("migration_version", 0)
+    hass.data[DOMAIN]["migration_version"] = migration_version
+    if migration_version < MIGRATION_VERSION:
+        entry.async_create_background_task(
+            hass,
+            _async_run_migrations(hass, migration_version),
+            f"{DOMAIN} data migrations",
+        )
+    else:
+        _LOGGER.debug("Permission data is up to date (migration %d)", migration_version)
+
+    # Audit log of permission changes (segments in the config directory)
+    audit = AuditLog(hass)
+    hass.data[DOMAIN]["unsubscribe"].append(await audit.async_load())
+    hass.data[DOMAIN]["audit"] = audit
+
+    # Named snapshots of the permission matrix for rollback
+    snapshots = PermissionSnapshots(hass)
+    await snapshots.async_load()
+    hass.data[DOMAIN]["snapshots"] = snapshots
+
+    # Apply time-windowed grants; one timer wakes at the next transition
+    scheduler = PermissionScheduler(hass)
+    hass.data[DOMAIN]["scheduler"] = scheduler
+    hass.data[DOMAIN]["unsubscribe"].append(scheduler.async_start())
+
+    # Build the registry index used by the WebSocket API
+    index = ScopeIndex(hass)
+    hass.data[DOMAIN]["unsubscribe"].extend(index.async_setup())
+    hass.data[DOMAIN]["index"] = index
+
+    # Live per-area/label state rollups for the control panel
+    summaries = ScopeSummaries(hass, index)
+    hass.data[DOMAIN]["unsubscribe"].extend(summaries.async_setup())
+    hass.data[DOMAIN]["summaries"] = summaries
+
+    # Removes grants of users and resources deleted while not loaded
+    sweeper = OrphanSweeper(hass)
+    hass.data[DOMAIN]["unsubscribe"].append(sweeper.async_start())
+    hass.data[DOMAIN]["sweeper"] = sweeper
+
+    # Shares identical concurrent queries (e.g. reconnect bursts)
+    hass.data[DOMAIN]["single_flight"] = SingleFlight(hass)
 
     # Register WebSocket API
     async_register_websocket_api(hass)
@@ -159,6 +310,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Set up event listeners for auto-refresh
     await _async_setup_listeners(hass)
 
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
     _LOGGER.info("ha_permission_manager setup complete")
     return True
 
@@ -167,6 +320,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     _LOGGER.info("Unloading ha_permission_manager")
 
+    if not await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        return False
+
     # Unsubscribe from all event listeners (with safety check)
     domain_data = hass.data.get(DOMAIN, {})
     for unsub in domain_data.get("unsubscribe", []):
@@ -176,6 +332,16 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     async_remove_panel(hass, PANEL_URL)
     async_remove_panel(hass, CONTROL_PANEL_URL)
 
+    # Write audit entries still waiting for a flush
+    if (audit := domain_data.get("audit")) is not None:
+        await audit.async_flush()
+
+    # Remove extra JS (URLs change with file contents)
+    asset_urls = domain_data.get("asset_urls", {})
+    for filename in ("ha_sidebar_filter.js", "ha_lovelace_filter.js"):
+        if filename in asset_urls:
+            remove_extra_js_url(hass, asset_urls[filename])
+
     # Clean up stored data
     hass.data.pop(DOMAIN, None)
 
@@ -185,6 +351,13 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def _async_setup_listeners(hass: HomeAssistant) -> None:
     """Set up event listeners for registry changes."""
 
+    @callback
+    def _bump_admin_revision() -> None:
+        """Mark cached admin data (users and panels) as outdated."""
+        domain_data = hass.data.get(DOMAIN)
+        if domain_data is not None:
+            domain_data["admin_revision"] = domain_data.get("admin_revision", 0) + 1
+
     async def _handle_area_registry_update(event: Event) -> None:
         """Handle area registry changes."""
         try:
@@ -215,9 +388,39 @@ async def _async_setup_listeners(hass: HomeAssistant) -> None:
         except Exception:
             _LOGGER.exception("Error handling label registry update")
 
+    async def _handle_floor_registry_update(event: Event) -> None:
+        """Handle floor registry changes."""
+        try:
+            action = event.data.get("action")
+            floor_id = event.data.get("floor_id")
+
+            _LOGGER.debug("Floor registry update: action=%s, floor_id=%s", action, floor_id)
+
+            if action == "remove":
+                resource_id = f"{PREFIX_FLOOR}{floor_id}"
+                # Clean up permissions from Store
+                await async_delete_resource_permissions(hass, resource_id)
+        except Exception:
+            _LOGGER.exception("Error handling floor registry update")
+
+    async def _handle_device_registry_update(event: Event) -> None:
+        """Handle device registry changes."""
+        try:
+            action = event.data.get("action")
+            device_id = event.data.get("device_id")
+
+            if action == "remove":
+                _LOGGER.debug("Device removed: device_id=%s", device_id)
+                resource_id = f"{PREFIX_DEVICE}{device_id}"
+                # Clean up permissions from Store
+                await async_delete_resource_permissions(hass, resource_id)
+        except Exception:
+            _LOGGER.exception("Error handling device registry update")
+
     async def _handle_user_added(event: Event) -> None:
         """Handle new user added."""
         try:
+            _bump_admin_revision()
             user_id = event.data.get("user_id")
             _LOGGER.debug("User added: user_id=%s", user_id)
             # New users will be visible in the permission manager UI
@@ -228,6 +431,7 @@ async def _async_setup_listeners(hass: HomeAssistant) -> None:
     async def _handle_user_removed(event: Event) -> None:
         """Handle user removed."""
         try:
+            _bump_admin_revision()
             user_id = event.data.get("user_id")
             _LOGGER.debug("User removed: user_id=%s", user_id)
 
@@ -240,6 +444,7 @@ async def _async_setup_listeners(hass: HomeAssistant) -> None:
     async def _handle_user_updated(event: Event) -> None:
         """Handle user updated (including admin status and name changes)."""
         try:
+            _bump_admin_revision()
             user_id = event.data.get("user_id")
             _LOGGER.debug("User updated event: user_id=%s", user_id)
             # User info changes are reflected in permission manager UI dynamically
@@ -271,6 +476,7 @@ async def _async_setup_listeners(hass: HomeAssistant) -> None:
     async def _handle_panels_updated(event: Event) -> None:
         """Handle panel registry changes - clean up deleted panels."""
         try:
+            _bump_admin_revision()
             _LOGGER.debug("Panels updated event received")
             # Panel deletion cleanup is handled via lovelace_updated event
             # This handler is kept for potential future use
@@ -284,6 +490,12 @@ async def _async_setup_listeners(hass: HomeAssistant) -> None:
     unsub_label = hass.bus.async_listen(
         EVENT_LABEL_REGISTRY_UPDATED, _handle_label_registry_update
     )
+    unsub_floor = hass.bus.async_listen(
+        EVENT_FLOOR_REGISTRY_UPDATED, _handle_floor_registry_update
+    )
+    unsub_device = hass.bus.async_listen(
+        EVENT_DEVICE_REGISTRY_UPDATED, _handle_device_registry_update
+    )
     unsub_user_added = hass.bus.async_listen(
         EVENT_USER_ADDED, _handle_user_added
     )
@@ -304,6 +516,8 @@ async def _async_setup_listeners(hass: HomeAssistant) -> None:
     hass.data[DOMAIN]["unsubscribe"].extend([
         unsub_area,
         unsub_label,
+        unsub_floor,
+        unsub_device,
         unsub_user_added,
         unsub_user_removed,
         unsub_user_updated,
@@ -311,50 +525,29 @@ async def _async_setup_listeners(hass: HomeAssistant) -> None:
         unsub_panels,
     ])
 
-    _LOGGER.debug("Event listeners registered for area, label, user, lovelace, panels")
+    _LOGGER.debug(
+        "Event listeners registered for area, label, floor, device, user, lovelace, panels"
+    )
 
 
 async def _async_register_panel(hass: HomeAssistant) -> None:
     """Register the frontend panels."""
-    # Register static path for JS files (skip if already registered)
+    # Serve content-hashed, precompressed JS with immutable cache headers
+    asset_urls = await async_setup_assets(hass)
+    hass.data[DOMAIN]["asset_urls"] = asset_urls
+
+    # Legacy unhashed paths, kept for clients that still reference them
+    # (skip if already registered)
     try:
         await hass.http.async_register_static_paths([
             StaticPathConfig(
-                "/local/ha_permission_manager.js",
-                hass.config.path(
-                    "custom_components/ha_permission_manager/www/ha_permission_manager.js"
-                ),
-                False,
-            ),
-            StaticPathConfig(
-                "/local/ha_sidebar_filter.js",
-                hass.config.path(
-                    "custom_components/ha_permission_manager/www/ha_sidebar_filter.js"
-                ),
-                False,
-            ),
-            StaticPathConfig(
-                "/local/ha_access_denied.js",
-                hass.config.path(
-                    "custom_components/ha_permission_manager/www/ha_access_denied.js"
-                ),
-                False,
-            ),
-            StaticPathConfig(
-                "/local/ha_lovelace_filter.js",
-                hass.config.path(
-                    "custom_components/ha_permission_manager/www/ha_lovelace_filter.js"
-                ),
-                False,
-            ),
-            # Unified Control Panel JS
-            StaticPathConfig(
-                "/local/ha_control_panel.js",
+                f"/local/{filename}",
                 hass.config.path(
-                    "custom_components/ha_permission_manager/www/ha_control_panel.js"
+                    f"custom_components/ha_permission_manager/www/{filename}"
                 ),
                 False,
-            ),
+            )
+            for filename in FRONTEND_FILES
         ])
     except RuntimeError:
         # Path already registered from previous load
@@ -372,7 +565,7 @@ async def _async_register_panel(hass: HomeAssistant) -> None:
             config={
                 "_panel_custom": {
                     "name": "ha-permission-manager",
-                    "module_url": f"/local/ha_permission_manager.js?v={PANEL_VERSION}",
+                    "module_url": asset_urls["ha_permission_manager.js"],
                 }
             },
             require_admin=True,
@@ -390,18 +583,23 @@ async def _async_register_panel(hass: HomeAssistant) -> None:
             config={
                 "_panel_custom": {
                     "name": "ha-control-panel",
-                    "module_url": f"/local/ha_control_panel.js?v={PANEL_VERSION}",
-                }
+                    "module_url": asset_urls["ha_control_panel.js"],
+                },
+                # Hashed URLs of the lazily imported panel chunks
+                "chunk_urls": {
+                    filename: asset_urls[filename]
+                    for filename in CONTROL_PANEL_CHUNKS
+                },
             },
             require_admin=False,
         )
 
     # Register sidebar filter as extra JS (runs on every page)
-    # Use version query param for cache busting
-    add_extra_js_url(hass, f"/local/ha_sidebar_filter.js?v={PANEL_VERSION}")
+    # Content-hashed URL changes whenever the file does
+    add_extra_js_url(hass, asset_urls["ha_sidebar_filter.js"])
 
     # Register lovelace filter as extra JS (runs on every page)
-    add_extra_js_url(hass, f"/local/ha_lovelace_filter.js?v={PANEL_VERSION}")
+    add_extra_js_url(hass, asset_urls["ha_lovelace_filter.js"])
 
     _LOGGER.debug("Frontend panels registered")
 
@@ -422,24 +620,31 @@ async def async_get_permission(
         resource_id: The resource ID (e.g., "area_living_room", "panel_config").
 
     Returns:
-        Permission level (0=Closed, 1=View). Defaults to PERM_CLOSED if not set.
+        Permission level (0=Closed, 1=View), including grants from the
+        user's roles. Defaults to PERM_CLOSED if not set.
     """
-    domain_data = hass.data.get(DOMAIN, {})
-    permissions = domain_data.get("permissions", {})
-    user_perms = permissions.get(user_id, {})
+    user_perms = async_get_effective_permissions(hass, user_id)
     return user_perms.get(resource_id, PERM_CLOSED)
 
 
+@instrument_mutation
 async def async_set_permission(
-    hass: HomeAssistant, user_id: str, resource_id: str, level: int
+    hass: HomeAssistant,
+    user_id: str,
+    resource_id: str,
+    level: int,
+    *,
+    actor_id: str | None = None,
 ) -> None:
     """Set permission level for a user and resource.
 
     Args:
         hass: Home Assistant instance.
         user_id: The user ID to set permission for.
-        resource_id: The resource ID (e.g., "area_living_room", "panel_config").
+        resource_id: The resource ID (e.g., "area_living_room", "panel_config",
+            "floor_ground").
         level: Permission level (0=Closed, 1=View).
+        actor_id: The admin making the change (for the audit log).
     """
     domain_data = hass.data.get(DOMAIN, {})
     permissions = domain_data.setdefault("permissions", {})
@@ -447,7 +652,14 @@ async def async_set_permission(
     if user_id not in permissions:
         permissions[user_id] = {}
 
+    old_level = permissions[user_id].get(resource_id)
     permissions[user_id][resource_id] = level
+    async_audit(
+        hass, "set_permission", actor=actor_id, user_id=user_id,
+        resource_id=resource_id, old=old_level, new=level,
+    )
+    async_invalidate_effective_permissions(hass, [user_id])
+    async_notify_permissions_changed(hass, [user_id])
     _LOGGER.debug(
         "Set permission: user=%s, resource=%s, level=%d",
         user_id, resource_id, level
@@ -473,7 +685,9 @@ def async_get_all_permissions(hass: HomeAssistant) -> dict[str, dict[str, int]]:
 
 @callback
 def async_get_user_permissions(hass: HomeAssistant, user_id: str) -> dict[str, int]:
-    """Get all permissions for a specific user.
+    """Get all effective permissions for a specific user.
+
+    Direct grants are merged with the grants of the user's roles.
 
     Args:
         hass: Home Assistant instance.
@@ -482,11 +696,10 @@ def async_get_user_permissions(hass: HomeAssistant, user_id: str) -> dict[str, i
     Returns:
         Dictionary mapping resource_id -> permission_level.
     """
-    domain_data = hass.data.get(DOMAIN, {})
-    permissions = domain_data.get("permissions", {})
-    return permissions.get(user_id, {})
+    return async_get_effective_permissions(hass, user_id)
 
 
+@instrument_mutation
 async def async_delete_user_permissions(hass: HomeAssistant, user_id: str) -> None:
     """Delete all permissions for a user.
 
@@ -498,19 +711,37 @@ async def async_delete_user_permissions(hass: HomeAssistant, user_id: str) -> No
     """
     domain_data = hass.data.get(DOMAIN, {})
     permissions = domain_data.get("permissions", {})
+    roles = domain_data.get("roles", {})
 
+    modified = False
     if user_id in permissions:
         del permissions[user_id]
+        modified = True
+
+    for role in roles.values():
+        if user_id in role["members"]:
+            role["members"].remove(user_id)
+            modified = True
+
+    if _async_remove_schedules(
+        hass, lambda schedule: schedule["user_id"] == user_id
+    ):
+        modified = True
+
+    if modified:
+        async_invalidate_effective_permissions(hass, [user_id])
+        async_audit(hass, "delete_user", user_id=user_id)
         _LOGGER.info("Deleted all permissions for user: %s", user_id)
         await async_save_permissions(hass)
 
 
+@instrument_mutation
 async def async_delete_resource_permissions(
     hass: HomeAssistant, resource_id: str
 ) -> None:
     """Delete permissions for a resource from all users.
 
-    Called when a resource (area, label, panel) is removed.
+    Called when a resource (area, label, floor, device, panel) is removed.
 
     Args:
         hass: Home Assistant instance.
@@ -519,17 +750,458 @@ async def async_delete_resource_permissions(
     domain_data = hass.data.get(DOMAIN, {})
     permissions = domain_data.get("permissions", {})
 
+    roles = domain_data.get("roles", {})
+
     modified = False
     for user_id in permissions:
         if resource_id in permissions[user_id]:
             del permissions[user_id][resource_id]
             modified = True
 
+    for role in roles.values():
+        if resource_id in role["permissions"]:
+            del role["permissions"][resource_id]
+            modified = True
+
+    if _async_remove_schedules(
+        hass, lambda schedule: schedule["resource_id"] == resource_id
+    ):
+        modified = True
+
     if modified:
+        async_invalidate_effective_permissions(hass)
+        async_notify_permissions_changed(hass, permissions)
+        async_audit(hass, "delete_resource", resource_id=resource_id)
         _LOGGER.info("Deleted permissions for resource: %s", resource_id)
         await async_save_permissions(hass)
 
 
+@callback
+def async_get_roles(hass: HomeAssistant) -> dict[str, dict[str, Any]]:
+    """Get all roles from storage.
+
+    Args:
+        hass: Home Assistant instance.
+
+    Returns:
+        Dictionary mapping role_id -> {name, permissions, members}.
+    """
+    domain_data = hass.data.get(DOMAIN, {})
+    return domain_data.get("roles", {})
+
+
+@instrument_mutation
+async def async_save_role(
+    hass: HomeAssistant,
+    role_id: str,
+    name: str,
+    permissions: dict[str, int] | None = None,
+    members: list[str] | None = None,
+    *,
+    actor_id: str | None = None,
+) -> None:
+    """Create or update a role.
+
+    Only the compiled permissions of users that were or are members of the
+    role are recomputed.
+
+    Args:
+        hass: Home Assistant instance.
+        role_id: The role ID.
+        name: Display name of the role.
+        permissions: Resource grants (resource_id -> level); unchanged if None.
+        members: Member user IDs; unchanged if None.
+        actor_id: The admin making the change (for the audit log).
+    """
+    domain_data = hass.data.get(DOMAIN, {})
+    roles = domain_data.setdefault("roles", {})
+
+    affected = async_get_role_members(hass, role_id)
+    role = roles.setdefault(role_id, {"name": name, "permissions": {}, "members": []})
+    role["name"] = name
+    if permissions is not None:
+        role["permissions"] = dict(permissions)
+    if members is not None:
+        role["members"] = sorted(set(members))
+    affected.update(role["members"])
+
+    async_invalidate_effective_permissions(hass, affected)
+    async_notify_permissions_changed(hass, affected)
+    async_audit(
+        hass, "save_role", actor=actor_id, role_id=role_id,
+        permissions=dict(role["permissions"]), members=list(role["members"]),
+    )
+    _LOGGER.debug(
+        "Saved role %s: %d grants, %d members",
+        role_id, len(role["permissions"]), len(role["members"])
+    )
+    await async_save_permissions(hass)
+
+
+@instrument_mutation
+async def async_delete_role(
+    hass: HomeAssistant, role_id: str, *, actor_id: str | None = None
+) -> None:
+    """Delete a role.
+
+    Args:
+        hass: Home Assistant instance.
+        role_id: The role ID to delete.
+        actor_id: The admin making the change (for the audit log).
+    """
+    domain_data = hass.data.get(DOMAIN, {})
+    roles = domain_data.get("roles", {})
+
+    if role_id in roles:
+        affected = async_get_role_members(hass, role_id)
+        del roles[role_id]
+        async_invalidate_effective_permissions(hass, affected)
+        async_notify_permissions_changed(hass, affected)
+        async_audit(hass, "delete_role", actor=actor_id, role_id=role_id)
+        _LOGGER.info("Deleted role: %s", role_id)
+        await async_save_permissions(hass)
+
+
+@callback
+def async_get_schedules(hass: HomeAssistant) -> dict[str, dict[str, Any]]:
+    """Get all permission schedules from storage.
+
+    Args:
+        hass: Home Assistant instance.
+
+    Returns:
+        Dictionary mapping schedule_id -> schedule (see scheduler.py).
+    """
+    domain_data = hass.data.get(DOMAIN, {})
+    return domain_data.get("schedules", {})
+
+
+@instrument_mutation
+async def async_save_schedule(
+    hass: HomeAssistant,
+    schedule_id: str,
+    user_id: str,
+    resource_id: str,
+    level: int,
+    valid_from: str | None = None,
+    valid_until: str | None = None,
+    recurrence: dict[str, Any] | None = None,
+    *,
+    actor_id: str | None = None,
+) -> None:
+    """Create or update a time-windowed grant.
+
+    The grant is applied right away; later transitions are applied by the
+    scheduler. Scheduled grants are kept apart from the direct grants.
+
+    Args:
+        hass: Home Assistant instance.
+        schedule_id: The schedule ID.
+        user_id: The user the grant applies to.
+        resource_id: The granted resource ID.
+        level: Permission level inside the window.
+        valid_from: ISO datetime the grant starts, or None.
+        valid_until: ISO datetime the grant ends, or None.
+        recurrence: Weekly window {weekdays, start, end}, or None.
+        actor_id: The admin making the change (for the audit log).
+    """
+    domain_data = hass.data.get(DOMAIN, {})
+    schedules = domain_data.setdefault("schedules", {})
+
+    schedules[schedule_id] = {
+        "user_id": user_id,
+        "resource_id": resource_id,
+        "level": level,
+        "valid_from": valid_from,
+        "valid_until": valid_until,
+        "recurrence": recurrence,
+    }
+    async_audit(
+        hass, "save_schedule", actor=actor_id, user_id=user_id,
+        resource_id=resource_id, new=level, schedule_id=schedule_id,
+        valid_from=valid_from, valid_until=valid_until, recurrence=recurrence,
+    )
+    _LOGGER.debug(
+        "Saved schedule %s: user=%s, resource=%s, level=%d",
+        schedule_id, user_id, resource_id, level
+    )
+
+    if (scheduler := domain_data.get("scheduler")) is not None:
+        scheduler.async_schedule_updated(schedule_id)
+    await async_save_permissions(hass)
+
+
+@instrument_mutation
+async def async_delete_schedule(
+    hass: HomeAssistant, schedule_id: str, *, actor_id: str | None = None
+) -> None:
+    """Delete a time-windowed grant.
+
+    If the schedule is active, its grant is revoked right away: the
+    scheduler drops it from the scheduled layer, invalidates the user's
+    effective permissions and fires EVENT_PERMISSIONS_CHANGED. The user's
+    direct grant for the resource, if any, is not affected.
+
+    Args:
+        hass: Home Assistant instance.
+        schedule_id: The schedule ID to delete.
+        actor_id: The admin making the change (for the audit log).
+    """
+    domain_data = hass.data.get(DOMAIN, {})
+    schedules = domain_data.get("schedules", {})
+
+    if schedule_id in schedules:
+        schedule = schedules.pop(schedule_id)
+        async_audit(
+            hass, "delete_schedule", actor=actor_id, user_id=schedule["user_id"],
+            resource_id=schedule["resource_id"], schedule_id=schedule_id,
+        )
+        if (scheduler := domain_data.get("scheduler")) is not None:
+            scheduler.async_schedule_updated(schedule_id)
+        _LOGGER.info("Deleted schedule: %s", schedule_id)
+        await async_save_permissions(hass)
+
+
+@callback
+def _async_remove_schedules(
+    hass: HomeAssistant, predicate: Callable[[dict[str, Any]], bool]
+) -> bool:
+    """Remove schedules matching predicate; return True if any were removed."""
+    domain_data = hass.data.get(DOMAIN, {})
+    schedules = domain_data.get("schedules", {})
+    scheduler = domain_data.get("scheduler")
+
+    removed = [
+        schedule_id for schedule_id, schedule in schedules.items()
+        if predicate(schedule)
+    ]
+    for schedule_id in removed:
+        del schedules[schedule_id]
+    if removed and scheduler is not None:
+        scheduler.async_schedules_updated(removed)
+    return bool(removed)
+
+
+@instrument_mutation
+async def async_import_data(
+    hass: HomeAssistant,
+    permissions: dict[str, dict[str, int]],
+    roles: dict[str, dict[str, Any]],
+    schedules: dict[str, dict[str, Any]],
+    *,
+    replace: bool = False,
+    actor_id: str | None = None,
+) -> None:
+    """Apply validated imported data as one batched mutation.
+
+    Everything is applied before the caches are invalidated, one change
+    event is fired and one save is scheduled.
+
+    Args:
+        hass: Home Assistant instance.
+        permissions: User grants (user_id -> {resource_id: level}).
+        roles: Roles (role_id -> {name, permissions, members}).
+        schedules: Schedules (schedule_id -> schedule, see scheduler.py).
+        replace: Replace all stored data instead of merging into it.
+        actor_id: The admin making the change (for the audit log).
+    """
+    domain_data = hass.data.get(DOMAIN, {})
+    if (snapshots := domain_data.get("snapshots")) is not None:
+        snapshots.async_create("Before import", auto=True)
+
+    stored_permissions = domain_data.setdefault("permissions", {})
+    stored_roles = domain_data.setdefault("roles", {})
+    stored_schedules = domain_data.setdefault("schedules", {})
+
+    affected: set[str] = set(permissions)
+    for role_id, role in roles.items():
+        affected.update(role["members"])
+        affected.update(stored_roles.get(role_id, {}).get("members", ()))
+    affected.update(schedule["user_id"] for schedule in schedules.values())
+    changed_schedules = set(schedules)
+
+    if replace:
+        affected.update(stored_permissions)
+        for role in stored_roles.values():
+            affected.update(role["members"])
+        changed_schedules.update(stored_schedules)
+        stored_permissions.clear()
+        stored_roles.clear()
+        stored_schedules.clear()
+
+    for user_id, grants in permissions.items():
+        stored_permissions.setdefault(user_id, {}).update(grants)
+    stored_roles.update(roles)
+    stored_schedules.update(schedules)
+
+    if (scheduler := domain_data.get("scheduler")) is not None:
+        scheduler.async_schedules_updated(changed_schedules)
+
+    async_invalidate_effective_permissions(hass)
+    async_notify_permissions_changed(hass, affected)
+    async_audit(
+        hass, "import", actor=actor_id, replace=replace,
+        permissions=len(permissions), roles=len(roles), schedules=len(schedules),
+    )
+    _LOGGER.info(
+        "Imported %d users, %d roles and %d schedules (replace=%s)",
+        len(permissions), len(roles), len(schedules), replace,
+    )
+    await async_save_permissions(hass)
+
+
+@instrument_mutation
+async def async_restore_snapshot(
+    hass: HomeAssistant, snapshot_id: str, *, actor_id: str | None = None
+) -> list[dict[str, Any]] | None:
+    """Restore the permission matrix of a snapshot.
+
+    The current matrix is snapshotted first, so a restore can be undone.
+    The restored matrix is built separately and replaces the live one in
+    a single assignment, followed by one save. Roles and schedules are
+    not part of snapshots and are left unchanged.
+
+    Args:
+        hass: Home Assistant instance.
+        snapshot_id: The snapshot to restore.
+        actor_id: The admin making the change (for the audit log).
+
+    Returns:
+        The changed cells (see snapshots.diff_permissions), or None if the
+        snapshot is unknown.
+    """
+    domain_data = hass.data.get(DOMAIN, {})
+    snapshots: PermissionSnapshots = domain_data["snapshots"]
+    restored = snapshots.async_get_permissions(snapshot_id)
+    if restored is None:
+        return None
+
+    current = domain_data.get("permissions", {})
+    changes = diff_permissions(current, restored)
+    if not changes:
+        return changes
+
+    snapshots.async_create("Before restore", auto=True)
+    domain_data["permissions"] = restored
+
+    affected = {change["user_id"] for change in changes}
+    async_invalidate_effective_permissions(hass, affected)
+    async_notify_permissions_changed(hass, affected)
+    async_audit(
+        hass, "restore_snapshot", actor=actor_id, snapshot_id=snapshot_id,
+        changes=len(changes),
+    )
+    _LOGGER.info("Restored snapshot %s: %d changes", snapshot_id, len(changes))
+    await async_save_permissions(hass)
+    return changes
+
+
+@instrument_mutation
+async def async_remove_orphans(hass: HomeAssistant, orphans: Orphans) -> dict[str, Any]:
+    """Remove entries for deleted users and resources as one batched change.
+
+    Entries are checked again before removal, since they may have changed
+    while the sweeper was scanning. The permissions are snapshotted first.
+
+    Args:
+        hass: Home Assistant instance.
+        orphans: Orphaned entries found by the sweeper.
+
+    Returns:
+        The removed entries: {permissions: {user_id: {resource_id: level}},
+        role_permissions: {role_id: {resource_id: level}}, role_members:
+        {role_id: [user_id]}, schedules: {schedule_id: schedule}}.
+    """
+    domain_data = hass.data.get(DOMAIN, {})
+    permissions = domain_data.get("permissions", {})
+    roles = domain_data.get("roles", {})
+    schedules = domain_data.get("schedules", {})
+    removed: dict[str, dict[str, Any]] = {
+        "permissions": {}, "role_permissions": {}, "role_members": {}, "schedules": {},
+    }
+
+    if (snapshots := domain_data.get("snapshots")) is not None:
+        snapshots.async_create("Before orphan cleanup", auto=True)
+
+    for user_id in orphans.users:
+        if user_id in permissions:
+            removed["permissions"][user_id] = permissions.pop(user_id)
+    for user_id, resource_id in orphans.cells:
+        user_perms = permissions.get(user_id, {})
+        if resource_id in user_perms:
+            removed["permissions"].setdefault(user_id, {})[resource_id] = (
+                user_perms.pop(resource_id)
+            )
+    for role_id, resource_id in orphans.role_cells:
+        grants = roles.get(role_id, {}).get("permissions", {})
+        if resource_id in grants:
+            removed["role_permissions"].setdefault(role_id, {})[resource_id] = (
+                grants.pop(resource_id)
+            )
+    for role_id, user_id in orphans.role_members:
+        members = roles.get(role_id, {}).get("members", [])
+        if user_id in members:
+            members.remove(user_id)
+            removed["role_members"].setdefault(role_id, []).append(user_id)
+    for schedule_id in orphans.schedules:
+        if schedule_id in schedules:
+            removed["schedules"][schedule_id] = schedules.pop(schedule_id)
+    if (scheduler := domain_data.get("scheduler")) is not None:
+        scheduler.async_schedules_updated(removed["schedules"])
+
+    if any(removed.values()):
+        affected = set(removed["permissions"]) - orphans.users
+        for role_id in removed["role_permissions"]:
+            affected.update(async_get_role_members(hass, role_id))
+        async_invalidate_effective_permissions(hass)
+        async_notify_permissions_changed(hass, affected)
+        async_audit(
+            hass, "remove_orphans", users=sorted(orphans.users),
+            resources=sorted(orphans.resources),
+        )
+        await async_save_permissions(hass)
+    return removed
+
+
+@callback
+def async_notify_permissions_changed(
+    hass: HomeAssistant, user_ids: Iterable[str]
+) -> None:
+    """Fire one event for a batch of permission changes.
+
+    Args:
+        hass: Home Assistant instance.
+        user_ids: Users whose effective permissions may have changed.
+    """
+    user_ids = sorted(user_ids)
+    if user_ids:
+        hass.bus.async_fire(EVENT_PERMISSIONS_CHANGED, {"user_ids": user_ids})
+
+
+@callback
+def async_get_store_data(hass: HomeAssistant) -> dict[str, Any]:
+    """Get the data persisted in the Store.
+
+    Args:
+        hass: Home Assistant instance.
+
+    Returns:
+        Dictionary with permissions, roles, schedules and migration_version.
+    """
+    return _get_store_data(hass.data.get(DOMAIN, {}))
+
+
+def _get_store_data(domain_data: dict[str, Any]) -> dict[str, Any]:
+    """Build the Store data from the integration's hass.data entry."""
+    return {
+        "permissions": domain_data.get("permissions", {}),
+        "roles": domain_data.get("roles", {}),
+        "schedules": domain_data.get("schedules", {}),
+        "migration_version": domain_data.get("migration_version", 0),
+    }
+
+
+@instrument_mutation
 async def async_save_permissions(hass: HomeAssistant) -> None:
     """Save permissions to persistent storage.
 
@@ -541,15 +1213,26 @@ async def async_save_permissions(hass: HomeAssistant) -> None:
     """
     domain_data = hass.data.get(DOMAIN, {})
     store: Store | None = domain_data.get("store")
-    permissions = domain_data.get("permissions", {})
 
     if store is None:
         _LOGGER.warning("Store not initialized, cannot save permissions")
         return
 
+    save_state = domain_data.setdefault("save_state", {
+        "requested": 0, "written": 0, "last_requested": None, "last_written": None,
+    })
+    save_state["requested"] += 1
+    # Lets cached responses built from the Store detect changes
+    domain_data["store_revision"] = domain_data.get("store_revision", 0) + 1
+    save_state["last_requested"] = dt_util.utcnow().isoformat()
+
     def _data_to_save() -> dict[str, Any]:
         """Return the data to save."""
-        return {"permissions": permissions}
+        # Called by the Store when the delayed write happens
+        save_state["written"] = save_state["requested"]
+        save_state["last_written"] = dt_util.utcnow().isoformat()
+        # Uses the captured domain data, which survives an unload
+        return _get_store_data(domain_data)
 
     # Use async_delay_save with 1 second delay to batch rapid changes
     store.async_delay_save(_data_to_save, 1.0)
@@ -0,0 +1,184 @@
+"""Static frontend asset serving for ha_permission_manager.
+
+Frontend files are read once at setup, content-hashed and precompressed.
+They are served from memory under hashed names with long-lived immutable
+cache headers, so browsers only download a file again after it changes.
+Unhashed names stay available (revalidated via ETag) for relative imports.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from aiohttp import hdrs, web
+from homeassistant.components.http import HomeAssistantView
+
+from .const import DOMAIN, FRONTEND_FILES, STATIC_URL
+
+try:
+    import brotli
+except ImportError:  # Optional: only gzip variants are prepared without it
+    brotli = None
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# Key for the registered view (kept across config entry reloads, since
+# HTTP views cannot be unregistered)
+_VIEW_KEY = f"{DOMAIN}_static_view"
+
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_REVALIDATE = "no-cache"
+
+
+@dataclass
+class StaticAsset:
+    """A frontend file prepared for serving."""
+    filename: str
+    digest: str
+    body: bytes
+    gzip_body: bytes
+    brotli_body: bytes | None
+
+    @property
+    def hashed_name(self) -> str:
+        """Return the content-hashed file name."""
+        stem, ext = os.path.splitext(self.filename)
+        return f"{stem}.{self.digest}{ext}"
+
+    @property
+    def url(self) -> str:
+        """Return the immutable URL of the asset."""
+        return f"{STATIC_URL}/{self.hashed_name}"
+
+
+def _load_assets(www_dir: str) -> dict[str, StaticAsset]:
+    """Read, hash and compress the frontend files (runs in executor)."""
+    assets: dict[str, StaticAsset] = {}
+    for filename in FRONTEND_FILES:
+        with open(os.path.join(www_dir, filename), "rb") as file:
+            body = file.read()
+        assets[filename] = StaticAsset(
+            filename=filename,
+            digest=hashlib.sha256(body).hexdigest()[:12],
+            body=body,
+            gzip_body=gzip.compress(body, compresslevel=9, mtime=0),
+            brotli_body=brotli.compress(body) if brotli else None,
+        )
+    return assets
+
+
+def _accepts_encoding(accept_encoding: str, coding: str) -> bool:
+    """Return True if an Accept-Encoding header allows a content coding.
+
+    The header is parsed into codings and q-values: a coding with q=0 is
+    refused, and "*" allows the codings that are not listed.
+    """
+    listed: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, *params = item.split(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        listed[name] = quality
+    if coding in listed:
+        return listed[coding] > 0
+    return listed.get("*", 0) > 0
+
+
+class PermissionManagerStaticView(HomeAssistantView):
+    """Serve prepared frontend assets."""
+
+    url = f"{STATIC_URL}/{{filename}}"
+    name = f"{DOMAIN}:static"
+    requires_auth = False
+
+    def __init__(self) -> None:
+        """Initialize the view."""
+        self.assets: dict[str, StaticAsset] = {}
+        self._by_hashed_name: dict[str, StaticAsset] = {}
+
+    def set_assets(self, assets: dict[str, StaticAsset]) -> None:
+        """Replace the served assets."""
+        self.assets = assets
+        self._by_hashed_name = {
+            asset.hashed_name: asset for asset in assets.values()
+        }
+
+    async def get(self, request: web.Request, filename: str) -> web.StreamResponse:
+        """Return an asset, negotiating precompressed encodings."""
+        if asset := self._by_hashed_name.get(filename):
+            cache_control = CACHE_IMMUTABLE
+        elif asset := self.assets.get(filename):
+            cache_control = CACHE_REVALIDATE
+        else:
+            raise web.HTTPNotFound
+
+        etag = f'"{asset.digest}"'
+        headers = {
+            hdrs.CACHE_CONTROL: cache_control,
+            hdrs.ETAG: etag,
+            hdrs.VARY: hdrs.ACCEPT_ENCODING,
+        }
+        if request.headers.get(hdrs.IF_NONE_MATCH) == etag:
+            return web.Response(status=304, headers=headers)
+
+        accept_encoding = request.headers.get(hdrs.ACCEPT_ENCODING, "")
+        body = asset.body
+        if asset.brotli_body is not None and _accepts_encoding(accept_encoding, "br"):
+            body = asset.brotli_body
+            headers[hdrs.CONTENT_ENCODING] = "br"
+        elif _accepts_encoding(accept_encoding, "gzip"):
+            body = asset.gzip_body
+            headers[hdrs.CONTENT_ENCODING] = "gzip"
+
+        return web.Response(
+            body=body,
+            content_type="application/javascript",
+            charset="utf-8",
+            headers=headers,
+        )
+
+
+async def async_setup_assets(hass: HomeAssistant) -> dict[str, str]:
+    """Prepare frontend assets and register the view serving them.
+
+    Args:
+        hass: Home Assistant instance.
+
+    Returns:
+        Dictionary mapping file name -> content-hashed URL.
+    """
+    assets = await hass.async_add_executor_job(
+        _load_assets,
+        hass.config.path("custom_components/ha_permission_manager/www"),
+    )
+
+    view: PermissionManagerStaticView | None = hass.data.get(_VIEW_KEY)
+    if view is None:
+        view = PermissionManagerStaticView()
+        hass.http.register_view(view)
+        hass.data[_VIEW_KEY] = view
+    view.set_assets(assets)
+
+    _LOGGER.debug(
+        "Prepared %d frontend assets (%d bytes, brotli=%s)",
+        len(assets),
+        sum(len(asset.body) for asset in assets.values()),
+        brotli is not None,
+    )
+    return {filename: asset.url for filename, asset in assets.items()}
@@ -0,0 +1,382 @@
+"""Audit log of permission changes for ha_permission_manager.
+
+Every permission mutation is recorded as a structured entry:
+
+    {
+        "id": int,                # increasing, unique
+        "time": iso datetime,
+        "ts": float,              # UNIX timestamp of time
+        "actor": str | None,      # admin user who made the change
+        "action": str,            # e.g. "set_permission", "save_role"
+        "user_id": str | None,    # user whose access changed
+        "resource_id": str | None,
+        "old": int | None,
+        "new": int | None,
+        "details": dict,
+    }
+
+Recent entries are kept in a bounded in-memory ring. New entries are
+batch-flushed as JSON lines to segment files in the config directory;
+a segment is closed once it reaches SEGMENT_BYTES and only the newest
+MAX_SEGMENTS are kept. A small index file records each segment's ID and
+time range and the users and resources it mentions, so queries only read
+the segments that can match.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import Event, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+AUDIT_DIR = f"{DOMAIN}_audit"
+INDEX_FILE = "index.json"
+
+# Entries kept in memory (and the most that can wait for a flush)
+MEMORY_ENTRIES = 1000
+# Pending entries are written after this delay, or at once when this
+# many are waiting
+FLUSH_DELAY = 5
+FLUSH_BATCH = 200
+# Segment rotation
+SEGMENT_BYTES = 256 * 1024
+MAX_SEGMENTS = 20
+
+
+def _entry_matches(
+    entry: dict[str, Any],
+    user_id: str | None,
+    resource_id: str | None,
+    start_ts: float | None,
+    end_ts: float | None,
+) -> bool:
+    """Return True if an entry passes the query filters."""
+    if user_id is not None and user_id not in (entry.get("user_id"), entry.get("actor")):
+        return False
+    if resource_id is not None and entry.get("resource_id") != resource_id:
+        return False
+    if start_ts is not None and entry["ts"] < start_ts:
+        return False
+    if end_ts is not None and entry["ts"] > end_ts:
+        return False
+    return True
+
+
+def _segment_may_match(
+    segment: dict[str, Any],
+    before_id: int | None,
+    user_id: str | None,
+    resource_id: str | None,
+    start_ts: float | None,
+    end_ts: float | None,
+) -> bool:
+    """Return True if a segment can contain matching entries."""
+    if before_id is not None and segment["first_id"] >= before_id:
+        return False
+    if start_ts is not None and segment["end_ts"] < start_ts:
+        return False
+    if end_ts is not None and segment["start_ts"] > end_ts:
+        return False
+    if user_id is not None and user_id not in segment["users"]:
+        return False
+    if resource_id is not None and resource_id not in segment["resources"]:
+        return False
+    return True
+
+
+class AuditLog:
+    """Bounded in-memory audit ring backed by rotating segment files."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the audit log."""
+        self.hass = hass
+        self.path = hass.config.path(AUDIT_DIR)
+        self.recent: deque[dict[str, Any]] = deque(maxlen=MEMORY_ENTRIES)
+        self._pending: list[dict[str, Any]] = []
+        # Segment metadata, oldest first (see module docstring)
+        self._segments: list[dict[str, Any]] = []
+        self._next_id = 1
+        self._lock = asyncio.Lock()
+        self._unsub_flush: Callable[[], None] | None = None
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    async def async_load(self) -> Callable[[], None]:
+        """Load the segment index and flush on final write.
+
+        Returns:
+            Callback that stops listening for final write.
+        """
+        index = await self.hass.async_add_executor_job(self._read_index)
+        if index:
+            self._segments = index.get("segments", [])
+            self._next_id = index.get("next_id", 1)
+
+        async def _async_final_write(event: Event) -> None:
+            await self.async_flush()
+
+        return self.hass.bus.async_listen(
+            EVENT_HOMEASSISTANT_FINAL_WRITE, _async_final_write
+        )
+
+    async def async_flush(self) -> None:
+        """Write pending entries to the current segment."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        async with self._lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, []
+            segments = [dict(segment) for segment in self._segments]
+            try:
+                self._segments = await self.hass.async_add_executor_job(
+                    self._write_batch, batch, segments, self._next_id
+                )
+            except OSError as err:
+                _LOGGER.error("Failed to write audit log: %s", err)
+                # Keep the entries for the next attempt (bounded)
+                self._pending = (batch + self._pending)[-MEMORY_ENTRIES:]
+
+    # -------------------------------------------------------------------------
+    # Recording
+    # -------------------------------------------------------------------------
+
+    @callback
+    def async_record(
+        self,
+        action: str,
+        *,
+        actor: str | None = None,
+        user_id: str | None = None,
+        resource_id: str | None = None,
+        old: int | None = None,
+        new: int | None = None,
+        **details: Any,
+    ) -> None:
+        """Record one permission change."""
+        now = dt_util.utcnow()
+        entry = {
+            "id": self._next_id,
+            "time": now.isoformat(),
+            "ts": now.timestamp(),
+            "actor": actor,
+            "action": action,
+            "user_id": user_id,
+            "resource_id": resource_id,
+            "old": old,
+            "new": new,
+            "details": details,
+        }
+        self._next_id += 1
+        self.recent.append(entry)
+        self._pending.append(entry)
+
+        if len(self._pending) >= FLUSH_BATCH:
+            self.hass.async_create_task(self.async_flush())
+        elif self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self.hass, FLUSH_DELAY, self._async_scheduled_flush
+            )
+
+    async def _async_scheduled_flush(self, _now: datetime) -> None:
+        """Flush after the batching delay."""
+        self._unsub_flush = None
+        await self.async_flush()
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    async def async_query(
+        self,
+        *,
+        user_id: str | None = None,
+        resource_id: str | None = None,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+        limit: int = 50,
+        cursor: int | None = None,
+    ) -> tuple[list[dict[str, Any]], int | None]:
+        """Return matching entries, newest first.
+
+        Args:
+            user_id: Only entries changing or made by this user.
+            resource_id: Only entries for this resource.
+            start_time: Only entries at or after this time.
+            end_time: Only entries at or before this time.
+            limit: Maximum number of entries.
+            cursor: Only entries older than this entry ID (next_cursor of
+                the previous page).
+
+        Returns:
+            Tuple of (entries, next_cursor); next_cursor is None on the
+            last page.
+        """
+        start_ts = start_time.timestamp() if start_time else None
+        end_ts = end_time.timestamp() if end_time else None
+        wanted = limit + 1
+        found: list[dict[str, Any]] = []
+
+        # Newest entries come from memory
+        oldest_in_memory: int | None = None
+        for entry in reversed(self.recent):
+            oldest_in_memory = entry["id"]
+            if cursor is not None and entry["id"] >= cursor:
+                continue
+            if _entry_matches(entry, user_id, resource_id, start_ts, end_ts):
+                found.append(entry)
+                if len(found) >= wanted:
+                    break
+
+        if len(found) < wanted:
+            # Older entries come from the segments that can match
+            before_id = oldest_in_memory
+            if cursor is not None and (before_id is None or cursor < before_id):
+                before_id = cursor
+            async with self._lock:
+                segments = [
+                    segment for segment in reversed(self._segments)
+                    if _segment_may_match(
+                        segment, before_id, user_id, resource_id, start_ts, end_ts
+                    )
+                ]
+                if segments:
+                    found.extend(await self.hass.async_add_executor_job(
+                        self._read_segments,
+                        segments, before_id, user_id, resource_id,
+                        start_ts, end_ts, wanted - len(found),
+                    ))
+
+        if len(found) > limit:
+            return found[:limit], found[limit - 1]["id"]
+        return found, None
+
+    # -------------------------------------------------------------------------
+    # File I/O (executor)
+    # -------------------------------------------------------------------------
+
+    def _read_index(self) -> dict[str, Any] | None:
+        """Read the segment index."""
+        try:
+            with open(os.path.join(self.path, INDEX_FILE), encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Audit log index unreadable, starting a new one: %s", err)
+            return None
+
+    def _write_batch(
+        self,
+        batch: list[dict[str, Any]],
+        segments: list[dict[str, Any]],
+        next_id: int,
+    ) -> list[dict[str, Any]]:
+        """Append a batch, rotate segments and rewrite the index."""
+        os.makedirs(self.path, exist_ok=True)
+
+        # Lines per segment file, each file is opened once per batch
+        lines: dict[str, list[str]] = {}
+        for entry in batch:
+            line = json.dumps(entry, separators=(",", ":")) + "\n"
+            if not segments or segments[-1]["size"] >= SEGMENT_BYTES:
+                seq = segments[-1]["seq"] + 1 if segments else 1
+                segments.append({
+                    "seq": seq,
+                    "file": f"segment-{seq:06d}.jsonl",
+                    "first_id": entry["id"],
+                    "last_id": entry["id"],
+                    "start_ts": entry["ts"],
+                    "end_ts": entry["ts"],
+                    "users": [],
+                    "resources": [],
+                    "size": 0,
+                })
+            segment = segments[-1]
+            lines.setdefault(segment["file"], []).append(line)
+            segment["size"] += len(line.encode())
+            segment["last_id"] = entry["id"]
+            segment["end_ts"] = entry["ts"]
+            for user in (entry["user_id"], entry["actor"]):
+                if user and user not in segment["users"]:
+                    segment["users"].append(user)
+            if entry["resource_id"] and entry["resource_id"] not in segment["resources"]:
+                segment["resources"].append(entry["resource_id"])
+
+        for filename, segment_lines in lines.items():
+            with open(os.path.join(self.path, filename), "a", encoding="utf-8") as file:
+                file.write("".join(segment_lines))
+
+        while len(segments) > MAX_SEGMENTS:
+            removed = segments.pop(0)
+            try:
+                os.remove(os.path.join(self.path, removed["file"]))
+            except FileNotFoundError:
+                pass
+
+        index_path = os.path.join(self.path, INDEX_FILE)
+        with open(f"{index_path}.tmp", "w", encoding="utf-8") as file:
+            json.dump({"next_id": next_id, "segments": segments}, file)
+        os.replace(f"{index_path}.tmp", index_path)
+        return segments
+
+    def _read_segments(
+        self,
+        segments: list[dict[str, Any]],
+        before_id: int | None,
+        user_id: str | None,
+        resource_id: str | None,
+        start_ts: float | None,
+        end_ts: float | None,
+        wanted: int,
+    ) -> list[dict[str, Any]]:
+        """Read matching entries from segments (newest first) until wanted."""
+        found: list[dict[str, Any]] = []
+        for segment in segments:
+            try:
+                with open(
+                    os.path.join(self.path, segment["file"]), encoding="utf-8"
+                ) as file:
+                    lines = file.readlines()
+            except FileNotFoundError:
+                continue
+            for line in reversed(lines):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Partially written line
+                    continue
+                if before_id is not None and entry["id"] >= before_id:
+                    continue
+                if _entry_matches(entry, user_id, resource_id, start_ts, end_ts):
+                    found.append(entry)
+                    if len(found) >= wanted:
+                        return found
+        return found
+
+
+@callback
+def async_audit(hass: HomeAssistant, action: str, **kwargs: Any) -> None:
+    """Record a permission change in the audit log, if loaded."""
+    audit: AuditLog | None = hass.data.get(DOMAIN, {}).get("audit")
+    if audit is not None:
+        audit.async_record(action, **kwargs)
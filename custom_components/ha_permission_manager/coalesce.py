@@ -0,0 +1,103 @@
+"""Single-flight request coalescing for ha_permission_manager.
+
+When many clients ask for the same thing at once (e.g. every tablet
+reconnecting after a restart), the computation runs once: callers that
+arrive while it is in progress await the same future, and the result is
+reused by later callers until its revision changes.
+
+A revision is any hashable value that changes whenever the inputs of the
+computation do, e.g. (index revision, permissions revision). Results are
+shared between callers, so they must be treated as read-only.
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from homeassistant.core import callback
+
+from .stats import async_record_cache
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class SingleFlight:
+    """Share identical in-progress and unchanged computations."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the coalescer."""
+        self.hass = hass
+        self._inflight: dict[tuple[Hashable, Hashable], asyncio.Future[Any]] = {}
+        self._results: dict[Hashable, tuple[Hashable, Any]] = {}
+
+    async def async_get(
+        self,
+        key: tuple[Hashable, ...],
+        revision: Hashable,
+        factory: Callable[[], _T | Awaitable[_T]],
+    ) -> _T:
+        """Return the result for key, computing it at most once per revision.
+
+        Args:
+            key: Identifies the computation; key[0] names it in statistics.
+            revision: Changes whenever the computation's inputs change.
+            factory: Computes the result (sync or async).
+
+        Returns:
+            The shared result (read-only).
+        """
+        cache_name = f"single_flight:{key[0]}"
+        cached = self._results.get(key)
+        if cached is not None and cached[0] == revision:
+            async_record_cache(self.hass, cache_name, True)
+            return cached[1]
+
+        flight_key = (key, revision)
+        if (future := self._inflight.get(flight_key)) is not None:
+            # Joined an identical computation already in progress
+            async_record_cache(self.hass, cache_name, True)
+            return await asyncio.shield(future)
+
+        async_record_cache(self.hass, cache_name, False)
+        future = self.hass.loop.create_future()
+        self._inflight[flight_key] = future
+        try:
+            result = factory()
+            if inspect.isawaitable(result):
+                result = await result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as err:
+            future.set_exception(err)
+            # Retrieve it so an unawaited future does not log a warning
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            self._results[key] = (revision, result)
+            return result
+        finally:
+            del self._inflight[flight_key]
+
+    @callback
+    def async_forget(self, name: Hashable | None = None) -> None:
+        """Drop stored results (of one computation name, or all)."""
+        if name is None:
+            self._results.clear()
+            return
+        for key in [key for key in self._results if key[0] == name]:
+            del self._results[key]
+
+    @callback
+    def size(self) -> int:
+        """Return the number of stored results."""
+        return len(self._results)
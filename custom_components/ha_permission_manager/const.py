@@ -1,4 +1,5 @@
 """Constants for ha_permission_manager."""
+import re
 
 DOMAIN = "ha_permission_manager"
 
@@ -6,6 +7,10 @@ DOMAIN = "ha_permission_manager"
 STORAGE_VERSION = 1
 STORAGE_KEY = DOMAIN
 
+# Latest data migration; completed migrations are recorded in the Store
+# data so they run only once
+MIGRATION_VERSION = 2
+
 PERMISSION_OPTIONS = ["0", "1"]
 PERMISSION_LABELS = {
     "0": "Closed",
@@ -21,6 +26,19 @@ PERM_VIEW = 1
 PREFIX_AREA = "area_"
 PREFIX_LABEL = "label_"
 PREFIX_PANEL = "panel_"
+PREFIX_FLOOR = "floor_"  # Grants every area on the floor
+PREFIX_DEVICE = "device_"  # Grants a single device's entities
+
+# All prefixes accepted for permission resource IDs
+RESOURCE_PREFIXES = (
+    PREFIX_PANEL, PREFIX_AREA, PREFIX_LABEL, PREFIX_FLOOR, PREFIX_DEVICE,
+)
+
+# Input validation pattern for IDs
+VALID_ID_PATTERN = re.compile(r'^[a-zA-Z0-9_-]+$')
+
+# Fired after a batch of permission changes (data: user_ids)
+EVENT_PERMISSIONS_CHANGED = f"{DOMAIN}_permissions_changed"
 
 # Self-reference resource ID (for bootstrap protection)
 SELF_PANEL_ID = f"{PREFIX_PANEL}ha_permission_manager"
@@ -35,6 +53,25 @@ PANEL_ICON = "mdi:shield-lock"
 PANEL_URL = "ha_permission_manager"
 PANEL_VERSION = "1.0.0"
 
+# Frontend assets (served content-hashed from STATIC_URL)
+STATIC_URL = f"/{DOMAIN}_static"
+FRONTEND_FILES = (
+    "ha_permission_manager.js",
+    "ha_sidebar_filter.js",
+    "ha_access_denied.js",
+    "ha_lovelace_filter.js",
+    "ha_control_panel.js",
+    "ha_control_panel_shared.js",
+    "ha_control_panel_tiles.js",
+    "ha_control_panel_labels.js",
+)
+
+# Control panel chunks imported lazily by ha_control_panel.js
+CONTROL_PANEL_CHUNKS = (
+    "ha_control_panel_tiles.js",
+    "ha_control_panel_labels.js",
+)
+
 # Control Panel configuration (unified area/label control)
 CONTROL_PANEL_URL = "ha-control-panel"
 CONTROL_PANEL_TITLE = "Control Panel"
@@ -60,6 +97,20 @@ WS_GET_PERMITTED_LABELS = "ha_permission_manager/get_permitted_labels"
 WS_GET_ENTITIES_FOR_AREA = "ha_permission_manager/get_entities_for_area"
 WS_GET_ENTITIES_FOR_LABEL = "ha_permission_manager/get_entities_for_label"
 
+# Services allowed in control_panel/area_action and label_action, per domain
+SCOPE_ACTION_SERVICES = {
+    "light": ("turn_on", "turn_off", "toggle"),
+    "switch": ("turn_on", "turn_off", "toggle"),
+    "fan": ("turn_on", "turn_off", "toggle"),
+    "input_boolean": ("turn_on", "turn_off", "toggle"),
+    "media_player": ("turn_on", "turn_off", "media_pause", "media_stop"),
+    "climate": ("turn_on", "turn_off"),
+    "humidifier": ("turn_on", "turn_off"),
+    "cover": ("open_cover", "close_cover", "stop_cover"),
+    "lock": ("lock", "unlock"),
+    "vacuum": ("start", "pause", "return_to_base"),
+}
+
 # Domain Configuration (for entity grouping in control panel)
 DOMAIN_ICONS = {
     "light": "mdi:lightbulb",
@@ -0,0 +1,137 @@
+"""Diagnostics support for ha_permission_manager.
+
+Reports sizes and performance counters only: the permission matrix itself
+is summarized as counts, and user IDs and usernames are redacted.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers import floor_registry as fr
+from homeassistant.helpers import label_registry as lr
+from homeassistant.helpers.json import json_bytes
+
+from . import async_get_store_data
+from .const import DOMAIN, EVENT_PERMISSIONS_CHANGED
+from .stats import async_get_stats
+
+TO_REDACT = {"user_id", "user_ids", "username"}
+
+# Events whose listener counts are reported
+_LISTENED_EVENTS = (
+    "area_registry_updated",
+    "label_registry_updated",
+    "floor_registry_updated",
+    "device_registry_updated",
+    "entity_registry_updated",
+    "user_added",
+    "user_removed",
+    "user_updated",
+    "lovelace_updated",
+    "panels_updated",
+    EVENT_PERMISSIONS_CHANGED,
+)
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    domain_data = hass.data.get(DOMAIN, {})
+    store_data = async_get_store_data(hass)
+    permissions: dict[str, dict[str, int]] = store_data["permissions"]
+    roles: dict[str, dict[str, Any]] = store_data["roles"]
+
+    store = {
+        "users": len(permissions),
+        "cells": sum(len(user_perms) for user_perms in permissions.values()),
+        "granted_cells": sum(
+            1 for user_perms in permissions.values()
+            for level in user_perms.values() if level
+        ),
+        "roles": len(roles),
+        "role_grants": sum(len(role.get("permissions", {})) for role in roles.values()),
+        "schedules": len(store_data["schedules"]),
+        "migration_version": store_data["migration_version"],
+        # Encoded on the loop so the data cannot change while it is read
+        "serialized_bytes": len(json_bytes(store_data)),
+        "save_state": domain_data.get("save_state"),
+        "snapshots": (
+            len(snapshots.async_list())
+            if (snapshots := domain_data.get("snapshots")) is not None else 0
+        ),
+    }
+
+    index = domain_data.get("index")
+    scheduler = domain_data.get("scheduler")
+    next_wakeup = scheduler.next_wakeup() if scheduler is not None else None
+    stats = async_get_stats(hass)
+
+    bus_listeners = hass.bus.async_listeners()
+
+    diagnostics = {
+        "entry": {
+            "title": entry.title,
+            "version": entry.version,
+            "state": entry.state.value,
+        },
+        "store": store,
+        "index": index.sizes() if index is not None else None,
+        "caches": {
+            "effective_permissions": len(domain_data.get("effective_permissions", {})),
+            "single_flight_results": (
+                domain_data["single_flight"].size()
+                if "single_flight" in domain_data else 0
+            ),
+            "scope_summaries": (
+                len(domain_data["summaries"].summaries)
+                if "summaries" in domain_data else 0
+            ),
+            "hit_rates": stats.cache_summary() if stats is not None else {},
+            "rate_limited_connections": (
+                domain_data["rate_limiter"].connections()
+                if "rate_limiter" in domain_data else 0
+            ),
+        },
+        "registries": {
+            "entities": len(er.async_get(hass).entities),
+            "devices": len(dr.async_get(hass).devices),
+            "areas": len(ar.async_get(hass).areas),
+            "labels": len(lr.async_get(hass).labels),
+            "floors": len(fr.async_get(hass).floors),
+        },
+        "scheduler": {
+            "next_wakeup": next_wakeup.isoformat() if next_wakeup else None,
+        },
+        "sweeper": _sweeper_diagnostics(domain_data.get("sweeper")),
+        "handlers": stats.as_dict() if stats is not None else None,
+        "listeners": {
+            "integration_unsubscribers": len(domain_data.get("unsubscribe", [])),
+            "bus": {
+                event_type: bus_listeners.get(event_type, 0)
+                for event_type in _LISTENED_EVENTS
+            },
+        },
+    }
+    return async_redact_data(diagnostics, TO_REDACT)
+
+
+def _sweeper_diagnostics(sweeper: Any) -> dict[str, Any] | None:
+    """Return the orphan sweeper's counters (without user IDs)."""
+    if sweeper is None:
+        return None
+    last = sweeper.last_result
+    return {
+        "last_run": last["time"] if last else None,
+        "last_duration": last["duration"] if last else None,
+        "last_removed": last["removed"] if last else None,
+        "last_reclaimed_bytes": last["reclaimed_bytes"] if last else None,
+        "total_removed": sweeper.total_removed,
+        "total_reclaimed_bytes": sweeper.total_reclaimed_bytes,
+    }
@@ -6,14 +6,19 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import floor_registry as fr
 from homeassistant.helpers import label_registry as lr
 
 from .const import (
     PREFIX_AREA,
+    PREFIX_DEVICE,
+    PREFIX_FLOOR,
     PREFIX_LABEL,
     PREFIX_PANEL,
     SELF_PANEL_ID,
 )
+from .tracing import traced
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -26,9 +31,10 @@ class Resource:
     """Represents a protectable resource."""
     id: str
     name: str
-    type: str  # "area" | "label" | "panel"
+    type: str  # "area" | "label" | "floor" | "device" | "panel"
 
 
+@traced
 def discover_areas(hass: HomeAssistant) -> list[Resource]:
     """Discover all areas."""
     registry = ar.async_get(hass)
@@ -45,6 +51,7 @@ def discover_areas(hass: HomeAssistant) -> list[Resource]:
     return resources
 
 
+@traced
 def discover_labels(hass: HomeAssistant) -> list[Resource]:
     """Discover all labels."""
     registry = lr.async_get(hass)
@@ -61,6 +68,43 @@ def discover_labels(hass: HomeAssistant) -> list[Resource]:
     return resources
 
 
+@traced
+def discover_floors(hass: HomeAssistant) -> list[Resource]:
+    """Discover all floors."""
+    registry = fr.async_get(hass)
+    resources = []
+    for floor in registry.async_list_floors():
+        resources.append(
+            Resource(
+                id=f"{PREFIX_FLOOR}{floor.floor_id}",
+                name=floor.name,
+                type="floor",
+            )
+        )
+    _LOGGER.debug("Discovered %d floors", len(resources))
+    return resources
+
+
+@traced
+def discover_devices(hass: HomeAssistant) -> list[Resource]:
+    """Discover all enabled devices."""
+    registry = dr.async_get(hass)
+    resources = []
+    for device in registry.devices.values():
+        if device.disabled:
+            continue
+        resources.append(
+            Resource(
+                id=f"{PREFIX_DEVICE}{device.id}",
+                name=device.name_by_user or device.name or device.id,
+                type="device",
+            )
+        )
+    _LOGGER.debug("Discovered %d devices", len(resources))
+    return resources
+
+
+@traced
 def discover_panels(hass: HomeAssistant) -> list[Resource]:
     """Discover all sidebar panels."""
     resources = []
@@ -116,10 +160,13 @@ def discover_panels(hass: HomeAssistant) -> list[Resource]:
     return resources
 
 
+@traced
 def discover_all_resources(hass: HomeAssistant) -> dict[str, list[Resource]]:
     """Discover all protectable resources grouped by type."""
     return {
         "areas": discover_areas(hass),
         "labels": discover_labels(hass),
+        "floors": discover_floors(hass),
+        "devices": discover_devices(hass),
         "panels": discover_panels(hass),
     }
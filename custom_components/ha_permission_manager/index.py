@@ -0,0 +1,754 @@
+"""In-memory registry index for ha_permission_manager.
+
+The index mirrors the parts of the entity, device, area, floor and label
+registries that the WebSocket API needs (scope membership, device -> entity
+and area -> device maps, floor -> area expansion and display names) so that
+requests can be answered without walking the registries. It is built once on
+setup and kept current from registry update events.
+
+Label membership is resolved: an entity carries a label when the entity
+itself, its device or its (resolved) area is labelled. Labels of devices
+and areas are kept so that a change re-indexes only the affected entities.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from homeassistant.core import Event, callback
+from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers import floor_registry as fr
+from homeassistant.helpers import label_registry as lr
+
+from .stats import async_record_cache
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# Splits names and entity ids into searchable words
+_TOKEN_SPLIT = re.compile(r"[\s._\-/,()]+")
+
+# Match weights per field (exact token matches count double)
+WEIGHT_NAME = 4
+WEIGHT_ENTITY_ID = 3
+WEIGHT_AREA = 2
+WEIGHT_LABEL = 1
+
+
+def page_of(
+    members: list[str], limit: int, cursor: str | None = None
+) -> tuple[list[str], str | None]:
+    """Return one page of a sorted list of entity IDs (see page_members)."""
+    start = bisect_right(members, cursor) if cursor else 0
+    page = members[start:start + limit]
+    next_cursor = page[-1] if start + limit < len(members) else None
+    return page, next_cursor
+
+
+def tokenize(text: str | None) -> set[str]:
+    """Split text into lowercase search tokens."""
+    if not text:
+        return set()
+    return {token for token in _TOKEN_SPLIT.split(text.casefold()) if token}
+
+
+@dataclass
+class IndexedEntity:
+    """Registry data kept for an enabled entity."""
+    entity_id: str
+    domain: str
+    name: str
+    device_id: str | None
+    area_id: str | None  # Resolved: entity area, else device area
+    labels: frozenset[str]  # Resolved: entity, device and area labels
+
+
+class PrefixIndex:
+    """Token -> keys posting lists with prefix lookup."""
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._postings: dict[str, set[str]] = {}
+        self._keys: dict[str, set[str]] = {}
+        self._sorted: list[str] = []
+        self._dirty = False
+
+    def __len__(self) -> int:
+        """Return the number of distinct tokens."""
+        return len(self._postings)
+
+    def set(self, key: str, tokens: set[str]) -> None:
+        """Replace the tokens indexed for a key."""
+        self.discard(key)
+        if not tokens:
+            return
+        self._keys[key] = tokens
+        for token in tokens:
+            posting = self._postings.get(token)
+            if posting is None:
+                self._postings[token] = posting = set()
+                self._dirty = True
+            posting.add(key)
+
+    def discard(self, key: str) -> None:
+        """Remove a key from the index."""
+        for token in self._keys.pop(key, ()):
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            posting.discard(key)
+            if not posting:
+                del self._postings[token]
+                self._dirty = True
+
+    def match(self, term: str) -> dict[str, bool]:
+        """Return keys with a token starting with term.
+
+        Returns:
+            Dictionary mapping key -> True if a token matched exactly.
+        """
+        if self._dirty:
+            self._sorted = sorted(self._postings)
+            self._dirty = False
+
+        matches: dict[str, bool] = {}
+        # Walk from the first candidate without copying the sorted tail
+        tokens = self._sorted
+        for position in range(bisect_left(tokens, term), len(tokens)):
+            token = tokens[position]
+            if not token.startswith(term):
+                break
+            exact = token == term
+            for key in self._postings[token]:
+                if exact or key not in matches:
+                    matches[key] = exact
+        return matches
+
+
+class ScopeIndex:
+    """Maintained entity -> area/label membership, floors and search index."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the index."""
+        self.hass = hass
+        self.entities: dict[str, IndexedEntity] = {}
+        self.area_entities: dict[str, set[str]] = {}
+        self.label_entities: dict[str, set[str]] = {}
+        self.device_entities: dict[str, set[str]] = {}
+        self.device_area: dict[str, str] = {}
+        self.area_devices: dict[str, set[str]] = {}
+        self.floor_areas: dict[str, set[str]] = {}
+        self.area_floor: dict[str, str] = {}
+        self.device_labels: dict[str, frozenset[str]] = {}
+        self.area_labels: dict[str, frozenset[str]] = {}
+        self._sorted_members: dict[tuple[str, str], list[str]] = {}
+        # Called with the re-indexed entity IDs (None after a rebuild)
+        self._listeners: list[Callable[[set[str] | None], None]] = []
+        # Called when an area moves to another floor (or after a rebuild)
+        self._remap_listeners: list[Callable[[], None]] = []
+        # Bumped on every registry change; results derived from the index
+        # (or registry names) stay valid while it is unchanged
+        self.revision = 0
+        self._name_tokens = PrefixIndex()
+        self._id_tokens = PrefixIndex()
+        self._area_tokens = PrefixIndex()
+        self._label_tokens = PrefixIndex()
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    @callback
+    def async_setup(self) -> list[Callable[[], None]]:
+        """Build the index and subscribe to registry events.
+
+        Returns:
+            List of unsubscribe callbacks.
+        """
+        self.async_rebuild()
+        bus = self.hass.bus
+        return [
+            bus.async_listen(
+                er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_entity_updated
+            ),
+            bus.async_listen(
+                dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_device_updated
+            ),
+            bus.async_listen(
+                ar.EVENT_AREA_REGISTRY_UPDATED, self._async_area_updated
+            ),
+            bus.async_listen(
+                lr.EVENT_LABEL_REGISTRY_UPDATED, self._async_label_updated
+            ),
+            bus.async_listen(
+                fr.EVENT_FLOOR_REGISTRY_UPDATED, self._async_floor_updated
+            ),
+        ]
+
+    @callback
+    def async_rebuild(self) -> None:
+        """Rebuild the whole index from the registries."""
+        self.revision += 1
+        self.entities.clear()
+        self.area_entities.clear()
+        self.label_entities.clear()
+        self.device_entities.clear()
+        self.device_area.clear()
+        self.area_devices.clear()
+        self.floor_areas.clear()
+        self.area_floor.clear()
+        self.device_labels.clear()
+        self.area_labels.clear()
+        self._sorted_members.clear()
+        self._name_tokens = PrefixIndex()
+        self._id_tokens = PrefixIndex()
+        self._area_tokens = PrefixIndex()
+        self._label_tokens = PrefixIndex()
+
+        for area in ar.async_get(self.hass).async_list_areas():
+            self._area_tokens.set(area.id, tokenize(area.name))
+            self._set_area_floor(area.id, area.floor_id)
+            self._set_labels(self.area_labels, area.id, area.labels)
+        for label in lr.async_get(self.hass).async_list_labels():
+            self._label_tokens.set(label.label_id, tokenize(label.name))
+        for device in dr.async_get(self.hass).devices.values():
+            self._set_device_area(device.id, device.area_id)
+            self._set_labels(self.device_labels, device.id, device.labels)
+        for entity_id in list(er.async_get(self.hass).entities):
+            self._index_entity(entity_id)
+
+        _LOGGER.debug(
+            "Scope index built: %d entities, %d devices, %d areas, %d labels, %d floors",
+            len(self.entities), len(self.device_area), len(self.area_entities),
+            len(self.label_entities), len(self.floor_areas),
+        )
+        self._notify(None)
+        self._notify_remap()
+
+    @callback
+    def async_add_listener(
+        self, listener: Callable[[set[str] | None], None]
+    ) -> Callable[[], None]:
+        """Call listener when entities change scope or the index is rebuilt.
+
+        The listener receives the set of re-indexed entity IDs, or None after
+        a full rebuild.
+
+        Returns:
+            Callback that removes the listener.
+        """
+        self._listeners.append(listener)
+
+        @callback
+        def _remove() -> None:
+            self._listeners.remove(listener)
+
+        return _remove
+
+    def _notify(self, entity_ids: set[str] | None) -> None:
+        """Call the change listeners."""
+        for listener in list(self._listeners):
+            listener(entity_ids)
+
+    @callback
+    def async_add_remap_listener(
+        self, listener: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Call listener when the floor->area mapping changes.
+
+        Floor grants cover the floor's areas, so what a user may see can
+        change without any entity changing scope.
+
+        Returns:
+            Callback that removes the listener.
+        """
+        self._remap_listeners.append(listener)
+
+        @callback
+        def _remove() -> None:
+            self._remap_listeners.remove(listener)
+
+        return _remove
+
+    def _notify_remap(self) -> None:
+        """Call the floor remap listeners."""
+        for listener in list(self._remap_listeners):
+            listener()
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    @callback
+    def sorted_members(self, kind: str, scope_id: str) -> list[str]:
+        """Return the entity IDs of an area, label or device in sorted order.
+
+        Sorting entity IDs as strings orders them by domain, then object ID,
+        because "." sorts before every character allowed in a domain.
+
+        Args:
+            kind: "area", "label" or "device".
+            scope_id: The area, label or device ID.
+
+        Returns:
+            Sorted list of entity IDs (cached until membership changes).
+        """
+        key = (kind, scope_id)
+        members = self._sorted_members.get(key)
+        async_record_cache(self.hass, "sorted_members", members is not None)
+        if members is None:
+            members = sorted(self._scope_source(kind).get(scope_id, ()))
+            self._sorted_members[key] = members
+        return members
+
+    @callback
+    def entity_scopes(self, entity_id: str) -> list[tuple[str, str]]:
+        """Return the (kind, ID) of the areas and labels containing an entity."""
+        entity = self.entities.get(entity_id)
+        if entity is None:
+            return []
+        scopes = [("label", label_id) for label_id in entity.labels]
+        if entity.area_id:
+            scopes.append(("area", entity.area_id))
+        return scopes
+
+    @callback
+    def domain_members(self, kind: str, scope_id: str, domain: str) -> list[str]:
+        """Return the entity IDs of one domain in an area, label or device.
+
+        The domain's entities are a contiguous run of the sorted members, so
+        they are found by bisection instead of a scan.
+
+        Args:
+            kind: "area", "label" or "device".
+            scope_id: The area, label or device ID.
+            domain: Entity domain, e.g. "light".
+
+        Returns:
+            Sorted list of entity IDs.
+        """
+        members = self.sorted_members(kind, scope_id)
+        prefix = f"{domain}."
+        start = bisect_left(members, prefix)
+        # "/" sorts right after ".", so this bounds every "domain.*" ID
+        end = bisect_left(members, f"{domain}/", start)
+        return members[start:end]
+
+    @callback
+    def select(
+        self,
+        area_ids: Iterable[str] = (),
+        label_ids: Iterable[str] = (),
+        domains: Iterable[str] = (),
+    ) -> list[str]:
+        """Return entities in any given area and with any given label.
+
+        Areas and labels are combined by intersection (e.g. entities in the
+        bedroom carrying the night label); several IDs of the same kind are
+        combined by union. With domains, only those domains' slices of the
+        sorted members are read.
+
+        Args:
+            area_ids: Area IDs; no restriction when empty.
+            label_ids: Label IDs; no restriction when empty.
+            domains: Entity domains; no restriction when empty.
+
+        Returns:
+            Sorted list of entity IDs (empty when no area or label is given).
+        """
+        domains = tuple(domains)
+        candidates = [
+            self._scope_union(kind, scope_ids, domains)
+            for kind, scope_ids in (("area", area_ids), ("label", label_ids))
+            if scope_ids
+        ]
+        if not candidates:
+            return []
+        # Intersect starting from the smallest set
+        candidates.sort(key=len)
+        result = candidates[0]
+        for other in candidates[1:]:
+            result = result & other
+        return sorted(result)
+
+    def _scope_union(
+        self, kind: str, scope_ids: Iterable[str], domains: tuple[str, ...]
+    ) -> set[str]:
+        """Return the entities of any of the scopes (limited to domains)."""
+        if domains:
+            return {
+                entity_id
+                for scope_id in scope_ids
+                for domain in domains
+                for entity_id in self.domain_members(kind, scope_id, domain)
+            }
+        source = self._scope_source(kind)
+        return set().union(*(source.get(scope_id, ()) for scope_id in scope_ids))
+
+    @callback
+    def sizes(self) -> dict[str, int]:
+        """Return the number of entries in each map, for diagnostics."""
+        return {
+            "entities": len(self.entities),
+            "areas": len(self.area_entities),
+            "labels": len(self.label_entities),
+            "devices": len(self.device_entities),
+            "device_areas": len(self.device_area),
+            "floors": len(self.floor_areas),
+            "labelled_devices": len(self.device_labels),
+            "labelled_areas": len(self.area_labels),
+            "sorted_members_cached": len(self._sorted_members),
+            "name_tokens": len(self._name_tokens),
+            "entity_id_tokens": len(self._id_tokens),
+            "area_tokens": len(self._area_tokens),
+            "label_tokens": len(self._label_tokens),
+        }
+
+    def _scope_source(self, kind: str) -> dict[str, set[str]]:
+        """Return the membership map for a scope kind."""
+        if kind == "area":
+            return self.area_entities
+        if kind == "label":
+            return self.label_entities
+        return self.device_entities
+
+    @callback
+    def page_members(
+        self, kind: str, scope_id: str, limit: int, cursor: str | None = None
+    ) -> tuple[list[str], str | None]:
+        """Return one page of an area's or label's entities.
+
+        Pages are stable under concurrent changes: the cursor is the last
+        entity ID of the previous page and the next page starts after it.
+
+        Args:
+            kind: "area" or "label".
+            scope_id: The area or label ID.
+            limit: Maximum number of entity IDs to return.
+            cursor: Cursor returned with the previous page, if any.
+
+        Returns:
+            Tuple of (entity IDs, next cursor or None when exhausted).
+        """
+        return page_of(self.sorted_members(kind, scope_id), limit, cursor)
+
+    @callback
+    def is_entity_in_scope(
+        self,
+        entity: IndexedEntity,
+        area_ids: set[str],
+        label_ids: set[str],
+        device_ids: set[str] | None = None,
+    ) -> bool:
+        """Return True if the entity is in one of the given scopes."""
+        return (
+            entity.area_id in area_ids
+            or bool(entity.labels & label_ids)
+            or (device_ids is not None and entity.device_id in device_ids)
+        )
+
+    @callback
+    def search(
+        self,
+        query: str,
+        area_ids: set[str] | None = None,
+        label_ids: set[str] | None = None,
+        device_ids: set[str] | None = None,
+    ) -> list[tuple[int, IndexedEntity]]:
+        """Search entities by id, name, area name and label name.
+
+        Every query term must match (as a token prefix) in at least one field.
+        When area_ids, label_ids or device_ids is given, results are
+        restricted to entities in one of those areas, carrying one of those
+        labels or belonging to one of those devices.
+
+        Args:
+            query: Free-text query.
+            area_ids: Permitted area IDs, or None for no restriction.
+            label_ids: Permitted label IDs, or None for no restriction.
+            device_ids: Permitted device IDs, or None for no restriction.
+
+        Returns:
+            List of (score, entity) sorted by descending score, then name.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        scores: dict[str, int] | None = None
+        for term in terms:
+            term_scores = self._score_term(term)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    entity_id: score + term_scores[entity_id]
+                    for entity_id, score in scores.items()
+                    if entity_id in term_scores
+                }
+            if not scores:
+                return []
+
+        restricted = (
+            area_ids is not None or label_ids is not None or device_ids is not None
+        )
+        area_ids = area_ids or set()
+        label_ids = label_ids or set()
+
+        results = []
+        for entity_id, score in scores.items():
+            entity = self.entities[entity_id]
+            if restricted and not self.is_entity_in_scope(
+                entity, area_ids, label_ids, device_ids
+            ):
+                continue
+            results.append((score, entity))
+
+        results.sort(key=lambda r: (-r[0], r[1].name.casefold(), r[1].entity_id))
+        return results
+
+    def _score_term(self, term: str) -> dict[str, int]:
+        """Return entity_id -> best field score for a single term."""
+        scores: dict[str, int] = {}
+
+        def _add(entity_ids: Iterable[str], weight: int) -> None:
+            for entity_id in entity_ids:
+                if scores.get(entity_id, 0) < weight:
+                    scores[entity_id] = weight
+
+        for entity_id, exact in self._id_tokens.match(term).items():
+            _add((entity_id,), WEIGHT_ENTITY_ID * (2 if exact else 1))
+        for entity_id, exact in self._name_tokens.match(term).items():
+            _add((entity_id,), WEIGHT_NAME * (2 if exact else 1))
+        for area_id, exact in self._area_tokens.match(term).items():
+            _add(self.area_entities.get(area_id, ()), WEIGHT_AREA * (2 if exact else 1))
+        for label_id, exact in self._label_tokens.match(term).items():
+            _add(self.label_entities.get(label_id, ()), WEIGHT_LABEL * (2 if exact else 1))
+        return scores
+
+    # -------------------------------------------------------------------------
+    # Maintenance
+    # -------------------------------------------------------------------------
+
+    def _index_entity(self, entity_id: str) -> None:
+        """(Re)index a single entity from the registries."""
+        self._unindex_entity(entity_id)
+
+        entry = er.async_get(self.hass).async_get(entity_id)
+        if entry is None or entry.disabled:
+            return
+
+        device = None
+        if entry.device_id:
+            device = dr.async_get(self.hass).async_get(entry.device_id)
+
+        # Entities without an area inherit their device's area
+        area_id = entry.area_id
+        if not area_id and entry.device_id:
+            area_id = self.device_area.get(entry.device_id)
+
+        entity = IndexedEntity(
+            entity_id=entity_id,
+            domain=entity_id.split(".")[0],
+            name=_entity_display_name(entry, device),
+            device_id=entry.device_id,
+            area_id=area_id,
+            labels=frozenset(entry.labels or ()).union(
+                self.device_labels.get(entry.device_id, ()),
+                self.area_labels.get(area_id, ()),
+            ),
+        )
+        self.entities[entity_id] = entity
+
+        if entity.area_id:
+            self.area_entities.setdefault(entity.area_id, set()).add(entity_id)
+            self._sorted_members.pop(("area", entity.area_id), None)
+        for label_id in entity.labels:
+            self.label_entities.setdefault(label_id, set()).add(entity_id)
+            self._sorted_members.pop(("label", label_id), None)
+        if entity.device_id:
+            self.device_entities.setdefault(entity.device_id, set()).add(entity_id)
+            self._sorted_members.pop(("device", entity.device_id), None)
+
+        self._id_tokens.set(entity_id, tokenize(entity_id))
+        self._name_tokens.set(entity_id, tokenize(entity.name))
+
+    def _unindex_entity(self, entity_id: str) -> None:
+        """Remove an entity from all maps."""
+        entity = self.entities.pop(entity_id, None)
+        if entity is None:
+            return
+        if entity.area_id:
+            _discard_member(self.area_entities, entity.area_id, entity_id)
+            self._sorted_members.pop(("area", entity.area_id), None)
+        for label_id in entity.labels:
+            _discard_member(self.label_entities, label_id, entity_id)
+            self._sorted_members.pop(("label", label_id), None)
+        if entity.device_id:
+            _discard_member(self.device_entities, entity.device_id, entity_id)
+            self._sorted_members.pop(("device", entity.device_id), None)
+        self._id_tokens.discard(entity_id)
+        self._name_tokens.discard(entity_id)
+
+    @callback
+    def _async_entity_updated(self, event: Event) -> None:
+        """Handle entity registry changes."""
+        self.revision += 1
+        action = event.data.get("action")
+        entity_id = event.data.get("entity_id")
+        if not entity_id:
+            return
+        changed = {entity_id}
+        if old_entity_id := event.data.get("old_entity_id"):
+            self._unindex_entity(old_entity_id)
+            changed.add(old_entity_id)
+        if action == "remove":
+            self._unindex_entity(entity_id)
+        else:
+            self._index_entity(entity_id)
+        self._notify(changed)
+
+    def _set_device_area(self, device_id: str, area_id: str | None) -> None:
+        """Move a device to an area (or to no area)."""
+        old_area_id = self.device_area.pop(device_id, None)
+        if old_area_id:
+            _discard_member(self.area_devices, old_area_id, device_id)
+        if area_id:
+            self.device_area[device_id] = area_id
+            self.area_devices.setdefault(area_id, set()).add(device_id)
+
+    @callback
+    def _async_device_updated(self, event: Event) -> None:
+        """Handle device registry changes (area or name)."""
+        self.revision += 1
+        action = event.data.get("action")
+        device_id = event.data.get("device_id")
+        if not device_id:
+            return
+        if action == "remove":
+            self._set_device_area(device_id, None)
+            self.device_labels.pop(device_id, None)
+            return
+
+        device = dr.async_get(self.hass).async_get(device_id)
+        self._set_device_area(device_id, device.area_id if device else None)
+        self._set_labels(
+            self.device_labels, device_id, device.labels if device else None
+        )
+        if action == "update":
+            entity_ids = set(self.device_entities.get(device_id, ()))
+            for entity_id in entity_ids:
+                self._index_entity(entity_id)
+            self._notify(entity_ids)
+
+    def _set_area_floor(self, area_id: str, floor_id: str | None) -> bool:
+        """Move an area to a floor (or to no floor); return True if it moved."""
+        old_floor_id = self.area_floor.pop(area_id, None)
+        if old_floor_id:
+            _discard_member(self.floor_areas, old_floor_id, area_id)
+        if floor_id:
+            self.area_floor[area_id] = floor_id
+            self.floor_areas.setdefault(floor_id, set()).add(area_id)
+        return old_floor_id != (floor_id or None)
+
+    def _set_labels(
+        self,
+        mapping: dict[str, frozenset[str]],
+        key: str,
+        labels: Iterable[str] | None,
+    ) -> bool:
+        """Set the labels of a device or area; return True if they changed."""
+        labels = frozenset(labels or ())
+        if mapping.get(key, frozenset()) == labels:
+            return False
+        if labels:
+            mapping[key] = labels
+        else:
+            mapping.pop(key, None)
+        return True
+
+    @callback
+    def _async_area_updated(self, event: Event) -> None:
+        """Handle area registry changes (name tokens, floor and labels)."""
+        self.revision += 1
+        area_id = event.data.get("area_id")
+        if not area_id:
+            return
+        area = ar.async_get(self.hass).async_get_area(area_id)
+        if area is None:
+            self._area_tokens.discard(area_id)
+            floor_changed = self._set_area_floor(area_id, None)
+            labels_changed = self._set_labels(self.area_labels, area_id, None)
+        else:
+            self._area_tokens.set(area_id, tokenize(area.name))
+            floor_changed = self._set_area_floor(area_id, area.floor_id)
+            labels_changed = self._set_labels(self.area_labels, area_id, area.labels)
+
+        if floor_changed:
+            self._notify_remap()
+
+        if labels_changed:
+            # Only the area's entities inherit its labels
+            entity_ids = set(self.area_entities.get(area_id, ()))
+            for entity_id in entity_ids:
+                self._index_entity(entity_id)
+            self._notify(entity_ids)
+
+    @callback
+    def _async_floor_updated(self, event: Event) -> None:
+        """Handle floor registry changes."""
+        self.revision += 1
+        floor_id = event.data.get("floor_id")
+        if event.data.get("action") != "remove" or not floor_id:
+            return
+        # The area registry also clears floor_id on the floor's areas
+        area_ids = list(self.floor_areas.get(floor_id, ()))
+        for area_id in area_ids:
+            self._set_area_floor(area_id, None)
+        if area_ids:
+            self._notify_remap()
+
+    @callback
+    def _async_label_updated(self, event: Event) -> None:
+        """Handle label registry changes (name tokens only)."""
+        self.revision += 1
+        label_id = event.data.get("label_id")
+        if not label_id:
+            return
+        label = lr.async_get(self.hass).async_get_label(label_id)
+        if label is None:
+            self._label_tokens.discard(label_id)
+        else:
+            self._label_tokens.set(label_id, tokenize(label.name))
+
+
+def _entity_display_name(
+    entry: er.RegistryEntry, device: dr.DeviceEntry | None
+) -> str:
+    """Build the friendly name of an entity from registry data."""
+    name = entry.name or entry.original_name
+    if entry.has_entity_name and device:
+        device_name = device.name_by_user or device.name
+        if device_name:
+            name = f"{device_name} {name}" if name else device_name
+    if not name:
+        name = entry.entity_id.split(".", 1)[1].replace("_", " ")
+    return str(name)
+
+
+def _discard_member(mapping: dict[str, set[str]], key: str, member: str) -> None:
+    """Discard member from mapping[key], dropping the key when empty."""
+    members = mapping.get(key)
+    if members is None:
+        return
+    members.discard(member)
+    if not members:
+        del mapping[key]
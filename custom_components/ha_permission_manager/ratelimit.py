@@ -0,0 +1,215 @@
+"""Per-connection rate limiting of read commands for ha_permission_manager.
+
+Each WebSocket connection gets a token bucket per limited command: a call
+takes a token, and tokens refill at the command's rate up to its burst
+size. A call that finds the bucket empty is throttled. It is answered
+with the connection's last result for the same command and arguments
+when there is one, and with a "rate_limited" error otherwise; the handler
+does not run either way.
+
+The check runs in the command wrapper (stats.instrument_command), which
+also records throttled calls in the command statistics. Limits can be
+changed at runtime with permission_manager/set_rate_limit.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.util.json import json_loads
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.components.websocket_api import ActiveConnection
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# Command type -> (calls per second, burst size). The per-scope entity
+# listings (get_area_entities, get_label_entities, get_device_entities) are
+# not limited: the control panel loads every permitted area and label in
+# parallel, page by page, so their call count grows with the install.
+DEFAULT_RATE_LIMITS: dict[str, tuple[float, int]] = {
+    "permission_manager/get_panel_permissions": (2.0, 20),
+    "permission_manager/get_all_permissions": (1.0, 10),
+    "permission_manager/get_admin_data": (0.5, 5),
+    "area_control/get_permitted_areas": (1.0, 10),
+    "label_control/get_permitted_labels": (1.0, 10),
+    "device_control/get_permitted_devices": (1.0, 10),
+    "control_panel/search": (2.0, 20),
+    "control_panel/get_entities": (2.0, 20),
+}
+
+# Last results kept per connection for serving throttled calls
+CACHED_RESULTS = 16
+
+# Key in connection.subscriptions of the callback dropping a connection's
+# state when it closes
+_SUBSCRIPTION_KEY = f"{DOMAIN}_rate_limit"
+
+# Marks a missing result (None is a valid result)
+_NO_RESULT = object()
+
+
+@dataclass(frozen=True, slots=True)
+class EncodedResult:
+    """Result message sent pre-encoded; decoded only if it is replayed."""
+    message: bytes | str
+
+
+@dataclass
+class TokenBucket:
+    """Token bucket refilled continuously at rate tokens per second."""
+    rate: float
+    burst: int
+    tokens: float = field(init=False)
+    updated: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self) -> None:
+        """Start with a full bucket."""
+        self.tokens = float(self.burst)
+
+    def take(self) -> bool:
+        """Take a token; return False if the bucket is empty."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+@dataclass
+class _ConnectionState:
+    """Buckets and last results of one connection."""
+    buckets: dict[str, TokenBucket] = field(default_factory=dict)
+    results: OrderedDict[tuple[str, ...], Any] = field(default_factory=OrderedDict)
+
+    def store_result(self, key: tuple[str, ...], result: Any) -> None:
+        """Remember the last result for a command and its arguments."""
+        self.results[key] = result
+        self.results.move_to_end(key)
+        while len(self.results) > CACHED_RESULTS:
+            self.results.popitem(last=False)
+
+
+def _result_key(command: str, msg: dict[str, Any]) -> tuple[str, ...]:
+    """Return the key of a call's result: command and arguments."""
+    return (command, *sorted(
+        f"{key}={value!r}" for key, value in msg.items() if key not in ("id", "type")
+    ))
+
+
+class RateLimiter:
+    """Per-connection token buckets for the limited commands."""
+
+    def __init__(self) -> None:
+        """Initialize with the default limits."""
+        self.limits: dict[str, tuple[float, int]] = dict(DEFAULT_RATE_LIMITS)
+        # Commands whose calls pass through async_throttle
+        self.commands: set[str] = set()
+        # id(connection) -> state; dropped when the connection closes
+        self._connections: dict[int, _ConnectionState] = {}
+
+    def register(self, command: str) -> None:
+        """Make a command known as one that can be limited."""
+        self.commands.add(command)
+
+    @callback
+    def set_limit(self, command: str, limit: tuple[float, int] | None) -> None:
+        """Set (or with None, remove) the limit of a command."""
+        if limit is None:
+            self.limits.pop(command, None)
+        else:
+            self.limits[command] = limit
+        # Buckets are recreated with the new limit
+        for state in self._connections.values():
+            state.buckets.pop(command, None)
+
+    @callback
+    def connections(self) -> int:
+        """Return the number of connections being tracked."""
+        return len(self._connections)
+
+    def _state(self, connection: ActiveConnection) -> _ConnectionState:
+        """Return the state of a connection, tracking it until it closes."""
+        key = id(connection)
+        if (state := self._connections.get(key)) is None:
+            state = self._connections[key] = _ConnectionState()
+            connection.subscriptions[_SUBSCRIPTION_KEY] = partial(
+                self._connections.pop, key, None
+            )
+        return state
+
+    @callback
+    def async_throttle(
+        self,
+        connection: ActiveConnection,
+        responder: Any,
+        command: str,
+        msg: dict[str, Any],
+    ) -> bool | None:
+        """Check a call against its command's limit.
+
+        Allowed calls get their result remembered: responder (the
+        instrumented connection) reports it through its result_listener.
+        Throttled calls are answered through responder.
+
+        Args:
+            connection: The WebSocket connection (identifies the client).
+            responder: Connection used to answer the call.
+            command: The command type.
+            msg: The command message.
+
+        Returns:
+            None if the command is not limited or the call is allowed,
+            True if it was answered from the last result, False if it was
+            rejected.
+        """
+        limit = self.limits.get(command)
+        if limit is None:
+            return None
+        state = self._state(connection)
+        bucket = state.buckets.get(command)
+        if bucket is None:
+            bucket = state.buckets[command] = TokenBucket(*limit)
+        key = _result_key(command, msg)
+
+        if bucket.take():
+            responder.result_listener = partial(state.store_result, key)
+            return None
+
+        result = state.results.get(key, _NO_RESULT)
+        if isinstance(result, EncodedResult):
+            # Decoded on first replay, to be resent under the new call's ID
+            decoded = json_loads(result.message)
+            if (
+                isinstance(decoded, dict)
+                and decoded.get("type") == "result"
+                and decoded.get("success")
+            ):
+                result = state.results[key] = decoded.get("result")
+            else:
+                del state.results[key]
+                result = _NO_RESULT
+        if result is not _NO_RESULT:
+            responder.send_result(msg["id"], result)
+            return True
+        _LOGGER.debug("Rejected %s: rate limit exceeded", command)
+        responder.send_error(
+            msg["id"], "rate_limited", "Too many requests, please retry later"
+        )
+        return False
+
+
+@callback
+def async_get_rate_limiter(hass: HomeAssistant) -> RateLimiter | None:
+    """Return the rate limiter of the loaded config entry, if any."""
+    return hass.data.get(DOMAIN, {}).get("rate_limiter")
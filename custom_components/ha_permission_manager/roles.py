@@ -0,0 +1,149 @@
+"""Role-based grants for ha_permission_manager.
+
+A role is a named set of resource grants that users can belong to. Each
+user's effective permissions are their direct grants merged with the grants
+of every role they belong to and their active scheduled grants (see
+scheduler.py); the highest level wins. The merged view is
+compiled on first use and cached until the user or one of their roles
+changes.
+
+Role data is stored in the Store next to the per-user permissions:
+
+    roles[role_id] = {
+        "name": str,
+        "permissions": {resource_id: level},
+        "members": [user_id, ...],
+    }
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+
+from .const import DOMAIN, PERM_CLOSED
+from .stats import async_record_cache
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_get_effective_permissions(
+    hass: HomeAssistant, user_id: str
+) -> dict[str, int]:
+    """Get the compiled permissions of a user (direct, role and scheduled grants).
+
+    Args:
+        hass: Home Assistant instance.
+        user_id: The user ID to get permissions for.
+
+    Returns:
+        Dictionary mapping resource_id -> permission_level. Callers must not
+        modify it.
+    """
+    domain_data = hass.data.get(DOMAIN, {})
+    cache: dict[str, dict[str, int]] = domain_data.setdefault("effective_permissions", {})
+
+    if (effective := cache.get(user_id)) is not None:
+        async_record_cache(hass, "effective_permissions", True)
+        return effective
+    async_record_cache(hass, "effective_permissions", False)
+
+    effective = compile_permissions(
+        user_id,
+        domain_data.get("permissions", {}).get(user_id, {}),
+        domain_data.get("roles", {}),
+        domain_data.get("scheduled_permissions", {}).get(user_id),
+    )
+    cache[user_id] = effective
+    return effective
+
+
+def compile_permissions(
+    user_id: str,
+    direct: dict[str, int],
+    roles: dict[str, dict[str, Any]],
+    scheduled: dict[str, int] | None = None,
+) -> dict[str, int]:
+    """Merge a user's direct grants with the grants of their roles.
+
+    Args:
+        user_id: The user ID (to find role memberships).
+        direct: The user's direct grants (resource_id -> level).
+        roles: All roles (see module docstring).
+        scheduled: The user's active scheduled grants, if any.
+
+    Returns:
+        Dictionary mapping resource_id -> highest level. Without roles and
+        scheduled grants this is direct itself.
+    """
+    layers = [
+        role.get("permissions", {})
+        for role in roles.values() if user_id in role.get("members", ())
+    ]
+    if scheduled:
+        layers.append(scheduled)
+    if not layers:
+        # No roles or schedules: the direct grants are the effective view
+        return direct
+    effective = dict(direct)
+    for grants in layers:
+        for resource_id, level in grants.items():
+            if level > effective.get(resource_id, PERM_CLOSED):
+                effective[resource_id] = level
+    return effective
+
+
+@callback
+def async_invalidate_effective_permissions(
+    hass: HomeAssistant, user_ids: Iterable[str] | None = None
+) -> None:
+    """Drop compiled permissions so they are recomputed on next read.
+
+    Args:
+        hass: Home Assistant instance.
+        user_ids: Users to invalidate, or None for all users.
+    """
+    domain_data = hass.data.get(DOMAIN, {})
+    domain_data["permissions_revision"] = domain_data.get("permissions_revision", 0) + 1
+    cache = domain_data.get("effective_permissions")
+    if not cache:
+        return
+    if user_ids is None:
+        cache.clear()
+        return
+    for user_id in user_ids:
+        cache.pop(user_id, None)
+
+
+@callback
+def async_get_permissions_revision(hass: HomeAssistant) -> int:
+    """Get a counter that changes whenever any permission changes.
+
+    Args:
+        hass: Home Assistant instance.
+
+    Returns:
+        The current permissions revision.
+    """
+    return hass.data.get(DOMAIN, {}).get("permissions_revision", 0)
+
+
+@callback
+def async_get_role_members(hass: HomeAssistant, role_id: str) -> set[str]:
+    """Get the user IDs belonging to a role.
+
+    Args:
+        hass: Home Assistant instance.
+        role_id: The role ID.
+
+    Returns:
+        Set of member user IDs (empty if the role does not exist).
+    """
+    roles = hass.data.get(DOMAIN, {}).get("roles", {})
+    return set(roles.get(role_id, {}).get("members", ()))
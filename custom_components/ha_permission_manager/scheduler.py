@@ -0,0 +1,317 @@
+"""Time-windowed permission grants for ha_permission_manager.
+
+A schedule grants a user a resource only inside a time window: an optional
+absolute validity range (valid_from / valid_until) and an optional weekly
+recurrence (weekdays + local start/end time). Schedules are stored in the
+Store next to the per-user permissions:
+
+    schedules[schedule_id] = {
+        "user_id": str,
+        "resource_id": str,
+        "level": int,
+        "valid_from": iso datetime | None,
+        "valid_until": iso datetime | None,
+        "recurrence": {"weekdays": [0-6], "start": "HH:MM:SS",
+                       "end": "HH:MM:SS"} | None,
+    }
+
+Scheduled grants never touch the direct permission matrix. The scheduler
+keeps the grants of the schedules inside their window as a separate layer,
+
+    scheduled_permissions[user_id] = {resource_id: level}
+
+which compile_permissions merges with the direct and role grants (the
+highest level wins). The layer is derived from the schedules and the time,
+so it is not stored. Ending or deleting a schedule only drops its grant:
+a direct grant for the same resource is left as it was.
+
+A single PermissionScheduler keeps a heap of upcoming transitions and arms
+one timer for the earliest. When it fires, every due transition is applied
+to the layer as one batch, followed by one change notification. Inactive
+schedules with no future transitions are removed.
+"""
+from __future__ import annotations
+
+import heapq
+import logging
+from collections.abc import Callable, Iterable
+from datetime import datetime, time, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .audit import async_audit
+from .const import DOMAIN, PERM_CLOSED
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _parse_datetime(value: str | None) -> datetime | None:
+    """Parse a stored datetime (naive values are local time) to UTC."""
+    if not value:
+        return None
+    parsed = dt_util.parse_datetime(value)
+    return dt_util.as_utc(dt_util.as_local(parsed)) if parsed else None
+
+
+def _window_bounds(
+    recurrence: dict[str, Any], day: datetime
+) -> tuple[datetime, datetime]:
+    """Return the UTC start/end of the recurring window starting on day."""
+    start = time.fromisoformat(recurrence["start"])
+    end = time.fromisoformat(recurrence["end"])
+    local_day = day.date()
+    start_dt = datetime.combine(local_day, start, tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    end_dt = datetime.combine(local_day, end, tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    if end_dt <= start_dt:
+        # Window crosses midnight
+        end_dt += timedelta(days=1)
+    return dt_util.as_utc(start_dt), dt_util.as_utc(end_dt)
+
+
+def _recurring_windows(
+    recurrence: dict[str, Any], now: datetime
+) -> list[tuple[datetime, datetime]]:
+    """Return recurring windows from yesterday up to a week ahead."""
+    local_now = dt_util.as_local(now)
+    weekdays = set(recurrence.get("weekdays", range(7)))
+    windows = []
+    for offset in range(-1, 8):
+        day = local_now + timedelta(days=offset)
+        if day.weekday() in weekdays:
+            windows.append(_window_bounds(recurrence, day))
+    return windows
+
+
+def is_schedule_active(schedule: dict[str, Any], now: datetime) -> bool:
+    """Return True if the schedule grants its resource at time now.
+
+    Args:
+        schedule: The stored schedule.
+        now: Time to evaluate (UTC).
+
+    Returns:
+        True if inside the validity range and (if any) a recurring window.
+    """
+    valid_from = _parse_datetime(schedule.get("valid_from"))
+    valid_until = _parse_datetime(schedule.get("valid_until"))
+    if valid_from and now < valid_from:
+        return False
+    if valid_until and now >= valid_until:
+        return False
+    if recurrence := schedule.get("recurrence"):
+        return any(start <= now < end for start, end in _recurring_windows(recurrence, now))
+    return True
+
+
+def next_transition(schedule: dict[str, Any], now: datetime) -> datetime | None:
+    """Return the next time the schedule's state may change after now.
+
+    Args:
+        schedule: The stored schedule.
+        now: Reference time (UTC).
+
+    Returns:
+        The next transition time (UTC), or None if there is none.
+    """
+    valid_from = _parse_datetime(schedule.get("valid_from"))
+    valid_until = _parse_datetime(schedule.get("valid_until"))
+    if valid_until and now >= valid_until:
+        return None
+
+    candidates = [
+        when for when in (valid_from, valid_until) if when is not None and when > now
+    ]
+    if recurrence := schedule.get("recurrence"):
+        for start, end in _recurring_windows(recurrence, now):
+            for when in (start, end):
+                if when > now and (valid_from is None or when >= valid_from) and (
+                    valid_until is None or when <= valid_until
+                ):
+                    candidates.append(when)
+    return min(candidates, default=None)
+
+
+class PermissionScheduler:
+    """Apply schedule transitions from a single timer."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._heap: list[tuple[datetime, int, str]] = []
+        self._versions: dict[str, int] = {}
+        self._seq = 0
+        self._unsub_timer: Callable[[], None] | None = None
+        self._armed_for: datetime | None = None
+        # schedule_id -> (user_id, resource_id, level) of active schedules
+        self._active: dict[str, tuple[str, str, int]] = {}
+
+    @property
+    def _schedules(self) -> dict[str, dict[str, Any]]:
+        """Return the stored schedules."""
+        return self.hass.data[DOMAIN].setdefault("schedules", {})
+
+    @callback
+    def async_start(self) -> Callable[[], None]:
+        """Apply the current state of all schedules and arm the timer.
+
+        Transitions missed while Home Assistant was stopped are caught up
+        here in one batch.
+
+        Returns:
+            Callback that stops the scheduler.
+        """
+        now = dt_util.utcnow()
+        self._apply(list(self._schedules), now)
+        return self.async_stop
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the pending timer."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._armed_for = None
+
+    @callback
+    def async_schedule_updated(self, schedule_id: str) -> None:
+        """Apply a created/changed/deleted schedule right away."""
+        self.async_schedules_updated([schedule_id])
+
+    @callback
+    def async_schedules_updated(self, schedule_ids: Iterable[str]) -> None:
+        """Apply created/changed/deleted schedules right away, as one batch.
+
+        The grant of a deleted schedule is dropped from the layer.
+        """
+        updated = []
+        for schedule_id in schedule_ids:
+            self._versions[schedule_id] = self._versions.get(schedule_id, 0) + 1
+            updated.append(schedule_id)
+        if updated:
+            self._apply(updated, dt_util.utcnow())
+
+    @callback
+    def next_wakeup(self) -> datetime | None:
+        """Return the time the timer is armed for."""
+        return self._armed_for
+
+    def _push(self, schedule_id: str, now: datetime) -> None:
+        """Queue the next transition of a schedule."""
+        when = next_transition(self._schedules[schedule_id], now)
+        if when is None:
+            return
+        self._seq += 1
+        version = self._versions.setdefault(schedule_id, 0)
+        heapq.heappush(self._heap, (when, self._seq, f"{version}:{schedule_id}"))
+
+    def _apply(self, schedule_ids: list[str], now: datetime) -> None:
+        """Apply the state of schedules to the layer as one batch."""
+        schedules = self._schedules
+
+        changed_users: set[str] = set()
+        expired: list[str] = []
+        for schedule_id in schedule_ids:
+            previous = self._active.pop(schedule_id, None)
+            schedule = schedules.get(schedule_id)
+            current = None
+            if schedule is not None and is_schedule_active(schedule, now):
+                current = (schedule["user_id"], schedule["resource_id"], schedule["level"])
+                self._active[schedule_id] = current
+
+            if current != previous:
+                user_id, resource_id, _ = current or previous
+                changed_users.update(grant[0] for grant in (previous, current) if grant)
+                async_audit(
+                    self.hass, "schedule_applied", user_id=user_id,
+                    resource_id=resource_id,
+                    old=previous[2] if previous else PERM_CLOSED,
+                    new=current[2] if current else PERM_CLOSED,
+                    schedule_id=schedule_id,
+                )
+                _LOGGER.info(
+                    "Schedule %s: user=%s, resource=%s, %s",
+                    schedule_id, user_id, resource_id,
+                    "active" if current else "inactive",
+                )
+
+            if schedule is None:
+                continue
+            if current is None and next_transition(schedule, now) is None:
+                expired.append(schedule_id)
+            else:
+                self._push(schedule_id, now)
+
+        for schedule_id in expired:
+            del schedules[schedule_id]
+            self._versions.pop(schedule_id, None)
+            _LOGGER.debug("Schedule %s expired and was removed", schedule_id)
+
+        if changed_users or expired:
+            # Imported here to avoid a circular import
+            from . import async_notify_permissions_changed, async_save_permissions
+            from .roles import async_invalidate_effective_permissions
+
+            if changed_users:
+                self._rebuild_layer(changed_users)
+                async_invalidate_effective_permissions(self.hass, changed_users)
+                async_notify_permissions_changed(self.hass, changed_users)
+            if expired:
+                # Only the schedules are stored; the layer is derived
+                self.hass.async_create_task(async_save_permissions(self.hass))
+
+        self._arm()
+
+    def _rebuild_layer(self, user_ids: set[str]) -> None:
+        """Recompute the scheduled grants of users from the active schedules."""
+        layer: dict[str, dict[str, int]] = self.hass.data[DOMAIN].setdefault(
+            "scheduled_permissions", {}
+        )
+        for user_id in user_ids:
+            layer.pop(user_id, None)
+        for user_id, resource_id, level in self._active.values():
+            if user_id in user_ids:
+                grants = layer.setdefault(user_id, {})
+                if level > grants.get(resource_id, PERM_CLOSED):
+                    grants[resource_id] = level
+
+    def _arm(self) -> None:
+        """Arm the timer for the earliest valid heap entry."""
+        while self._heap:
+            _, _, key = self._heap[0]
+            version, schedule_id = key.split(":", 1)
+            if (
+                schedule_id in self._schedules
+                and self._versions.get(schedule_id) == int(version)
+            ):
+                break
+            # Superseded by a newer version of the schedule
+            heapq.heappop(self._heap)
+
+        when = self._heap[0][0] if self._heap else None
+        if when == self._armed_for:
+            return
+        self.async_stop()
+        if when is not None:
+            self._armed_for = when
+            self._unsub_timer = async_track_point_in_utc_time(
+                self.hass, self._async_timer_fired, when
+            )
+
+    @callback
+    def _async_timer_fired(self, now: datetime) -> None:
+        """Apply every transition that is due."""
+        self._unsub_timer = None
+        self._armed_for = None
+        due: list[str] = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, key = heapq.heappop(self._heap)
+            version, schedule_id = key.split(":", 1)
+            if self._versions.get(schedule_id) == int(version) and schedule_id not in due:
+                due.append(schedule_id)
+        self._apply(due, now)
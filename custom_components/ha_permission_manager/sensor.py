@@ -0,0 +1,82 @@
+"""Diagnostic statistics sensors for ha_permission_manager.
+
+One sensor per instrumented WebSocket command reports its mean latency,
+with call counts, errors and payload sizes as attributes. The sensors are
+disabled by default; enable them in the entity settings to graph handler
+performance over time.
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .stats import KIND_COMMAND, HandlerStats
+
+SCAN_INTERVAL = timedelta(seconds=60)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the statistics sensors."""
+    stats: HandlerStats = hass.data[DOMAIN]["stats"]
+    async_add_entities(
+        CommandLatencySensor(entry, stats, command)
+        for command, call_stats in sorted(stats.calls.items())
+        if call_stats.kind == KIND_COMMAND
+    )
+
+
+class CommandLatencySensor(SensorEntity):
+    """Mean latency of one WebSocket command."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_suggested_display_precision = 1
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(self, entry: ConfigEntry, stats: HandlerStats, command: str) -> None:
+        """Initialize the sensor."""
+        self._stats = stats
+        self._command = command
+        self._attr_unique_id = f"{entry.entry_id}_latency_{command}"
+        self._attr_name = f"Permission Manager {command} latency"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the mean latency in ms."""
+        call_stats = self._stats.calls.get(self._command)
+        if call_stats is None or not call_stats.calls:
+            return None
+        return round(call_stats.mean_ms, 3)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return call counts and payload sizes."""
+        call_stats = self._stats.calls.get(self._command)
+        if call_stats is None:
+            return {}
+        summary = call_stats.as_dict()
+        return {
+            key: summary[key]
+            for key in (
+                "calls", "errors", "max_ms", "p95_ms",
+                "mean_payload_bytes", "max_payload_bytes", "throttled",
+            )
+        }
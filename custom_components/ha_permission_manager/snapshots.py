@@ -0,0 +1,242 @@
+"""Permission snapshots for ha_permission_manager.
+
+A snapshot records the per-user permission matrix at one point in time so
+that a batch of changes can be rolled back. Snapshots are taken on
+request and automatically before bulk changes (imports, restores).
+
+Snapshots are stored in their own Store as deltas against a shared base
+copy of the matrix:
+
+    {
+        "base": {user_id: {resource_id: level}},
+        "snapshots": [{
+            "snapshot_id": str,
+            "name": str,
+            "created": iso datetime,
+            "auto": bool,
+            "delta": {user_id: {resource_id: level | None} | None},
+        }],
+    }
+
+In a delta, None for a user means the user has no entry; None for a
+resource means the resource has no entry. The base is replaced by the
+newest snapshot (and the other deltas recomputed) when deltas grow large
+compared to it. Restoring builds a new matrix, which replaces the live
+one as a whole (see async_restore_snapshot in __init__.py).
+"""
+from __future__ import annotations
+
+import logging
+import secrets
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, STORAGE_KEY, STORAGE_VERSION
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+SNAPSHOTS_STORAGE_KEY = f"{STORAGE_KEY}.snapshots"
+
+# Oldest snapshots are dropped beyond these; automatic snapshots have their
+# own limit so a run of imports and restores cannot push out named ones
+MAX_SNAPSHOTS = 20
+MAX_AUTO_SNAPSHOTS = 10
+# Rebase when a delta has more entries than this fraction of the base
+REBASE_RATIO = 0.5
+
+Permissions = dict[str, dict[str, int]]
+
+
+def compute_delta(base: Permissions, permissions: Permissions) -> dict[str, Any]:
+    """Return the delta turning base into permissions."""
+    delta: dict[str, Any] = {}
+    for user_id, user_perms in permissions.items():
+        base_perms = base.get(user_id)
+        if base_perms is None:
+            delta[user_id] = dict(user_perms)
+            continue
+        changes: dict[str, int | None] = {
+            resource_id: level
+            for resource_id, level in user_perms.items()
+            if base_perms.get(resource_id) != level
+        }
+        for resource_id in base_perms.keys() - user_perms.keys():
+            changes[resource_id] = None
+        if changes:
+            delta[user_id] = changes
+    for user_id in base.keys() - permissions.keys():
+        delta[user_id] = None
+    return delta
+
+
+def apply_delta(base: Permissions, delta: dict[str, Any]) -> Permissions:
+    """Return a new matrix: base with delta applied."""
+    permissions = {user_id: dict(user_perms) for user_id, user_perms in base.items()}
+    for user_id, changes in delta.items():
+        if changes is None:
+            permissions.pop(user_id, None)
+            continue
+        user_perms = permissions.setdefault(user_id, {})
+        for resource_id, level in changes.items():
+            if level is None:
+                user_perms.pop(resource_id, None)
+            else:
+                user_perms[resource_id] = level
+    return permissions
+
+
+def diff_permissions(old: Permissions, new: Permissions) -> list[dict[str, Any]]:
+    """Return the cells that differ between two matrices.
+
+    Returns:
+        Sorted list of {user_id, resource_id, old, new}; a missing cell is
+        None.
+    """
+    changes = []
+    for user_id in old.keys() | new.keys():
+        old_perms = old.get(user_id, {})
+        new_perms = new.get(user_id, {})
+        for resource_id in old_perms.keys() | new_perms.keys():
+            old_level = old_perms.get(resource_id)
+            new_level = new_perms.get(resource_id)
+            if old_level != new_level:
+                changes.append({
+                    "user_id": user_id,
+                    "resource_id": resource_id,
+                    "old": old_level,
+                    "new": new_level,
+                })
+    changes.sort(key=lambda change: (change["user_id"], change["resource_id"]))
+    return changes
+
+
+def _delta_size(delta: dict[str, Any]) -> int:
+    """Return the number of entries in a delta."""
+    return sum(1 if changes is None else len(changes) for changes in delta.values())
+
+
+class PermissionSnapshots:
+    """Named snapshots of the permission matrix, stored as deltas."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the snapshot store."""
+        self.hass = hass
+        self._store = Store[dict[str, Any]](hass, STORAGE_VERSION, SNAPSHOTS_STORAGE_KEY)
+        self._base: Permissions = {}
+        self._snapshots: list[dict[str, Any]] = []
+
+    async def async_load(self) -> None:
+        """Load the stored snapshots."""
+        if (data := await self._store.async_load()) is not None:
+            self._base = data.get("base", {})
+            self._snapshots = data.get("snapshots", [])
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    @callback
+    def async_list(self) -> list[dict[str, Any]]:
+        """Return the snapshots (without data), newest first."""
+        return [
+            {
+                "snapshot_id": snapshot["snapshot_id"],
+                "name": snapshot["name"],
+                "created": snapshot["created"],
+                "auto": snapshot["auto"],
+                "delta_size": _delta_size(snapshot["delta"]),
+            }
+            for snapshot in reversed(self._snapshots)
+        ]
+
+    @callback
+    def async_get_permissions(self, snapshot_id: str) -> Permissions | None:
+        """Return a new copy of a snapshot's matrix, or None if unknown."""
+        for snapshot in self._snapshots:
+            if snapshot["snapshot_id"] == snapshot_id:
+                return apply_delta(self._base, snapshot["delta"])
+        return None
+
+    # -------------------------------------------------------------------------
+    # Changes
+    # -------------------------------------------------------------------------
+
+    @callback
+    def async_create(self, name: str, *, auto: bool = False) -> dict[str, Any]:
+        """Snapshot the current permission matrix.
+
+        Args:
+            name: Display name of the snapshot.
+            auto: Whether the snapshot was taken automatically.
+
+        Returns:
+            The snapshot's list entry (see async_list).
+        """
+        permissions: Permissions = self.hass.data[DOMAIN].get("permissions", {})
+        delta = compute_delta(self._base, permissions)
+        if not self._snapshots or _delta_size(delta) > REBASE_RATIO * sum(
+            len(user_perms) for user_perms in self._base.values()
+        ):
+            self._rebase(permissions)
+            delta = {}
+
+        snapshot = {
+            "snapshot_id": secrets.token_hex(6),
+            "name": name,
+            "created": dt_util.utcnow().isoformat(),
+            "auto": auto,
+            "delta": delta,
+        }
+        self._snapshots.append(snapshot)
+        self._prune()
+        self._schedule_save()
+        _LOGGER.debug(
+            "Created snapshot %s (%s), %d delta entries",
+            snapshot["snapshot_id"], name, _delta_size(delta),
+        )
+        return self.async_list()[0]
+
+    @callback
+    def async_delete(self, snapshot_id: str) -> bool:
+        """Delete a snapshot; return False if it is unknown."""
+        for position, snapshot in enumerate(self._snapshots):
+            if snapshot["snapshot_id"] == snapshot_id:
+                del self._snapshots[position]
+                if not self._snapshots:
+                    self._base = {}
+                self._schedule_save()
+                return True
+        return False
+
+    def _prune(self) -> None:
+        """Drop the oldest snapshots beyond the manual and automatic limits."""
+        kept = {False: 0, True: 0}
+        snapshots = []
+        for snapshot in reversed(self._snapshots):
+            auto = bool(snapshot.get("auto"))
+            if kept[auto] < (MAX_AUTO_SNAPSHOTS if auto else MAX_SNAPSHOTS):
+                kept[auto] += 1
+                snapshots.append(snapshot)
+        snapshots.reverse()
+        self._snapshots = snapshots
+
+    def _rebase(self, permissions: Permissions) -> None:
+        """Make a copy of permissions the base and recompute the deltas."""
+        base = {user_id: dict(user_perms) for user_id, user_perms in permissions.items()}
+        for snapshot in self._snapshots:
+            snapshot["delta"] = compute_delta(
+                base, apply_delta(self._base, snapshot["delta"])
+            )
+        self._base = base
+
+    def _schedule_save(self) -> None:
+        """Save the snapshots (batched)."""
+        self._store.async_delay_save(
+            lambda: {"base": self._base, "snapshots": self._snapshots}, 1.0
+        )
@@ -0,0 +1,420 @@
+"""Handler latency and throughput statistics for ha_permission_manager.
+
+Every registered WebSocket command and the permission mutation functions
+record their call count, errors, a latency histogram and (for commands)
+the size of the encoded response. The last calls are kept in a bounded
+buffer so the slowest recent ones can be inspected.
+
+Commands are timed from the moment the handler is invoked until it sends
+its result or error, so the async work of async_response handlers is
+included. Results are encoded once here and sent pre-encoded, so measuring
+the payload size does not serialize the response twice. The same wrapper
+records the command's trace spans while tracing is enabled (tracing.py)
+and applies the per-connection rate limits (ratelimit.py).
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar
+
+from homeassistant.components import websocket_api
+from homeassistant.core import callback
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .ratelimit import EncodedResult, async_get_rate_limiter
+from .tracing import (
+    CATEGORY_COMMAND,
+    CATEGORY_STAGE,
+    async_get_tracer,
+    run_on_track,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.components.websocket_api import ActiveConnection
+    from homeassistant.core import HomeAssistant
+
+    from .tracing import Tracer
+
+_LOGGER = logging.getLogger(__name__)
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket
+# counts everything slower
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Number of recent calls kept for the slowest-calls report
+RECENT_CALLS = 200
+SLOWEST_CALLS = 10
+
+KIND_COMMAND = "command"
+KIND_MUTATION = "mutation"
+
+
+@dataclass
+class CallStats:
+    """Aggregated statistics of one command or function."""
+    kind: str
+    calls: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    )
+    payload_bytes: int = 0
+    max_payload_bytes: int = 0
+    # Calls over the rate limit, and those answered with the last result
+    throttled: int = 0
+    throttled_cached: int = 0
+
+    def record(self, duration_ms: float, payload_bytes: int | None, error: bool) -> None:
+        """Add one call."""
+        self.calls += 1
+        if error:
+            self.errors += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            if duration_ms <= bound:
+                self.buckets[index] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+        if payload_bytes is not None:
+            self.payload_bytes += payload_bytes
+            self.max_payload_bytes = max(self.max_payload_bytes, payload_bytes)
+
+    @property
+    def mean_ms(self) -> float:
+        """Return the mean latency."""
+        return self.total_ms / self.calls if self.calls else 0.0
+
+    def percentile_ms(self, percentile: float) -> float | None:
+        """Return the bucket upper bound the given percentile falls into.
+
+        Returns None if there were no calls, or inf if it falls into the
+        overflow bucket.
+        """
+        if not self.calls:
+            return None
+        target = self.calls * percentile
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target:
+                if index < len(LATENCY_BUCKETS_MS):
+                    return float(LATENCY_BUCKETS_MS[index])
+                break
+        return float("inf")
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable summary."""
+        p95 = self.percentile_ms(0.95)
+        return {
+            "kind": self.kind,
+            "calls": self.calls,
+            "errors": self.errors,
+            "mean_ms": round(self.mean_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile_ms(0.5),
+            # JSON has no infinity; None means slower than the last bucket
+            "p95_ms": None if p95 == float("inf") else p95,
+            "histogram": {
+                "bounds_ms": list(LATENCY_BUCKETS_MS),
+                "counts": list(self.buckets),
+            },
+            "payload_bytes": self.payload_bytes,
+            "max_payload_bytes": self.max_payload_bytes,
+            "mean_payload_bytes": (
+                round(self.payload_bytes / self.calls) if self.calls else 0
+            ),
+            "throttled": self.throttled,
+            "throttled_cached": self.throttled_cached,
+        }
+
+
+class HandlerStats:
+    """Statistics of all instrumented commands and functions."""
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.calls: dict[str, CallStats] = {}
+        self.recent: deque[dict[str, Any]] = deque(maxlen=RECENT_CALLS)
+        self.caches: dict[str, list[int]] = {}
+        self.since = dt_util.utcnow()
+
+    @callback
+    def register(self, name: str, kind: str) -> None:
+        """Make a command or function known before its first call."""
+        self.calls.setdefault(name, CallStats(kind))
+
+    @callback
+    def record(
+        self,
+        name: str,
+        kind: str,
+        duration_ms: float,
+        payload_bytes: int | None = None,
+        error: bool = False,
+    ) -> None:
+        """Record one call."""
+        stats = self.calls.get(name)
+        if stats is None:
+            stats = self.calls[name] = CallStats(kind)
+        stats.record(duration_ms, payload_bytes, error)
+        self.recent.append({
+            "name": name,
+            "duration_ms": round(duration_ms, 3),
+            "payload_bytes": payload_bytes,
+            "error": error,
+            "time": dt_util.utcnow().isoformat(),
+        })
+
+    @callback
+    def record_throttle(self, name: str, cached: bool) -> None:
+        """Record a rate-limited command call."""
+        stats = self.calls.setdefault(name, CallStats(KIND_COMMAND))
+        stats.throttled += 1
+        if cached:
+            stats.throttled_cached += 1
+
+    @callback
+    def record_cache(self, name: str, hit: bool) -> None:
+        """Record a lookup in a named cache."""
+        counts = self.caches.setdefault(name, [0, 0])
+        counts[0 if hit else 1] += 1
+
+    @callback
+    def cache_summary(self) -> dict[str, dict[str, Any]]:
+        """Return hits, misses and hit rate per cache."""
+        return {
+            name: {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+            }
+            for name, (hits, misses) in sorted(self.caches.items())
+        }
+
+    @callback
+    def slowest(self, limit: int = SLOWEST_CALLS) -> list[dict[str, Any]]:
+        """Return the slowest of the recent calls."""
+        return sorted(
+            self.recent, key=lambda call: call["duration_ms"], reverse=True
+        )[:limit]
+
+    @callback
+    def reset(self) -> None:
+        """Clear all recorded calls (known names are kept)."""
+        for name, stats in self.calls.items():
+            self.calls[name] = CallStats(stats.kind)
+        self.recent.clear()
+        self.caches.clear()
+        self.since = dt_util.utcnow()
+
+    @callback
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable summary."""
+        return {
+            "since": self.since.isoformat(),
+            "commands": {
+                name: stats.as_dict()
+                for name, stats in sorted(self.calls.items())
+                if stats.kind == KIND_COMMAND
+            },
+            "mutations": {
+                name: stats.as_dict()
+                for name, stats in sorted(self.calls.items())
+                if stats.kind == KIND_MUTATION
+            },
+            "caches": self.cache_summary(),
+            "slowest": self.slowest(),
+        }
+
+
+@callback
+def async_get_stats(hass: HomeAssistant) -> HandlerStats | None:
+    """Return the statistics of the loaded config entry, if any."""
+    return hass.data.get(DOMAIN, {}).get("stats")
+
+
+@callback
+def async_record_cache(hass: HomeAssistant, name: str, hit: bool) -> None:
+    """Record a cache lookup in the statistics of the loaded entry."""
+    if (stats := async_get_stats(hass)) is not None:
+        stats.record_cache(name, hit)
+
+
+class _InstrumentedConnection:
+    """Connection proxy that records the first response of a command.
+
+    result_listener, if set, is called once with the first response: the
+    result sent with send_result, or an EncodedResult for a pre-encoded
+    message sent with send_message.
+    """
+
+    __slots__ = (
+        "_connection", "_hass", "_command", "_start", "_recorded", "_tracer",
+        "result_listener",
+    )
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: ActiveConnection,
+        command: str,
+        tracer: Tracer | None,
+    ) -> None:
+        self._connection = connection
+        self._hass = hass
+        self._command = command
+        self._start = time.perf_counter()
+        self._recorded = False
+        self._tracer = tracer
+        self.result_listener: Callable[[Any], None] | None = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._connection, name)
+
+    def _record(
+        self, payload_bytes: int | None, error: bool, send_start: float | None = None
+    ) -> None:
+        if self._recorded:
+            return
+        self._recorded = True
+        end = time.perf_counter()
+        if (stats := async_get_stats(self._hass)) is not None:
+            stats.record(
+                self._command,
+                KIND_COMMAND,
+                (end - self._start) * 1000,
+                payload_bytes,
+                error,
+            )
+        if self._tracer is not None:
+            if send_start is not None:
+                self._tracer.add("send_result", CATEGORY_STAGE, send_start, end)
+            self._tracer.add(
+                self._command,
+                CATEGORY_COMMAND,
+                self._start,
+                end,
+                {"payload_bytes": payload_bytes, "error": error},
+            )
+
+    @callback
+    def send_result(self, msg_id: int, result: Any | None = None) -> None:
+        """Encode the result once, record its size and send it."""
+        send_start = time.perf_counter()
+        try:
+            payload = json_bytes(websocket_api.result_message(msg_id, result))
+        except (TypeError, ValueError):
+            # Let the connection report the unserializable result
+            self._record(None, True)
+            self._connection.send_result(msg_id, result)
+            return
+        self._connection.send_message(payload)
+        self._record(len(payload), False, send_start)
+        self._notify_result(result)
+
+    @callback
+    def send_message(self, message: bytes | str | dict[str, Any]) -> None:
+        """Send a (possibly pre-encoded) message, recording its size."""
+        self._connection.send_message(message)
+        self._record(
+            len(message) if isinstance(message, (bytes, str)) else None, False
+        )
+        if isinstance(message, (bytes, str)):
+            self._notify_result(EncodedResult(message))
+
+    def _notify_result(self, result: Any) -> None:
+        """Pass the first response to result_listener."""
+        listener, self.result_listener = self.result_listener, None
+        if listener is not None:
+            listener(result)
+
+    @callback
+    def send_error(self, msg_id: int, code: str, message: str, *args: Any, **kwargs: Any) -> None:
+        """Record a failed call and send the error."""
+        self._connection.send_error(msg_id, code, message, *args, **kwargs)
+        self._record(None, True)
+
+    @callback
+    def async_handle_exception(self, msg: dict[str, Any], err: Exception) -> None:
+        """Record a failed call and let the connection report it."""
+        self._connection.async_handle_exception(msg, err)
+        self._record(None, True)
+
+
+@callback
+def instrument_command(
+    hass: HomeAssistant, handler: Callable[..., None]
+) -> Callable[..., None]:
+    """Wrap a WebSocket command handler to record its statistics.
+
+    The wrapper keeps the command type and schema attached by
+    websocket_command, so it is registered like the handler itself. While
+    tracing is enabled the handler also runs on its own trace track.
+    Calls over the command's rate limit are answered without running the
+    handler.
+    """
+    command: str = handler._ws_command  # noqa: SLF001
+    if (stats := async_get_stats(hass)) is not None:
+        stats.register(command, KIND_COMMAND)
+    if (limiter := async_get_rate_limiter(hass)) is not None:
+        limiter.register(command)
+
+    @callback
+    @wraps(handler)
+    def _instrumented(
+        hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+    ) -> None:
+        tracer = async_get_tracer(hass)
+        proxy = _InstrumentedConnection(hass, connection, command, tracer)
+        if (limiter := async_get_rate_limiter(hass)) is not None and (
+            throttled := limiter.async_throttle(connection, proxy, command, msg)
+        ) is not None:
+            if (stats := async_get_stats(hass)) is not None:
+                stats.record_throttle(command, throttled)
+            return
+        if tracer is None:
+            handler(hass, proxy, msg)
+        else:
+            run_on_track(tracer, handler, hass, proxy, msg)
+
+    return _instrumented
+
+
+def instrument_mutation(
+    func: Callable[_P, Awaitable[_R]],
+) -> Callable[_P, Awaitable[_R]]:
+    """Decorate an async function taking hass first to record its statistics."""
+    name = func.__name__
+
+    @wraps(func)
+    async def _instrumented(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+        hass: HomeAssistant = args[0]
+        start = time.perf_counter()
+        error = False
+        try:
+            return await func(*args, **kwargs)
+        except Exception:
+            error = True
+            raise
+        finally:
+            if (stats := async_get_stats(hass)) is not None:
+                stats.record(
+                    name, KIND_MUTATION, (time.perf_counter() - start) * 1000,
+                    error=error,
+                )
+
+    return _instrumented
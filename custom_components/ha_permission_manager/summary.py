@@ -0,0 +1,297 @@
+"""Live area and label summaries for ha_permission_manager.
+
+For every area and label the aggregator keeps a rollup of the states of
+its entities: how many are on per domain, how many covers and doors are
+open, and the average temperature and humidity of its sensors. Rollups
+are updated incrementally: each entity's last contribution is remembered,
+so a state change subtracts it from the entity's scopes and adds the new
+one, without rescanning the scope. Scope membership comes from the scope
+index, which also reports entities that move between scopes.
+
+Changed scopes are collected and pushed to subscribers in batches.
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import (
+    ATTR_DEVICE_CLASS,
+    EVENT_STATE_CHANGED,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+)
+from homeassistant.core import Event, State, callback
+from homeassistant.helpers.event import async_call_later
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .index import ScopeIndex
+
+_LOGGER = logging.getLogger(__name__)
+
+# Changed scopes are pushed at most this often (seconds)
+PUSH_DELAY = 0.5
+
+# Domains counted as "on" in the summary, with their states that count
+ON_STATES = {
+    "light": ("on",),
+    "switch": ("on",),
+    "fan": ("on",),
+    "input_boolean": ("on",),
+    "humidifier": ("on",),
+    "media_player": ("on", "playing", "paused", "buffering"),
+    "climate": ("heat", "cool", "heat_cool", "auto", "dry", "fan_only"),
+    "vacuum": ("cleaning",),
+}
+COVER_OPEN_STATES = ("open", "opening")
+DOOR_DEVICE_CLASSES = ("door", "garage_door")
+
+
+@dataclass(frozen=True)
+class Contribution:
+    """What one entity's state adds to the summaries of its scopes."""
+    on_domain: str | None = None
+    cover_open: bool = False
+    door_open: bool = False
+    temperature: float | None = None
+    humidity: float | None = None
+
+
+_EMPTY = Contribution()
+
+
+@dataclass
+class ScopeSummary:
+    """Rollup of the entity states in one area or label."""
+    on: dict[str, int] = field(default_factory=dict)
+    covers_open: int = 0
+    doors_open: int = 0
+    temperature_sum: float = 0.0
+    temperature_count: int = 0
+    humidity_sum: float = 0.0
+    humidity_count: int = 0
+
+    def add(self, contribution: Contribution, sign: int) -> None:
+        """Add (sign=1) or subtract (sign=-1) an entity's contribution."""
+        if contribution.on_domain:
+            count = self.on.get(contribution.on_domain, 0) + sign
+            if count:
+                self.on[contribution.on_domain] = count
+            else:
+                del self.on[contribution.on_domain]
+        if contribution.cover_open:
+            self.covers_open += sign
+        if contribution.door_open:
+            self.doors_open += sign
+        if contribution.temperature is not None:
+            self.temperature_sum += sign * contribution.temperature
+            self.temperature_count += sign
+        if contribution.humidity is not None:
+            self.humidity_sum += sign * contribution.humidity
+            self.humidity_count += sign
+
+    def is_empty(self) -> bool:
+        """Return True when no entity contributes to the summary."""
+        return not (
+            self.on or self.covers_open or self.doors_open
+            or self.temperature_count or self.humidity_count
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the summary as sent to clients."""
+        return {
+            "on": dict(self.on),
+            "covers_open": self.covers_open,
+            "doors_open": self.doors_open,
+            "temperature": (
+                round(self.temperature_sum / self.temperature_count, 1)
+                if self.temperature_count else None
+            ),
+            "humidity": (
+                round(self.humidity_sum / self.humidity_count, 1)
+                if self.humidity_count else None
+            ),
+        }
+
+
+def _numeric(state: State) -> float | None:
+    """Return the numeric state value, or None."""
+    try:
+        return float(state.state)
+    except ValueError:
+        return None
+
+
+def state_contribution(state: State | None) -> Contribution:
+    """Return what a state contributes to its scopes' summaries."""
+    if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+        return _EMPTY
+    domain = state.domain
+    if domain in ON_STATES:
+        if state.state in ON_STATES[domain]:
+            return Contribution(on_domain=domain)
+        return _EMPTY
+    if domain == "cover":
+        if state.state in COVER_OPEN_STATES:
+            return Contribution(cover_open=True)
+        return _EMPTY
+    device_class = state.attributes.get(ATTR_DEVICE_CLASS)
+    if domain == "binary_sensor" and device_class in DOOR_DEVICE_CLASSES:
+        if state.state == "on":
+            return Contribution(door_open=True)
+        return _EMPTY
+    if domain == "sensor" and device_class in ("temperature", "humidity"):
+        if (value := _numeric(state)) is None:
+            return _EMPTY
+        if device_class == "temperature":
+            return Contribution(temperature=value)
+        return Contribution(humidity=value)
+    return _EMPTY
+
+
+class ScopeSummaries:
+    """Incrementally maintained per-area and per-label state rollups."""
+
+    def __init__(self, hass: HomeAssistant, index: ScopeIndex) -> None:
+        """Initialize the aggregator."""
+        self.hass = hass
+        self.index = index
+        self.summaries: dict[tuple[str, str], ScopeSummary] = {}
+        # entity_id -> (contribution, scopes it was added to)
+        self._applied: dict[str, tuple[Contribution, tuple[tuple[str, str], ...]]] = {}
+        self._dirty: set[tuple[str, str]] = set()
+        self._listeners: list[Callable[[set[tuple[str, str]]], None]] = []
+        self._unsub_push: Callable[[], None] | None = None
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    @callback
+    def async_setup(self) -> list[Callable[[], None]]:
+        """Build the summaries and follow state and scope changes.
+
+        Returns:
+            List of unsubscribe callbacks.
+        """
+        self._async_rebuild()
+        return [
+            self.hass.bus.async_listen(EVENT_STATE_CHANGED, self._async_state_changed),
+            self.index.async_add_listener(self._async_scopes_changed),
+            self._async_cancel_push,
+        ]
+
+    @callback
+    def _async_rebuild(self) -> None:
+        """Recompute every summary from the current states."""
+        self._dirty.update(self.summaries)
+        self.summaries.clear()
+        self._applied.clear()
+        for entity_id in self.index.entities:
+            self._apply(entity_id, self.hass.states.get(entity_id))
+        self._schedule_push()
+
+    @callback
+    def _async_cancel_push(self) -> None:
+        """Cancel a pending push."""
+        if self._unsub_push is not None:
+            self._unsub_push()
+            self._unsub_push = None
+
+    # -------------------------------------------------------------------------
+    # Queries and subscriptions
+    # -------------------------------------------------------------------------
+
+    @callback
+    def get(self, kind: str, scope_id: str) -> dict[str, Any]:
+        """Return the summary of an area or label."""
+        summary = self.summaries.get((kind, scope_id))
+        return (summary or ScopeSummary()).as_dict()
+
+    @callback
+    def async_subscribe(
+        self, listener: Callable[[set[tuple[str, str]]], None]
+    ) -> Callable[[], None]:
+        """Call listener with the (kind, ID) of changed scopes.
+
+        Returns:
+            Callback that removes the listener.
+        """
+        self._listeners.append(listener)
+
+        @callback
+        def _remove() -> None:
+            self._listeners.remove(listener)
+
+        return _remove
+
+    # -------------------------------------------------------------------------
+    # Maintenance
+    # -------------------------------------------------------------------------
+
+    def _apply(self, entity_id: str, state: State | None) -> None:
+        """Move an entity's contribution to its current state and scopes."""
+        contribution = state_contribution(state)
+        scopes = tuple(self.index.entity_scopes(entity_id))
+        old_contribution, old_scopes = self._applied.get(entity_id, (_EMPTY, ()))
+        if contribution == old_contribution and (
+            scopes == old_scopes or contribution == _EMPTY
+        ):
+            # e.g. an attribute-only change
+            return
+
+        # Entities without a contribution are never stored in _applied
+        for scope in old_scopes:
+            summary = self.summaries[scope]
+            summary.add(old_contribution, -1)
+            if summary.is_empty():
+                # get() reports the same empty summary for missing scopes
+                del self.summaries[scope]
+            self._dirty.add(scope)
+        if contribution == _EMPTY or not scopes:
+            self._applied.pop(entity_id, None)
+            return
+        for scope in scopes:
+            summary = self.summaries.get(scope)
+            if summary is None:
+                self.summaries[scope] = summary = ScopeSummary()
+            summary.add(contribution, 1)
+            self._dirty.add(scope)
+        self._applied[entity_id] = (contribution, scopes)
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Update the summaries of a changed entity's scopes."""
+        entity_id = event.data["entity_id"]
+        if entity_id not in self.index.entities and entity_id not in self._applied:
+            return
+        self._apply(entity_id, event.data.get("new_state"))
+        self._schedule_push()
+
+    @callback
+    def _async_scopes_changed(self, entity_ids: set[str] | None) -> None:
+        """Move re-indexed entities to their new scopes."""
+        if entity_ids is None:
+            self._async_rebuild()
+            return
+        for entity_id in entity_ids:
+            self._apply(entity_id, self.hass.states.get(entity_id))
+        self._schedule_push()
+
+    def _schedule_push(self) -> None:
+        """Push the changed scopes after PUSH_DELAY, batching changes."""
+        if self._dirty and self._unsub_push is None and self._listeners:
+            self._unsub_push = async_call_later(self.hass, PUSH_DELAY, self._async_push)
+
+    @callback
+    def _async_push(self, _now: datetime) -> None:
+        """Send the changed scopes to the subscribers."""
+        self._unsub_push = None
+        dirty, self._dirty = self._dirty, set()
+        for listener in list(self._listeners):
+            listener(dirty)
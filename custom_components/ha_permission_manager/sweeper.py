@@ -0,0 +1,275 @@
+"""Background cleanup of orphaned permission entries for ha_permission_manager.
+
+Registry listeners remove the grants of areas, labels, floors, devices,
+dashboards and users as they are deleted, but anything deleted while the
+integration was not loaded stays in the Store. The sweeper compares the
+stored user and resource IDs with the current users, registries and
+frontend panels and removes the ones that no longer exist. A panel can be
+missing for a while (e.g. a dashboard being reloaded), so panel grants
+are only removed once the panel is missing in two consecutive sweeps.
+
+The sets of existing IDs are built once per sweep. Users are then checked
+in chunks of SWEEP_CHUNK, yielding to the event loop between chunks, and
+the orphans found are removed as one batched change. A sweep runs shortly
+after Home Assistant has started and then every SWEEP_INTERVAL.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import floor_registry as fr
+from homeassistant.helpers import label_registry as lr
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.json import json_bytes
+from homeassistant.helpers.start import async_at_started
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    PREFIX_AREA,
+    PREFIX_DEVICE,
+    PREFIX_FLOOR,
+    PREFIX_LABEL,
+    PREFIX_PANEL,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# Users checked per event loop iteration
+SWEEP_CHUNK = 50
+# First sweep after startup (dashboards register their panels during
+# startup), then periodic sweeps
+START_DELAY = 300
+SWEEP_INTERVAL = timedelta(hours=24)
+
+
+@dataclass
+class Orphans:
+    """Stored entries that refer to users or resources that no longer exist."""
+    users: set[str] = field(default_factory=set)
+    resources: set[str] = field(default_factory=set)
+    # (user_id, resource_id) of direct grants, (role_id, resource_id) of
+    # role grants and (role_id, user_id) of role members
+    cells: list[tuple[str, str]] = field(default_factory=list)
+    role_cells: list[tuple[str, str]] = field(default_factory=list)
+    role_members: list[tuple[str, str]] = field(default_factory=list)
+    schedules: list[str] = field(default_factory=list)
+    # Panels missing for the first time; not removed yet
+    pending_panels: set[str] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        """Return True if anything was found."""
+        return bool(
+            self.users or self.cells or self.role_cells
+            or self.role_members or self.schedules
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the orphans as sent to clients."""
+        return {
+            "users": sorted(self.users),
+            "resources": sorted(self.resources),
+            "cells": len(self.cells),
+            "role_cells": len(self.role_cells),
+            "role_members": len(self.role_members),
+            "schedules": len(self.schedules),
+            "pending_panels": sorted(self.pending_panels),
+        }
+
+
+def _count_entries(removed: dict[str, Any]) -> int:
+    """Return the number of entries removed (see async_remove_orphans)."""
+    return (
+        sum(len(user_perms) for user_perms in removed["permissions"].values())
+        + sum(len(grants) for grants in removed["role_permissions"].values())
+        + sum(len(members) for members in removed["role_members"].values())
+        + len(removed["schedules"])
+    )
+
+
+class OrphanSweeper:
+    """Find and remove permission entries for deleted users and resources."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the sweeper."""
+        self.hass = hass
+        self._lock = asyncio.Lock()
+        # Result of the last sweep and totals since setup
+        self.last_result: dict[str, Any] | None = None
+        self.total_removed = 0
+        self.total_reclaimed_bytes = 0
+        # Panel resource IDs missing in the last sweep
+        self._missing_panels: set[str] = set()
+        self._unsubs: list[Callable[[], None]] = []
+
+    @callback
+    def async_start(self) -> Callable[[], None]:
+        """Schedule the startup sweep and the periodic sweeps.
+
+        Returns:
+            Callback that stops the sweeper.
+        """
+
+        @callback
+        def _async_started(_hass: HomeAssistant) -> None:
+            self._unsubs.append(
+                async_call_later(self.hass, START_DELAY, self._async_scheduled)
+            )
+
+        self._unsubs.append(async_at_started(self.hass, _async_started))
+        self._unsubs.append(
+            async_track_time_interval(self.hass, self._async_scheduled, SWEEP_INTERVAL)
+        )
+        return self.async_stop
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the scheduled sweeps."""
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    @callback
+    def _async_scheduled(self, _now: datetime) -> None:
+        """Start a sweep in the background."""
+        entry = self.hass.data[DOMAIN]["entry"]
+        entry.async_create_background_task(
+            self.hass, self.async_sweep(), f"{DOMAIN} orphan sweep"
+        )
+
+    async def async_sweep(self, *, dry_run: bool = False) -> dict[str, Any]:
+        """Find orphaned entries and remove them unless dry_run.
+
+        Args:
+            dry_run: Only report the orphans.
+
+        Returns:
+            The sweep result: time, duration, users scanned, orphans,
+            entries removed and bytes reclaimed.
+        """
+        async with self._lock:
+            started = time.monotonic()
+            orphans, scanned = await self._async_find()
+            removed = 0
+            reclaimed = 0
+            if orphans and not dry_run:
+                # Imported here to avoid a circular import
+                from . import async_remove_orphans
+
+                removed_data = await async_remove_orphans(self.hass, orphans)
+                removed = _count_entries(removed_data)
+                # Approximately what the entries took in the Store
+                reclaimed = len(json_bytes(removed_data)) if removed else 0
+                self.total_removed += removed
+                self.total_reclaimed_bytes += reclaimed
+
+            result = {
+                "time": dt_util.utcnow().isoformat(),
+                "duration": round(time.monotonic() - started, 3),
+                "dry_run": dry_run,
+                "scanned_users": scanned,
+                "orphans": orphans.as_dict(),
+                "removed": removed,
+                "reclaimed_bytes": reclaimed,
+            }
+            if not dry_run:
+                self.last_result = result
+                self._missing_panels = orphans.pending_panels | {
+                    resource_id for resource_id in orphans.resources
+                    if resource_id.startswith(PREFIX_PANEL)
+                }
+            if removed:
+                _LOGGER.info(
+                    "Removed %d orphaned permission entries (%d bytes)", removed, reclaimed
+                )
+            return result
+
+    @callback
+    def _known_resources(self) -> dict[str, set[str]]:
+        """Return the existing resource IDs per prefix.
+
+        Panels are left out while no frontend panels are registered, so
+        that panel grants are not removed before the frontend is set up.
+        """
+        known = {
+            PREFIX_AREA: {area.id for area in ar.async_get(self.hass).async_list_areas()},
+            PREFIX_LABEL: {
+                label.label_id
+                for label in lr.async_get(self.hass).async_list_labels()
+            },
+            PREFIX_FLOOR: {
+                floor.floor_id
+                for floor in fr.async_get(self.hass).async_list_floors()
+            },
+            PREFIX_DEVICE: set(dr.async_get(self.hass).devices),
+        }
+        if panels := self.hass.data.get("frontend_panels"):
+            known[PREFIX_PANEL] = set(panels)
+        return known
+
+    async def _async_find(self) -> tuple[Orphans, int]:
+        """Find orphaned entries, SWEEP_CHUNK users per loop iteration.
+
+        Returns:
+            Tuple of (orphans, number of users scanned).
+        """
+        known = self._known_resources()
+        user_ids = {user.id for user in await self.hass.auth.async_get_users()}
+        orphans = Orphans()
+
+        def _orphaned(resource_id: str) -> bool:
+            for prefix, existing in known.items():
+                if resource_id.startswith(prefix):
+                    if resource_id[len(prefix):] in existing:
+                        return False
+                    if prefix == PREFIX_PANEL and resource_id not in self._missing_panels:
+                        orphans.pending_panels.add(resource_id)
+                        return False
+                    orphans.resources.add(resource_id)
+                    return True
+            # Unknown prefixes and panels before the frontend is set up
+            return False
+
+        domain_data = self.hass.data[DOMAIN]
+        # The chunks are checked against the live data; users changed or
+        # removed in between are checked again on removal
+        pending = list(domain_data.get("permissions", {}))
+        for start in range(0, len(pending), SWEEP_CHUNK):
+            permissions = domain_data.get("permissions", {})
+            for user_id in pending[start:start + SWEEP_CHUNK]:
+                if (user_perms := permissions.get(user_id)) is None:
+                    continue
+                if user_id not in user_ids:
+                    orphans.users.add(user_id)
+                    continue
+                orphans.cells.extend(
+                    (user_id, resource_id)
+                    for resource_id in user_perms if _orphaned(resource_id)
+                )
+            await asyncio.sleep(0)
+
+        for role_id, role in domain_data.get("roles", {}).items():
+            orphans.role_cells.extend(
+                (role_id, resource_id)
+                for resource_id in role["permissions"] if _orphaned(resource_id)
+            )
+            orphans.role_members.extend(
+                (role_id, member) for member in role["members"]
+                if member not in user_ids
+            )
+        for schedule_id, schedule in domain_data.get("schedules", {}).items():
+            if schedule["user_id"] not in user_ids or _orphaned(schedule["resource_id"]):
+                orphans.schedules.append(schedule_id)
+
+        return orphans, len(pending)
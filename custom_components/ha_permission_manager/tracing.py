@@ -0,0 +1,214 @@
+"""Opt-in request tracing for ha_permission_manager.
+
+While tracing is enabled, every WebSocket command records a span from
+invocation until its response is sent, and handlers and discovery
+functions record nested spans for their stages. Spans go into a bounded
+ring buffer and are exported in the Chrome trace event format, which can
+be opened in chrome://tracing or Perfetto.
+
+Each command gets its own track (tid), so concurrent requests do not
+interleave. When tracing is disabled, span() returns a shared no-op
+context manager and costs a dictionary lookup.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from contextvars import ContextVar, copy_context
+from functools import wraps
+from itertools import count
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar
+
+from homeassistant.core import callback
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+
+DEFAULT_BUFFER_SIZE = 10000
+MIN_BUFFER_SIZE = 100
+MAX_BUFFER_SIZE = 100000
+
+CATEGORY_COMMAND = "command"
+CATEGORY_STAGE = "stage"
+CATEGORY_FUNCTION = "function"
+
+# Track of the command being handled; copied into its async task
+_TRACK: ContextVar[int] = ContextVar(f"{DOMAIN}_trace_track", default=0)
+
+
+class Tracer:
+    """Bounded ring buffer of completed spans."""
+
+    def __init__(self) -> None:
+        """Initialize a disabled tracer."""
+        self.enabled = False
+        self.events: deque[dict[str, Any]] = deque(maxlen=DEFAULT_BUFFER_SIZE)
+        self._origin = time.perf_counter()
+        self._tracks = count(1)
+
+    @callback
+    def enable(self, buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+        """Start recording (keeps recorded spans if the size is unchanged)."""
+        if buffer_size != self.events.maxlen:
+            self.events = deque(self.events, maxlen=buffer_size)
+        self.enabled = True
+        _LOGGER.info("Request tracing enabled (buffer of %d spans)", buffer_size)
+
+    @callback
+    def disable(self) -> None:
+        """Stop recording (recorded spans stay available)."""
+        self.enabled = False
+        _LOGGER.info("Request tracing disabled")
+
+    @callback
+    def new_track(self) -> int:
+        """Return a new track ID for a command."""
+        return next(self._tracks)
+
+    @callback
+    def add(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        end: float,
+        args: dict[str, Any] | None = None,
+        track: int | None = None,
+    ) -> None:
+        """Record a completed span (perf_counter start/end)."""
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round((start - self._origin) * 1_000_000, 1),
+            "dur": round((end - start) * 1_000_000, 1),
+            "pid": 1,
+            "tid": _TRACK.get() if track is None else track,
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    @callback
+    def as_chrome_trace(self) -> dict[str, Any]:
+        """Return the recorded spans in the Chrome trace event format."""
+        return {
+            "traceEvents": [
+                {
+                    "name": "process_name",
+                    "ph": "M",
+                    "pid": 1,
+                    "args": {"name": DOMAIN},
+                },
+                *self.events,
+            ],
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "enabled": self.enabled,
+                "buffer_size": self.events.maxlen,
+                "spans": len(self.events),
+            },
+        }
+
+
+class _Span:
+    """Context manager recording one span."""
+
+    __slots__ = ("_tracer", "_name", "_category", "_args", "_start")
+
+    def __init__(
+        self, tracer: Tracer, name: str, category: str, args: dict[str, Any]
+    ) -> None:
+        self._tracer = tracer
+        self._name = name
+        self._category = category
+        self._args = args
+        self._start = 0.0
+
+    def __enter__(self) -> _Span:
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if exc_info[0] is not None:
+            self._args["error"] = exc_info[0].__name__
+        self._tracer.add(
+            self._name, self._category, self._start, time.perf_counter(), self._args
+        )
+
+
+class _NoSpan:
+    """No-op span used while tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> _NoSpan:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+
+_NO_SPAN = _NoSpan()
+
+
+@callback
+def async_get_tracer(hass: HomeAssistant) -> Tracer | None:
+    """Return the tracer if tracing is enabled."""
+    tracer: Tracer | None = hass.data.get(DOMAIN, {}).get("tracer")
+    if tracer is None or not tracer.enabled:
+        return None
+    return tracer
+
+
+def span(
+    hass: HomeAssistant, name: str, category: str = CATEGORY_STAGE, **args: Any
+) -> _Span | _NoSpan:
+    """Return a context manager recording a span while tracing is enabled.
+
+    Args:
+        hass: Home Assistant instance.
+        name: Span name.
+        category: Span category.
+        **args: Extra values shown with the span.
+    """
+    if (tracer := async_get_tracer(hass)) is None:
+        return _NO_SPAN
+    return _Span(tracer, name, category, args)
+
+
+def traced(func: Callable[_P, _R]) -> Callable[_P, _R]:
+    """Decorate a function taking hass first to record a span per call."""
+    name = func.__name__
+
+    @wraps(func)
+    def _traced(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+        with span(args[0], name, CATEGORY_FUNCTION):
+            return func(*args, **kwargs)
+
+    return _traced
+
+
+def run_on_track(tracer: Tracer, func: Callable[..., None], *args: Any) -> None:
+    """Run func with a new track set in a copied context.
+
+    Async tasks created by func inherit the track, so their spans land on
+    the same track as the command that started them; the caller's context
+    is left untouched.
+    """
+    track = tracer.new_track()
+
+    def _run() -> None:
+        _TRACK.set(track)
+        func(*args)
+
+    copy_context().run(_run)
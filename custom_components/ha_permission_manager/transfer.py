@@ -0,0 +1,278 @@
+"""Export and import of permission data for ha_permission_manager.
+
+The Store data is transferred in chunks so that large permission matrices
+never travel as one WebSocket message. An export is a header followed by
+chunks of one section each:
+
+    header: {"schema": EXPORT_SCHEMA, "version": EXPORT_VERSION,
+             "exported_at": iso datetime, "counts": {section: int}}
+    chunk:  {"section": "permissions" | "roles" | "schedules",
+             "items": {key: value, ...}}
+
+The items use the Store layout (see __init__.py, roles.py and
+scheduler.py). An import sends the same chunks into a pending import,
+which is validated against the registries in bulk when it is committed.
+"""
+from __future__ import annotations
+
+import logging
+import secrets
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import time as dt_time
+from itertools import islice
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import floor_registry as fr
+from homeassistant.helpers import label_registry as lr
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    PERM_CLOSED,
+    PERM_VIEW,
+    PREFIX_AREA,
+    PREFIX_DEVICE,
+    PREFIX_FLOOR,
+    PREFIX_LABEL,
+    PREFIX_PANEL,
+    VALID_ID_PATTERN,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+EXPORT_SCHEMA = f"{DOMAIN}.permissions"
+EXPORT_VERSION = 1
+
+SECTIONS = ("permissions", "roles", "schedules")
+
+DEFAULT_CHUNK_SIZE = 100
+# Pending imports are dropped when not committed in time
+IMPORT_TTL = 600
+MAX_PENDING_IMPORTS = 4
+MAX_IMPORT_ITEMS = 100000
+
+
+def iter_export_chunks(
+    data: dict[str, Any], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[dict[str, Any]]:
+    """Yield the export chunks of Store data.
+
+    Args:
+        data: Store data (permissions, roles and schedules).
+        chunk_size: Maximum number of items per chunk.
+
+    Yields:
+        Chunks of {"section", "items"}.
+    """
+    for section in SECTIONS:
+        items = iter(data.get(section, {}).items())
+        while chunk := dict(islice(items, chunk_size)):
+            yield {"section": section, "items": chunk}
+
+
+@dataclass
+class PendingImport:
+    """Chunks received for an import that has not been committed yet."""
+    import_id: str
+    created: float = field(default_factory=time.monotonic)
+    sections: dict[str, dict[str, Any]] = field(
+        default_factory=lambda: {section: {} for section in SECTIONS}
+    )
+
+    def size(self) -> int:
+        """Return the number of items received."""
+        return sum(len(items) for items in self.sections.values())
+
+    def counts(self) -> dict[str, int]:
+        """Return the number of items received per section."""
+        return {section: len(items) for section, items in self.sections.items()}
+
+
+@callback
+def async_get_pending_import(
+    hass: HomeAssistant, import_id: str | None
+) -> PendingImport | None:
+    """Return a pending import, or start a new one when import_id is None.
+
+    Expired imports are dropped, and the oldest is dropped when too many
+    are pending.
+
+    Returns:
+        The pending import, or None if import_id is unknown or expired.
+    """
+    imports: dict[str, PendingImport] = hass.data[DOMAIN].setdefault("imports", {})
+    now = time.monotonic()
+    for expired in [
+        pending_id for pending_id, pending in imports.items()
+        if now - pending.created > IMPORT_TTL
+    ]:
+        del imports[expired]
+
+    if import_id is not None:
+        return imports.get(import_id)
+
+    while len(imports) >= MAX_PENDING_IMPORTS:
+        del imports[next(iter(imports))]
+    pending = PendingImport(secrets.token_hex(8))
+    imports[pending.import_id] = pending
+    return pending
+
+
+@callback
+def async_pop_pending_import(hass: HomeAssistant, import_id: str) -> None:
+    """Drop a pending import."""
+    hass.data[DOMAIN].get("imports", {}).pop(import_id, None)
+
+
+async def async_validate_import(
+    hass: HomeAssistant, sections: dict[str, dict[str, Any]]
+) -> tuple[dict[str, dict[str, Any]], dict[str, Any]]:
+    """Validate imported data against the current users and registries.
+
+    Users and resources are looked up in sets built once per import.
+    Grants, role members and schedules that refer to unknown users or
+    resources are left out and reported; malformed items are left out
+    and reported as invalid.
+
+    Args:
+        hass: Home Assistant instance.
+        sections: Imported items per section.
+
+    Returns:
+        Tuple of (valid items per section, report).
+    """
+    user_ids = {user.id for user in await hass.auth.async_get_users()}
+    known_resources = {
+        PREFIX_PANEL: set(hass.data.get("frontend_panels", {})),
+        PREFIX_AREA: {area.id for area in ar.async_get(hass).async_list_areas()},
+        PREFIX_LABEL: {
+            label.label_id for label in lr.async_get(hass).async_list_labels()
+        },
+        PREFIX_FLOOR: {
+            floor.floor_id for floor in fr.async_get(hass).async_list_floors()
+        },
+        PREFIX_DEVICE: set(dr.async_get(hass).devices),
+    }
+    unknown_users: set[str] = set()
+    unknown_resources: set[str] = set()
+    invalid: list[str] = []
+
+    def _user_known(user_id: Any) -> bool:
+        if not isinstance(user_id, str):
+            return False
+        if user_id not in user_ids:
+            unknown_users.add(user_id)
+            return False
+        return True
+
+    def _resource_known(resource_id: Any) -> bool:
+        if not isinstance(resource_id, str):
+            return False
+        for prefix, known in known_resources.items():
+            if resource_id.startswith(prefix):
+                if resource_id[len(prefix):] in known:
+                    return True
+                break
+        unknown_resources.add(resource_id)
+        return False
+
+    def _grants(value: Any, where: str) -> dict[str, int]:
+        if not isinstance(value, dict):
+            invalid.append(where)
+            return {}
+        grants = {}
+        for resource_id, level in value.items():
+            if not _level_valid(level):
+                invalid.append(f"{where}/{resource_id}")
+            elif _resource_known(resource_id):
+                grants[resource_id] = level
+        return grants
+
+    permissions = {}
+    for user_id, user_grants in sections.get("permissions", {}).items():
+        if _user_known(user_id):
+            permissions[user_id] = _grants(user_grants, f"permissions/{user_id}")
+
+    roles = {}
+    for role_id, role in sections.get("roles", {}).items():
+        if (
+            not _id_valid(role_id)
+            or not isinstance(role, dict)
+            or not isinstance(role.get("name"), str)
+            or not isinstance(role.get("members", []), list)
+        ):
+            invalid.append(f"roles/{role_id}")
+            continue
+        roles[role_id] = {
+            "name": role["name"],
+            "permissions": _grants(role.get("permissions", {}), f"roles/{role_id}"),
+            "members": sorted({
+                member for member in role.get("members", []) if _user_known(member)
+            }),
+        }
+
+    schedules = {}
+    for schedule_id, schedule in sections.get("schedules", {}).items():
+        if not _id_valid(schedule_id) or not _schedule_valid(schedule):
+            invalid.append(f"schedules/{schedule_id}")
+            continue
+        if _user_known(schedule["user_id"]) and _resource_known(schedule["resource_id"]):
+            schedules[schedule_id] = {
+                key: schedule.get(key)
+                for key in (
+                    "user_id", "resource_id", "level",
+                    "valid_from", "valid_until", "recurrence",
+                )
+            }
+
+    report = {
+        "unknown_users": sorted(unknown_users),
+        "unknown_resources": sorted(unknown_resources),
+        "invalid": invalid,
+    }
+    return {"permissions": permissions, "roles": roles, "schedules": schedules}, report
+
+
+def _id_valid(item_id: Any) -> bool:
+    """Return True if item_id is a role or schedule ID the API would accept."""
+    return isinstance(item_id, str) and bool(VALID_ID_PATTERN.match(item_id))
+
+
+def _level_valid(level: Any) -> bool:
+    """Return True if level is a permission level."""
+    return type(level) is int and level in (PERM_CLOSED, PERM_VIEW)
+
+
+def _schedule_valid(schedule: Any) -> bool:
+    """Return True if a schedule has the Store layout (see scheduler.py)."""
+    if not isinstance(schedule, dict):
+        return False
+    if not all(isinstance(schedule.get(key), str) for key in ("user_id", "resource_id")):
+        return False
+    if not _level_valid(schedule.get("level")):
+        return False
+    # The scheduler treats an unparseable bound as absent, which would turn
+    # a time-limited grant into a permanent one
+    for key in ("valid_from", "valid_until"):
+        value = schedule.get(key)
+        if value is not None and (
+            not isinstance(value, str) or dt_util.parse_datetime(value) is None
+        ):
+            return False
+    recurrence = schedule.get("recurrence")
+    if recurrence is None:
+        return True
+    try:
+        dt_time.fromisoformat(recurrence["start"])
+        dt_time.fromisoformat(recurrence["end"])
+        return all(day in range(7) for day in recurrence["weekdays"])
+    except (KeyError, TypeError, ValueError):
+        return False
@@ -1,27 +1,67 @@
 """WebSocket API for ha_permission_manager."""
 from __future__ import annotations
 
+import asyncio
+import copy
 import logging
-import re
 from typing import Any, TYPE_CHECKING
 
 import voluptuous as vol
 from homeassistant.components import websocket_api
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import ATTR_SUPPORTED_FEATURES
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers import floor_registry as fr
 from homeassistant.helpers import label_registry as lr
-
-from .const import DOMAIN, PREFIX_PANEL, PREFIX_AREA, PREFIX_LABEL
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util import dt as dt_util
+
+from .audit import async_audit
+from .const import (
+    DOMAIN,
+    EVENT_PERMISSIONS_CHANGED,
+    PREFIX_AREA,
+    PREFIX_DEVICE,
+    PREFIX_FLOOR,
+    PREFIX_LABEL,
+    PREFIX_PANEL,
+    RESOURCE_PREFIXES,
+    SCOPE_ACTION_SERVICES,
+    VALID_ID_PATTERN,
+)
+from .index import page_of
+from .ratelimit import async_get_rate_limiter
+from .roles import (
+    async_get_effective_permissions,
+    async_get_permissions_revision,
+    compile_permissions,
+)
+from .snapshots import diff_permissions
+from .stats import async_get_stats, instrument_command
+from .tracing import DEFAULT_BUFFER_SIZE, MAX_BUFFER_SIZE, MIN_BUFFER_SIZE, span
+from .transfer import (
+    DEFAULT_CHUNK_SIZE,
+    EXPORT_SCHEMA,
+    EXPORT_VERSION,
+    MAX_IMPORT_ITEMS,
+    SECTIONS,
+    async_get_pending_import,
+    async_pop_pending_import,
+    async_validate_import,
+    iter_export_chunks,
+)
 
 if TYPE_CHECKING:
     from homeassistant.components.websocket_api import ActiveConnection
 
-_LOGGER = logging.getLogger(__name__)
+    from .index import ScopeIndex
+    from .snapshots import PermissionSnapshots
+    from .summary import ScopeSummaries
+    from .sweeper import OrphanSweeper
 
-# Input validation pattern for IDs
-VALID_ID_PATTERN = re.compile(r'^[a-zA-Z0-9_-]+$')
+_LOGGER = logging.getLogger(__name__)
 
 # Permission levels (2-level model)
 # Level 0 = Closed (hidden, no access)
@@ -29,24 +69,60 @@ VALID_ID_PATTERN = re.compile(r'^[a-zA-Z0-9_-]+$')
 PERM_CLOSED = 0
 PERM_VIEW = 1
 
+# Admin data payloads at least this large are encoded in the executor
+ADMIN_DATA_EXECUTOR_BYTES = 256 * 1024
+
 # Resource types
 PERM_AREA_TYPE = "area"
 PERM_LABEL_TYPE = "label"
 
 
 def async_register_websocket_api(hass: HomeAssistant) -> None:
-    """Register WebSocket API handlers."""
-    websocket_api.async_register_command(hass, ws_get_panel_permissions)
-    websocket_api.async_register_command(hass, ws_get_all_permissions)
+    """Register WebSocket API handlers (instrumented, see stats.py)."""
+    _async_register(hass, ws_get_panel_permissions)
+    _async_register(hass, ws_get_all_permissions)
     # Admin panel handlers
-    websocket_api.async_register_command(hass, ws_get_admin_data)
-    websocket_api.async_register_command(hass, ws_set_permission)
+    _async_register(hass, ws_get_admin_data)
+    _async_register(hass, ws_set_permission)
+    _async_register(hass, ws_save_role)
+    _async_register(hass, ws_delete_role)
+    _async_register(hass, ws_save_schedule)
+    _async_register(hass, ws_delete_schedule)
+    _async_register(hass, ws_get_audit_log)
+    _async_register(hass, ws_get_effective_access)
+    _async_register(hass, ws_export_permissions)
+    _async_register(hass, ws_import_permissions)
+    _async_register(hass, ws_create_snapshot)
+    _async_register(hass, ws_list_snapshots)
+    _async_register(hass, ws_diff_snapshot)
+    _async_register(hass, ws_restore_snapshot)
+    _async_register(hass, ws_delete_snapshot)
+    _async_register(hass, ws_sweep_orphans)
     # Area control handlers
-    websocket_api.async_register_command(hass, websocket_get_permitted_areas)
-    websocket_api.async_register_command(hass, websocket_get_area_entities)
+    _async_register(hass, websocket_get_permitted_areas)
+    _async_register(hass, websocket_get_area_entities)
     # Label control handlers
-    websocket_api.async_register_command(hass, websocket_get_permitted_labels)
-    websocket_api.async_register_command(hass, websocket_get_label_entities)
+    _async_register(hass, websocket_get_permitted_labels)
+    _async_register(hass, websocket_get_label_entities)
+    # Device control handlers
+    _async_register(hass, websocket_get_permitted_devices)
+    _async_register(hass, websocket_get_device_entities)
+    # Control panel handlers
+    _async_register(hass, websocket_search_entities)
+    _async_register(hass, websocket_get_entities)
+    _async_register(hass, websocket_area_action)
+    _async_register(hass, websocket_label_action)
+    _async_register(hass, websocket_subscribe_summaries)
+    websocket_api.async_register_command(hass, ws_get_stats)
+    websocket_api.async_register_command(hass, ws_set_tracing)
+    websocket_api.async_register_command(hass, ws_get_trace)
+    websocket_api.async_register_command(hass, ws_set_rate_limit)
+
+
+@callback
+def _async_register(hass: HomeAssistant, handler: Any) -> None:
+    """Register a command handler with latency/payload statistics."""
+    websocket_api.async_register_command(hass, instrument_command(hass, handler))
 
 
 # =============================================================================
@@ -56,7 +132,9 @@ def async_register_websocket_api(hass: HomeAssistant) -> None:
 
 @callback
 def _get_user_permissions(hass: HomeAssistant, user_id: str) -> dict[str, int]:
-    """Get all permissions for a user from Store.
+    """Get all effective permissions for a user from Store.
+
+    Returns the compiled view of the user's direct grants and role grants.
 
     Args:
         hass: Home Assistant instance.
@@ -65,9 +143,102 @@ def _get_user_permissions(hass: HomeAssistant, user_id: str) -> dict[str, int]:
     Returns:
         Dictionary mapping resource_id -> permission_level.
     """
-    domain_data = hass.data.get(DOMAIN, {})
-    permissions = domain_data.get("permissions", {})
-    return permissions.get(user_id, {})
+    with span(hass, "effective_permissions"):
+        return async_get_effective_permissions(hass, user_id)
+
+
+@callback
+def _get_permitted_ids(hass: HomeAssistant, user_id: str, prefix: str) -> set[str]:
+    """Get IDs of resources with the given prefix the user can view.
+
+    Args:
+        hass: Home Assistant instance.
+        user_id: The user ID to check permissions for.
+        prefix: Resource prefix (e.g., PREFIX_AREA).
+
+    Returns:
+        Set of resource IDs with the prefix stripped.
+    """
+    return _ids_with_prefix(_get_user_permissions(hass, user_id), prefix)
+
+
+def _ids_with_prefix(user_perms: dict[str, int], prefix: str) -> set[str]:
+    """Get IDs of viewable resources with the given prefix from permissions.
+
+    Args:
+        user_perms: Dictionary mapping resource_id -> permission_level.
+        prefix: Resource prefix (e.g., PREFIX_AREA).
+
+    Returns:
+        Set of resource IDs with the prefix stripped.
+    """
+    return {
+        resource_id[len(prefix):]
+        for resource_id, perm_level in user_perms.items()
+        if resource_id.startswith(prefix) and perm_level >= PERM_VIEW
+    }
+
+
+@callback
+def _group_by_domain(entity_ids: list[str]) -> dict[str, list[str]]:
+    """Group entity IDs by domain, preserving order.
+
+    Args:
+        entity_ids: Entity IDs to group.
+
+    Returns:
+        Dictionary mapping domain -> list of entity_ids.
+    """
+    entities_by_domain: dict[str, list[str]] = {}
+    for entity_id in entity_ids:
+        domain = entity_id.split(".")[0]
+        entities_by_domain.setdefault(domain, []).append(entity_id)
+    return entities_by_domain
+
+
+@callback
+def _get_entities_page(
+    hass: HomeAssistant,
+    kind: str,
+    scope_id: str,
+    msg: dict,
+    members: list[str] | None = None,
+) -> dict[str, Any]:
+    """Build a paginated entity listing result for an area, label or device.
+
+    Pages are ordered by domain and entity ID. The first page (no cursor)
+    also carries per-domain totals so the client can lay out the view
+    before the remaining pages arrive.
+
+    Args:
+        hass: Home Assistant instance.
+        kind: "area", "label" or "device".
+        scope_id: The area, label or device ID.
+        msg: The WebSocket message (with limit and optional cursor).
+        members: Sorted entity IDs to page through instead of all of the
+            scope's members.
+
+    Returns:
+        Result dict with entities, next_cursor and (first page) totals.
+    """
+    index: ScopeIndex = hass.data[DOMAIN]["index"]
+    cursor = msg.get("cursor")
+    if members is None:
+        members = index.sorted_members(kind, scope_id)
+    with span(hass, "index_page", kind=kind):
+        page, next_cursor = page_of(members, msg["limit"], cursor)
+
+    result: dict[str, Any] = {
+        "entities": _group_by_domain(page),
+        "next_cursor": next_cursor,
+    }
+    if cursor is None:
+        result["total"] = len(members)
+        result["domain_totals"] = {
+            domain: len(entity_ids)
+            for domain, entity_ids in _group_by_domain(members).items()
+        }
+    return result
 
 
 # =============================================================================
@@ -80,6 +251,8 @@ def get_user_permitted_areas(hass: HomeAssistant, user_id: str) -> list[dict]:
     """Get areas the user has permission to access.
 
     Uses Store-based permission data instead of entity state queries.
+    A floor grant permits every area on that floor (expanded through the
+    scope index's precomputed floor -> area map).
 
     Args:
         hass: Home Assistant instance.
@@ -88,27 +261,12 @@ def get_user_permitted_areas(hass: HomeAssistant, user_id: str) -> list[dict]:
     Returns:
         List of permitted area dicts with id, name, and permission_level.
     """
-    permitted = []
     area_reg = ar.async_get(hass)
 
-    # Get all permissions for this user from Store
-    user_perms = _get_user_permissions(hass, user_id)
-
     _LOGGER.debug("Checking area permissions for user_id: %s", user_id)
-    _LOGGER.debug("User has %d total permissions", len(user_perms))
-
-    for resource_id, perm_level in user_perms.items():
-        # Only process area resources
-        if not resource_id.startswith(PREFIX_AREA):
-            continue
-
-        # Check permission level >= 1 (View)
-        if perm_level < PERM_VIEW:
-            continue
-
-        # Extract area_id from resource_id (remove "area_" prefix)
-        area_id = resource_id[len(PREFIX_AREA):]
 
+    permitted = []
+    for area_id in sorted(_get_permitted_area_ids(hass, user_id)):
         # Get area info from registry for the name
         area = area_reg.async_get_area(area_id)
         area_name = area.name if area else area_id
@@ -116,12 +274,8 @@ def get_user_permitted_areas(hass: HomeAssistant, user_id: str) -> list[dict]:
         permitted.append({
             "id": area_id,
             "name": area_name,
-            "permission_level": perm_level,
+            "permission_level": PERM_VIEW,
         })
-        _LOGGER.debug(
-            "User %s has permission %d for area %s",
-            user_id, perm_level, area_id
-        )
 
     _LOGGER.debug(
         "User %s has %d permitted areas",
@@ -130,11 +284,55 @@ def get_user_permitted_areas(hass: HomeAssistant, user_id: str) -> list[dict]:
     return permitted
 
 
+@callback
+def _get_permitted_area_ids(hass: HomeAssistant, user_id: str) -> set[str]:
+    """Get IDs of areas the user can view, directly or through a floor.
+
+    Args:
+        hass: Home Assistant instance.
+        user_id: The user ID to check permissions for.
+
+    Returns:
+        Set of permitted area IDs.
+    """
+    index: ScopeIndex = hass.data[DOMAIN]["index"]
+    area_ids = _get_permitted_ids(hass, user_id, PREFIX_AREA)
+    for floor_id in _get_permitted_ids(hass, user_id, PREFIX_FLOOR):
+        area_ids |= index.floor_areas.get(floor_id, set())
+    return area_ids
+
+
+@callback
+def _is_area_permitted(hass: HomeAssistant, user_id: str, area_id: str) -> bool:
+    """Check in constant time whether the user can view an area.
+
+    Args:
+        hass: Home Assistant instance.
+        user_id: The user ID to check permissions for.
+        area_id: The area ID to check.
+
+    Returns:
+        True if the area or its floor is granted.
+    """
+    user_perms = _get_user_permissions(hass, user_id)
+    if user_perms.get(f"{PREFIX_AREA}{area_id}", PERM_CLOSED) >= PERM_VIEW:
+        return True
+    index: ScopeIndex = hass.data[DOMAIN]["index"]
+    floor_id = index.area_floor.get(area_id)
+    return (
+        floor_id is not None
+        and user_perms.get(f"{PREFIX_FLOOR}{floor_id}", PERM_CLOSED) >= PERM_VIEW
+    )
+
+
 async def get_entities_for_area(
     hass: HomeAssistant, area_id: str
 ) -> dict[str, list[str]]:
     """Get entities grouped by domain for an area.
 
+    Entities without an area inherit their device's area (resolved by the
+    scope index).
+
     Args:
         hass: Home Assistant instance.
         area_id: The area ID to get entities for.
@@ -142,27 +340,8 @@ async def get_entities_for_area(
     Returns:
         Dictionary mapping domain -> list of entity_ids.
     """
-    entity_reg = er.async_get(hass)
-    device_reg = dr.async_get(hass)
-
-    entities_by_domain: dict[str, list[str]] = {}
-
-    for entry in entity_reg.entities.values():
-        entity_area = entry.area_id
-
-        # If entity doesn't have area, check device
-        if not entity_area and entry.device_id:
-            device = device_reg.async_get(entry.device_id)
-            if device:
-                entity_area = device.area_id
-
-        if entity_area == area_id and not entry.disabled:
-            domain = entry.entity_id.split(".")[0]
-            if domain not in entities_by_domain:
-                entities_by_domain[domain] = []
-            entities_by_domain[domain].append(entry.entity_id)
-
-    return entities_by_domain
+    index: ScopeIndex = hass.data[DOMAIN]["index"]
+    return _group_by_domain(index.sorted_members("area", area_id))
 
 
 @websocket_api.websocket_command({
@@ -185,23 +364,6 @@ async def websocket_get_permitted_areas(
         connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
         return
 
-    area_reg = ar.async_get(hass)
-    entity_reg = er.async_get(hass)
-    device_reg = dr.async_get(hass)
-
-    # Pre-compute entity counts for all areas (O(n) instead of O(n*m))
-    entity_counts: dict[str, int] = {}
-    for entry in entity_reg.entities.values():
-        if entry.disabled:
-            continue
-        entity_area = entry.area_id
-        if not entity_area and entry.device_id:
-            device = device_reg.async_get(entry.device_id)
-            if device:
-                entity_area = device.area_id
-        if entity_area:
-            entity_counts[entity_area] = entity_counts.get(entity_area, 0) + 1
-
     _LOGGER.info(
         "get_permitted_areas called by user: %s (id=%s, is_admin=%s)",
         user.name, user.id, user.is_admin
@@ -209,46 +371,98 @@ async def websocket_get_permitted_areas(
 
     # Admin users see all areas
     if user.is_admin:
-        areas = []
-        for area in area_reg.async_list_areas():
-            areas.append({
-                "id": area.id,
-                "name": area.name,
-                "icon": area.icon,
-                "entity_count": entity_counts.get(area.id, 0),
-                "permission_level": 1,  # Full access for admin
-            })
-
+        areas = await _async_get_area_list(hass, None)
         _LOGGER.info("Admin user %s gets all %d areas", user.name, len(areas))
         connection.send_result(msg["id"], {"areas": areas})
         return
 
     # Non-admin: check permissions from Store
-    permitted = get_user_permitted_areas(hass, user.id)
+    areas = await _async_get_area_list(hass, user.id)
     _LOGGER.info(
         "Non-admin user %s (id=%s) has %d permitted areas",
-        user.name, user.id, len(permitted)
+        user.name, user.id, len(areas)
+    )
+    connection.send_result(msg["id"], {"areas": areas})
+
+
+async def _async_get_area_entity_counts(hass: HomeAssistant) -> dict[str, int]:
+    """Get entity counts per area, shared while the index is unchanged."""
+    index: ScopeIndex = hass.data[DOMAIN]["index"]
+
+    @callback
+    def _count() -> dict[str, int]:
+        # Entity counts per area come from the scope index (device areas
+        # are already resolved there), so no registry scan is needed
+        with span(hass, "entity_counts"):
+            return {
+                area_id: len(entity_ids)
+                for area_id, entity_ids in index.area_entities.items()
+            }
+
+    return await hass.data[DOMAIN]["single_flight"].async_get(
+        ("area_counts",), index.revision, _count
     )
 
-    # Enrich with area details and entity count
-    areas = []
-    for perm in permitted:
-        area = area_reg.async_get_area(perm["id"])
-        if area:
-            areas.append({
-                "id": area.id,
-                "name": area.name,
-                "icon": area.icon,
-                "entity_count": entity_counts.get(area.id, 0),
-                "permission_level": perm["permission_level"],
-            })
 
-    connection.send_result(msg["id"], {"areas": areas})
+async def _async_get_area_list(
+    hass: HomeAssistant, user_id: str | None
+) -> list[dict[str, Any]]:
+    """Get the area list for a user (None for admins), with entity counts.
+
+    Concurrent identical requests share one computation, and the result is
+    reused until the registries or permissions change.
+    """
+    index: ScopeIndex = hass.data[DOMAIN]["index"]
+
+    async def _build() -> list[dict[str, Any]]:
+        area_reg = ar.async_get(hass)
+        entity_counts = await _async_get_area_entity_counts(hass)
+
+        if user_id is None:
+            return [
+                {
+                    "id": area.id,
+                    "name": area.name,
+                    "icon": area.icon,
+                    "entity_count": entity_counts.get(area.id, 0),
+                    "permission_level": 1,  # Full access for admin
+                }
+                for area in area_reg.async_list_areas()
+            ]
+
+        with span(hass, "permission_filter"):
+            permitted = get_user_permitted_areas(hass, user_id)
+
+        # Enrich with area details and entity count
+        areas = []
+        for perm in permitted:
+            area = area_reg.async_get_area(perm["id"])
+            if area:
+                areas.append({
+                    "id": area.id,
+                    "name": area.name,
+                    "icon": area.icon,
+                    "entity_count": entity_counts.get(area.id, 0),
+                    "permission_level": perm["permission_level"],
+                })
+        return areas
+
+    if user_id is None:
+        return await hass.data[DOMAIN]["single_flight"].async_get(
+            ("admin_areas",), index.revision, _build
+        )
+    return await hass.data[DOMAIN]["single_flight"].async_get(
+        ("permitted_areas", user_id),
+        (index.revision, async_get_permissions_revision(hass)),
+        _build,
+    )
 
 
 @websocket_api.websocket_command({
     vol.Required("type"): "area_control/get_area_entities",
     vol.Required("area_id"): vol.All(str, vol.Length(min=1, max=255)),
+    vol.Optional("limit"): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000)),
+    vol.Optional("cursor"): vol.All(str, vol.Length(min=1, max=255)),
 })
 @websocket_api.async_response
 async def websocket_get_area_entities(
@@ -260,6 +474,9 @@ async def websocket_get_area_entities(
 
     Returns entities grouped by domain for a specific area.
     Validates user has permission for the area.
+
+    With an optional limit, returns one page ordered by domain and entity ID
+    plus a next_cursor to request the following page.
     """
     user = connection.user
     area_id = msg["area_id"]
@@ -273,13 +490,14 @@ async def websocket_get_area_entities(
         connection.send_error(msg["id"], "invalid_area_id", "Invalid area_id format")
         return
 
-    # Verify permission (admin or has area permission)
-    if not user.is_admin:
-        permitted = get_user_permitted_areas(hass, user.id)
-        area_ids = [p["id"] for p in permitted]
-        if area_id not in area_ids:
-            connection.send_error(msg["id"], "forbidden", "No permission for this area")
-            return
+    # Verify permission (admin or has area/floor permission)
+    if not user.is_admin and not _is_area_permitted(hass, user.id, area_id):
+        connection.send_error(msg["id"], "forbidden", "No permission for this area")
+        return
+
+    if "limit" in msg:
+        connection.send_result(msg["id"], _get_entities_page(hass, "area", area_id, msg))
+        return
 
     entities_by_domain = await get_entities_for_area(hass, area_id)
 
@@ -346,6 +564,9 @@ async def get_entities_for_label(
 ) -> dict[str, list[str]]:
     """Get entities grouped by domain for a label.
 
+    Entities on labelled devices and in labelled areas carry the label too
+    (resolved by the scope index).
+
     Args:
         hass: Home Assistant instance.
         label_id: The label ID to get entities for.
@@ -353,19 +574,8 @@ async def get_entities_for_label(
     Returns:
         Dictionary mapping domain -> list of entity_ids.
     """
-    entity_reg = er.async_get(hass)
-
-    entities_by_domain: dict[str, list[str]] = {}
-
-    for entry in entity_reg.entities.values():
-        # Check if entity has this label
-        if label_id in (entry.labels or set()) and not entry.disabled:
-            domain = entry.entity_id.split(".")[0]
-            if domain not in entities_by_domain:
-                entities_by_domain[domain] = []
-            entities_by_domain[domain].append(entry.entity_id)
-
-    return entities_by_domain
+    index: ScopeIndex = hass.data[DOMAIN]["index"]
+    return _group_by_domain(index.sorted_members("label", label_id))
 
 
 @websocket_api.websocket_command({
@@ -388,56 +598,91 @@ async def websocket_get_permitted_labels(
         connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
         return
 
-    label_reg = lr.async_get(hass)
-    entity_reg = er.async_get(hass)
+    # Admin users see all labels; non-admins get their permitted labels
+    labels = await _async_get_label_list(hass, None if user.is_admin else user.id)
+    connection.send_result(msg["id"], {"labels": labels})
 
-    # Pre-compute entity counts for all labels (O(n) instead of O(n*m))
-    entity_counts: dict[str, int] = {}
-    for entry in entity_reg.entities.values():
-        if entry.disabled:
-            continue
-        for label_id in (entry.labels or set()):
-            entity_counts[label_id] = entity_counts.get(label_id, 0) + 1
 
-    # Admin users see all labels
-    if user.is_admin:
-        labels = []
-        for label in label_reg.async_list_labels():
-            labels.append({
-                "id": label.label_id,
-                "name": label.name,
-                "icon": label.icon,
-                "color": label.color,
-                "entity_count": entity_counts.get(label.label_id, 0),
-                "permission_level": 1,  # Full access for admin
-            })
+async def _async_get_label_entity_counts(hass: HomeAssistant) -> dict[str, int]:
+    """Get entity counts per label, shared while the index is unchanged."""
+    index: ScopeIndex = hass.data[DOMAIN]["index"]
 
-        connection.send_result(msg["id"], {"labels": labels})
-        return
+    @callback
+    def _count() -> dict[str, int]:
+        # Label membership in the scope index already includes entities on
+        # labelled devices and in labelled areas, so no registry scan is needed
+        with span(hass, "entity_counts"):
+            return {
+                label_id: len(entity_ids)
+                for label_id, entity_ids in index.label_entities.items()
+            }
 
-    # Non-admin: check permissions from Store
-    permitted = get_user_permitted_labels(hass, user.id)
-
-    # Enrich with label details and entity count
-    labels = []
-    for perm in permitted:
-        label = label_reg.async_get_label(perm["id"])
-        if label:
-            labels.append({
-                "id": label.label_id,
-                "name": label.name,
-                "icon": label.icon,
-                "color": label.color,
-                "entity_count": entity_counts.get(label.label_id, 0),
-                "permission_level": perm["permission_level"],
-            })
+    return await hass.data[DOMAIN]["single_flight"].async_get(
+        ("label_counts",), index.revision, _count
+    )
 
-    connection.send_result(msg["id"], {"labels": labels})
+
+async def _async_get_label_list(
+    hass: HomeAssistant, user_id: str | None
+) -> list[dict[str, Any]]:
+    """Get the label list for a user (None for admins), with entity counts.
+
+    Concurrent identical requests share one computation, and the result is
+    reused until the registries or permissions change.
+    """
+    index: ScopeIndex = hass.data[DOMAIN]["index"]
+
+    async def _build() -> list[dict[str, Any]]:
+        label_reg = lr.async_get(hass)
+        entity_counts = await _async_get_label_entity_counts(hass)
+
+        if user_id is None:
+            return [
+                {
+                    "id": label.label_id,
+                    "name": label.name,
+                    "icon": label.icon,
+                    "color": label.color,
+                    "entity_count": entity_counts.get(label.label_id, 0),
+                    "permission_level": 1,  # Full access for admin
+                }
+                for label in label_reg.async_list_labels()
+            ]
+
+        with span(hass, "permission_filter"):
+            permitted = get_user_permitted_labels(hass, user_id)
+
+        # Enrich with label details and entity count
+        labels = []
+        for perm in permitted:
+            label = label_reg.async_get_label(perm["id"])
+            if label:
+                labels.append({
+                    "id": label.label_id,
+                    "name": label.name,
+                    "icon": label.icon,
+                    "color": label.color,
+                    "entity_count": entity_counts.get(label.label_id, 0),
+                    "permission_level": perm["permission_level"],
+                })
+        return labels
+
+    if user_id is None:
+        return await hass.data[DOMAIN]["single_flight"].async_get(
+            ("admin_labels",), index.revision, _build
+        )
+    return await hass.data[DOMAIN]["single_flight"].async_get(
+        ("permitted_labels", user_id),
+        (index.revision, async_get_permissions_revision(hass)),
+        _build,
+    )
 
 
 @websocket_api.websocket_command({
     vol.Required("type"): "label_control/get_label_entities",
     vol.Required("label_id"): vol.All(str, vol.Length(min=1, max=255)),
+    vol.Optional("limit"): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000)),
+    vol.Optional("cursor"): vol.All(str, vol.Length(min=1, max=255)),
 })
 @websocket_api.async_response
 async def websocket_get_label_entities(
@@ -449,6 +694,9 @@ async def websocket_get_label_entities(
 
     Returns entities grouped by domain for a specific label.
     Validates user has permission for the label.
+
+    With an optional limit, returns one page ordered by domain and entity ID
+    plus a next_cursor to request the following page.
     """
     user = connection.user
     label_id = msg["label_id"]
@@ -463,12 +711,15 @@ async def websocket_get_label_entities(
         return
 
     # Verify permission (admin or has label permission)
-    if not user.is_admin:
-        permitted = get_user_permitted_labels(hass, user.id)
-        label_ids = [p["id"] for p in permitted]
-        if label_id not in label_ids:
-            connection.send_error(msg["id"], "forbidden", "No permission for this label")
-            return
+    if not user.is_admin and label_id not in _get_permitted_ids(
+        hass, user.id, PREFIX_LABEL
+    ):
+        connection.send_error(msg["id"], "forbidden", "No permission for this label")
+        return
+
+    if "limit" in msg:
+        connection.send_result(msg["id"], _get_entities_page(hass, "label", label_id, msg))
+        return
 
     entities_by_domain = await get_entities_for_label(hass, label_id)
 
@@ -476,153 +727,1867 @@ async def websocket_get_label_entities(
 
 
 # =============================================================================
-# Permission Manager WebSocket Handlers
+# Device Control WebSocket Handlers
 # =============================================================================
 
 
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "permission_manager/get_panel_permissions",
-    }
-)
 @callback
-def ws_get_panel_permissions(
-    hass: HomeAssistant,
-    connection: ActiveConnection,
-    msg: dict[str, Any],
-) -> None:
-    """Return panel permissions for the current user.
-
-    Uses Store-based permission data instead of entity state queries.
+def _get_permitted_device_entities(
+    hass: HomeAssistant, user_id: str, device_id: str
+) -> list[str] | None:
+    """Get the entities of a device the user can view.
 
-    Returns dict of panel_id -> permission_level (0 or 1)
-    Level 0 = Closed (hidden, no access)
-    Level 1 = View (full access - can view and control)
-    """
-    user_id = connection.user.id
-    is_admin = connection.user.is_admin
+    A device grant permits all of the device's entities. Without one, the
+    device is reachable through its area (directly or through its floor),
+    and only entities whose own area is permitted are included: an entity
+    assigned to another area is not exposed through its device. This is the
+    rule _resolve_access applies.
 
-    permissions: dict[str, int] = {}
+    Args:
+        hass: Home Assistant instance.
+        user_id: The user ID to check permissions for.
+        device_id: The device ID to check.
 
-    # Get all permissions for this user from Store
+    Returns:
+        Sorted entity IDs, or None if the device is not permitted.
+    """
+    index: ScopeIndex = hass.data[DOMAIN]["index"]
+    members = index.sorted_members("device", device_id)
     user_perms = _get_user_permissions(hass, user_id)
+    if user_perms.get(f"{PREFIX_DEVICE}{device_id}", PERM_CLOSED) >= PERM_VIEW:
+        return members
+    area_id = index.device_area.get(device_id)
+    if area_id is None or not _is_area_permitted(hass, user_id, area_id):
+        return None
+    return [
+        entity_id for entity_id in members
+        if (entity := index.entities.get(entity_id)) is not None
+        and entity.area_id is not None
+        and _is_area_permitted(hass, user_id, entity.area_id)
+    ]
 
-    matched_panel = 0
-
-    for resource_id, perm_level in user_perms.items():
-        # Only process panel resources
-        if not resource_id.startswith(PREFIX_PANEL):
-            continue
 
-        matched_panel += 1
+@websocket_api.websocket_command({
+    vol.Required("type"): "device_control/get_permitted_devices",
+})
+@callback
+def websocket_get_permitted_devices(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict,
+) -> None:
+    """Handle get permitted devices command.
 
-        # Extract panel_id from resource_id (strip prefix)
-        panel_id = resource_id[len(PREFIX_PANEL):]
+    Returns devices granted individually (device_ resources) with entity
+    counts. Devices reachable through an area grant are listed by the area
+    commands instead. Admin users get no individual grants and see devices
+    through their areas.
+    """
+    user = connection.user
 
-        # Admin users always get level 1 (full access) for permission_manager panel
-        if is_admin and panel_id == "ha_permission_manager":
-            perm_level = 1
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
 
-        permissions[panel_id] = perm_level
+    index: ScopeIndex = hass.data[DOMAIN]["index"]
+    device_reg = dr.async_get(hass)
 
-    _LOGGER.debug(
-        "Panel permissions for user %s (is_admin=%s): matched_panel=%d, permissions=%s",
-        user_id,
-        is_admin,
-        matched_panel,
-        permissions,
-    )
+    devices = []
+    if not user.is_admin:
+        for device_id in sorted(_get_permitted_ids(hass, user.id, PREFIX_DEVICE)):
+            device = device_reg.async_get(device_id)
+            if device is None:
+                continue
+            devices.append({
+                "id": device.id,
+                "name": device.name_by_user or device.name or device.id,
+                "area_id": device.area_id,
+                "entity_count": len(index.device_entities.get(device.id, ())),
+                "permission_level": PERM_VIEW,
+            })
 
-    # Return is_admin flag so frontend knows to skip filtering
-    # Note: user_id intentionally not included for security
-    connection.send_result(msg["id"], {
-        "permissions": permissions,
-        "is_admin": is_admin,
-    })
+    connection.send_result(msg["id"], {"devices": devices})
 
 
-@websocket_api.websocket_command(
-    {
-        vol.Required("type"): "permission_manager/get_all_permissions",
-    }
-)
+@websocket_api.websocket_command({
+    vol.Required("type"): "device_control/get_device_entities",
+    vol.Required("device_id"): vol.All(str, vol.Length(min=1, max=255)),
+    vol.Optional("limit"): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000)),
+    vol.Optional("cursor"): vol.All(str, vol.Length(min=1, max=255)),
+})
 @callback
-def ws_get_all_permissions(
+def websocket_get_device_entities(
     hass: HomeAssistant,
-    connection: ActiveConnection,
-    msg: dict[str, Any],
+    connection: websocket_api.ActiveConnection,
+    msg: dict,
 ) -> None:
-    """Return all permissions for the current user.
-
-    Uses Store-based permission data instead of entity state queries.
+    """Handle get device entities command.
 
-    Returns dict with:
-    - panels: dict of panel_id -> permission_level
-    - areas: dict of area_id -> permission_level
-    - labels: dict of label_id -> permission_level
-    - is_admin: bool
+    Returns entities grouped by domain for a specific device.
+    Validates user has permission for the device (or its area); through
+    the area, only entities in permitted areas are returned.
     """
-    user_id = connection.user.id
-    is_admin = connection.user.is_admin
+    user = connection.user
+    device_id = msg["device_id"]
+
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
+
+    # Validate device_id format
+    if not VALID_ID_PATTERN.match(device_id):
+        connection.send_error(msg["id"], "invalid_device_id", "Invalid device_id format")
+        return
+
+    if user.is_admin:
+        index: ScopeIndex = hass.data[DOMAIN]["index"]
+        members = index.sorted_members("device", device_id)
+    else:
+        members = _get_permitted_device_entities(hass, user.id, device_id)
+        if members is None:
+            connection.send_error(msg["id"], "forbidden", "No permission for this device")
+            return
+
+    if "limit" in msg:
+        connection.send_result(
+            msg["id"], _get_entities_page(hass, "device", device_id, msg, members)
+        )
+        return
+
+    connection.send_result(msg["id"], {"entities": _group_by_domain(members)})
+
+
+# =============================================================================
+# Control Panel WebSocket Handlers
+# =============================================================================
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "control_panel/search",
+    vol.Required("query"): vol.All(str, vol.Length(min=1, max=100)),
+    vol.Optional("limit", default=25): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+    vol.Optional("offset", default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+})
+@callback
+def websocket_search_entities(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict,
+) -> None:
+    """Handle control panel entity search command.
+
+    Matches entity IDs, friendly names, area names and label names using the
+    in-memory scope index. Non-admin users only get entities inside areas,
+    labels or devices they have permission for. Results are ranked and paginated.
+    """
+    user = connection.user
+
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
+
+    index = hass.data.get(DOMAIN, {}).get("index")
+    if index is None:
+        connection.send_error(msg["id"], "not_ready", "Search index not ready")
+        return
+
+    if user.is_admin:
+        results = index.search(msg["query"])
+    else:
+        results = index.search(
+            msg["query"],
+            area_ids=_get_permitted_area_ids(hass, user.id),
+            label_ids=_get_permitted_ids(hass, user.id, PREFIX_LABEL),
+            device_ids=_get_permitted_ids(hass, user.id, PREFIX_DEVICE),
+        )
+
+    offset = msg["offset"]
+    limit = msg["limit"]
+    page = results[offset:offset + limit]
+    next_offset = offset + limit if offset + limit < len(results) else None
+
+    connection.send_result(msg["id"], {
+        "results": [
+            {
+                "entity_id": entity.entity_id,
+                "name": entity.name,
+                "domain": entity.domain,
+                "area_id": entity.area_id,
+                "labels": sorted(entity.labels),
+                "score": score,
+            }
+            for score, entity in page
+        ],
+        "total": len(results),
+        "next_offset": next_offset,
+    })
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "control_panel/get_entities",
+    vol.Optional("area_ids", default=[]): vol.All(
+        [vol.All(str, vol.Match(VALID_ID_PATTERN))], vol.Length(max=100)
+    ),
+    vol.Optional("label_ids", default=[]): vol.All(
+        [vol.All(str, vol.Match(VALID_ID_PATTERN))], vol.Length(max=100)
+    ),
+    vol.Optional("domains", default=[]): vol.All(
+        [vol.All(str, vol.Length(min=1, max=64))], vol.Length(max=50)
+    ),
+})
+@callback
+def websocket_get_entities(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict,
+) -> None:
+    """Handle combined area/label/domain entity query command.
+
+    Returns entities grouped by domain that are in one of the given areas
+    and carry one of the given labels, optionally limited to domains (e.g.
+    lights labelled "night" in the bedroom). At least one area or label is
+    required, and the user needs permission for every one given.
+    """
+    user = connection.user
+    area_ids = set(msg["area_ids"])
+    label_ids = set(msg["label_ids"])
+
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
+
+    if not area_ids and not label_ids:
+        connection.send_error(
+            msg["id"], "invalid_format", "At least one area_id or label_id is required"
+        )
+        return
+
+    if not user.is_admin:
+        denied_areas = {
+            area_id for area_id in area_ids
+            if not _is_area_permitted(hass, user.id, area_id)
+        }
+        denied_labels = label_ids - _get_permitted_ids(hass, user.id, PREFIX_LABEL)
+        if denied_areas or denied_labels:
+            connection.send_error(
+                msg["id"],
+                "forbidden",
+                "No permission for "
+                + ", ".join(sorted(denied_areas) + sorted(denied_labels)),
+            )
+            return
+
+    index: ScopeIndex = hass.data[DOMAIN]["index"]
+    with span(hass, "index_select", areas=len(area_ids), labels=len(label_ids)):
+        entity_ids = index.select(area_ids, label_ids, msg["domains"])
+
+    connection.send_result(msg["id"], {
+        "entities": _group_by_domain(entity_ids),
+        "total": len(entity_ids),
+    })
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "control_panel/area_action",
+    vol.Required("area_id"): vol.All(str, vol.Length(min=1, max=255)),
+    vol.Required("domain"): vol.In(SCOPE_ACTION_SERVICES),
+    vol.Required("service"): vol.All(str, vol.Length(min=1, max=64)),
+})
+@websocket_api.async_response
+async def websocket_area_action(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict,
+) -> None:
+    """Handle area action command.
+
+    Calls a domain service (e.g. light.turn_off) on every entity of that
+    domain in an area, as one grouped service call.
+    """
+    user = connection.user
+    area_id = msg["area_id"]
+
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
+
+    if not VALID_ID_PATTERN.match(area_id):
+        connection.send_error(msg["id"], "invalid_area_id", "Invalid area_id format")
+        return
+
+    if not user.is_admin and not _is_area_permitted(hass, user.id, area_id):
+        connection.send_error(msg["id"], "forbidden", "No permission for this area")
+        return
+
+    await _async_scope_action(hass, connection, msg, "area", area_id)
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "control_panel/label_action",
+    vol.Required("label_id"): vol.All(str, vol.Length(min=1, max=255)),
+    vol.Required("domain"): vol.In(SCOPE_ACTION_SERVICES),
+    vol.Required("service"): vol.All(str, vol.Length(min=1, max=64)),
+})
+@websocket_api.async_response
+async def websocket_label_action(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict,
+) -> None:
+    """Handle label action command.
+
+    Calls a domain service (e.g. cover.close_cover) on every entity of that
+    domain carrying a label, as one grouped service call.
+    """
+    user = connection.user
+    label_id = msg["label_id"]
+
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
+
+    if not VALID_ID_PATTERN.match(label_id):
+        connection.send_error(msg["id"], "invalid_label_id", "Invalid label_id format")
+        return
+
+    if not user.is_admin and label_id not in _get_permitted_ids(
+        hass, user.id, PREFIX_LABEL
+    ):
+        connection.send_error(msg["id"], "forbidden", "No permission for this label")
+        return
+
+    await _async_scope_action(hass, connection, msg, "label", label_id)
+
+
+# Supported feature (flag of the domain's EntityFeature enum) each scope
+# action service requires. Entities without it are left out of the grouped
+# call, since one unsupported entity makes the whole call fail.
+_SCOPE_ACTION_FEATURES = {
+    ("media_player", "turn_on"): "TURN_ON",
+    ("media_player", "turn_off"): "TURN_OFF",
+    ("media_player", "media_pause"): "PAUSE",
+    ("media_player", "media_stop"): "STOP",
+    ("climate", "turn_on"): "TURN_ON",
+    ("climate", "turn_off"): "TURN_OFF",
+    ("cover", "open_cover"): "OPEN",
+    ("cover", "close_cover"): "CLOSE",
+    ("cover", "stop_cover"): "STOP",
+    ("vacuum", "start"): "START",
+    ("vacuum", "pause"): "PAUSE",
+    ("vacuum", "return_to_base"): "RETURN_HOME",
+}
+
+
+def _required_feature(domain: str, service: str) -> int | None:
+    """Return the supported feature a scope action service requires, if any.
+
+    The feature enums are imported on use rather than with this module:
+    a domain's integration is already loaded once it has entities to act on.
+    """
+    if (flag := _SCOPE_ACTION_FEATURES.get((domain, service))) is None:
+        return None
+    if domain == "climate":
+        from homeassistant.components.climate import ClimateEntityFeature as features
+    elif domain == "cover":
+        from homeassistant.components.cover import CoverEntityFeature as features
+    elif domain == "media_player":
+        from homeassistant.components.media_player import (
+            MediaPlayerEntityFeature as features,
+        )
+    else:
+        from homeassistant.components.vacuum import VacuumEntityFeature as features
+    return features[flag]
+
+
+async def _async_scope_action(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict,
+    kind: str,
+    scope_id: str,
+) -> None:
+    """Call a service on one domain's entities in a permitted scope.
+
+    The caller has already checked permission for the scope. Entities are
+    resolved from the scope index; entities without a state (not loaded)
+    are skipped, and entities lacking the supported feature the service
+    needs (_SCOPE_ACTION_FEATURES) are reported as unsupported instead of
+    failing the whole call. Service errors are reported by the
+    websocket_api error handling (e.g. unauthorized for entity-level
+    restrictions).
+
+    Args:
+        hass: Home Assistant instance.
+        connection: The WebSocket connection.
+        msg: The WebSocket message (with domain and service).
+        kind: "area" or "label".
+        scope_id: The area or label ID.
+    """
+    domain = msg["domain"]
+    service = msg["service"]
+
+    if service not in SCOPE_ACTION_SERVICES[domain]:
+        connection.send_error(
+            msg["id"], "invalid_action", f"Service {domain}.{service} is not allowed"
+        )
+        return
+
+    index: ScopeIndex = hass.data[DOMAIN]["index"]
+    feature = _required_feature(domain, service)
+    with span(hass, "resolve_scope", kind=kind, domain=domain):
+        entity_ids = []
+        skipped = []
+        unsupported = []
+        for entity_id in index.domain_members(kind, scope_id, domain):
+            if (state := hass.states.get(entity_id)) is None:
+                skipped.append(entity_id)
+            elif feature is not None and not (
+                state.attributes.get(ATTR_SUPPORTED_FEATURES, 0) & feature
+            ):
+                unsupported.append(entity_id)
+            else:
+                entity_ids.append(entity_id)
+
+    if entity_ids:
+        with span(hass, "service_call", service=f"{domain}.{service}"):
+            await hass.services.async_call(
+                domain,
+                service,
+                {"entity_id": entity_ids},
+                blocking=True,
+                context=connection.context(msg),
+            )
+
+    connection.send_result(msg["id"], {
+        "domain": domain,
+        "service": service,
+        "entity_ids": entity_ids,
+        "count": len(entity_ids),
+        "skipped": skipped,
+        "unsupported": unsupported,
+    })
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "control_panel/subscribe_summaries",
+})
+@callback
+def websocket_subscribe_summaries(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict,
+) -> None:
+    """Handle subscribe to live area/label summaries command.
+
+    Sends an event with the summaries of every permitted area and label,
+    then events with the summaries that changed (see summary.py). Admin
+    users get every area and label. When the user's permissions change
+    or an area moves to another floor, the full set is sent again. Events
+    with the full set carry "full": true and replace what the client has.
+    """
+    user = connection.user
+
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
+
+    summaries: ScopeSummaries = hass.data[DOMAIN]["summaries"]
+    index: ScopeIndex = hass.data[DOMAIN]["index"]
+
+    @callback
+    def _send(scopes: set[tuple[str, str]] | None) -> None:
+        """Send the given scopes (None for all) the user may see."""
+        if user.is_admin:
+            visible = None
+        else:
+            visible = {
+                "area": _get_permitted_area_ids(hass, user.id),
+                "label": _get_permitted_ids(hass, user.id, PREFIX_LABEL),
+            }
+        full = scopes is None
+        if scopes is None:
+            if visible is None:
+                scopes = set(summaries.summaries)
+            else:
+                scopes = {
+                    (kind, scope_id)
+                    for kind, scope_ids in visible.items()
+                    for scope_id in scope_ids
+                }
+        payload: dict[str, Any] = {"areas": {}, "labels": {}}
+        for kind, scope_id in scopes:
+            if visible is None or scope_id in visible[kind]:
+                payload[f"{kind}s"][scope_id] = summaries.get(kind, scope_id)
+        if full:
+            payload["full"] = True
+        if full or payload["areas"] or payload["labels"]:
+            connection.send_message(websocket_api.event_message(msg["id"], payload))
+
+    @callback
+    def _async_permissions_changed(event: Event) -> None:
+        """Resend everything when the user's permissions change."""
+        if user.id in event.data.get("user_ids", ()):
+            _send(None)
+
+    @callback
+    def _async_floors_remapped() -> None:
+        """Resend everything when floor grants may cover other areas."""
+        if not user.is_admin:
+            _send(None)
+
+    unsub_summaries = summaries.async_subscribe(_send)
+    unsub_permissions = hass.bus.async_listen(
+        EVENT_PERMISSIONS_CHANGED, _async_permissions_changed
+    )
+    unsub_remap = index.async_add_remap_listener(_async_floors_remapped)
+
+    @callback
+    def _unsubscribe() -> None:
+        unsub_summaries()
+        unsub_permissions()
+        unsub_remap()
+
+    connection.subscriptions[msg["id"]] = _unsubscribe
+    connection.send_result(msg["id"])
+    _send(None)
+
+
+# =============================================================================
+# Permission Manager WebSocket Handlers
+# =============================================================================
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "permission_manager/get_panel_permissions",
+    }
+)
+@callback
+def ws_get_panel_permissions(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return panel permissions for the current user.
+
+    Uses Store-based permission data instead of entity state queries.
+
+    Returns dict of panel_id -> permission_level (0 or 1)
+    Level 0 = Closed (hidden, no access)
+    Level 1 = View (full access - can view and control)
+    """
+    user_id = connection.user.id
+    is_admin = connection.user.is_admin
+
+    permissions: dict[str, int] = {}
+
+    # Get all permissions for this user from Store
+    user_perms = _get_user_permissions(hass, user_id)
+
+    matched_panel = 0
+
+    for resource_id, perm_level in user_perms.items():
+        # Only process panel resources
+        if not resource_id.startswith(PREFIX_PANEL):
+            continue
+
+        matched_panel += 1
+
+        # Extract panel_id from resource_id (strip prefix)
+        panel_id = resource_id[len(PREFIX_PANEL):]
+
+        # Admin users always get level 1 (full access) for permission_manager panel
+        if is_admin and panel_id == "ha_permission_manager":
+            perm_level = 1
+
+        permissions[panel_id] = perm_level
+
+    _LOGGER.debug(
+        "Panel permissions for user %s (is_admin=%s): matched_panel=%d, permissions=%s",
+        user_id,
+        is_admin,
+        matched_panel,
+        permissions,
+    )
+
+    # Return is_admin flag so frontend knows to skip filtering
+    # Note: user_id intentionally not included for security
+    connection.send_result(msg["id"], {
+        "permissions": permissions,
+        "is_admin": is_admin,
+    })
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "permission_manager/get_all_permissions",
+    }
+)
+@callback
+def ws_get_all_permissions(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return all permissions for the current user.
+
+    Uses Store-based permission data instead of entity state queries.
+
+    Returns dict with:
+    - panels: dict of panel_id -> permission_level
+    - areas: dict of area_id -> permission_level
+    - labels: dict of label_id -> permission_level
+    - floors: dict of floor_id -> permission_level
+    - devices: dict of device_id -> permission_level
+    - is_admin: bool
+    """
+    user_id = connection.user.id
+    is_admin = connection.user.is_admin
+
+    panels: dict[str, int] = {}
+    areas: dict[str, int] = {}
+    labels: dict[str, int] = {}
+    floors: dict[str, int] = {}
+    devices: dict[str, int] = {}
+
+    # Get all permissions for this user from Store
+    user_perms = _get_user_permissions(hass, user_id)
+
+    for resource_id, perm_level in user_perms.items():
+        if resource_id.startswith(PREFIX_PANEL):
+            panel_id = resource_id[len(PREFIX_PANEL):]
+            panels[panel_id] = perm_level
+
+        elif resource_id.startswith(PREFIX_AREA):
+            area_id = resource_id[len(PREFIX_AREA):]
+            areas[area_id] = perm_level
+
+        elif resource_id.startswith(PREFIX_LABEL):
+            label_id = resource_id[len(PREFIX_LABEL):]
+            labels[label_id] = perm_level
+
+        elif resource_id.startswith(PREFIX_FLOOR):
+            floor_id = resource_id[len(PREFIX_FLOOR):]
+            floors[floor_id] = perm_level
+
+        elif resource_id.startswith(PREFIX_DEVICE):
+            device_id = resource_id[len(PREFIX_DEVICE):]
+            devices[device_id] = perm_level
+
+    _LOGGER.info(
+        "All permissions for user %s (is_admin=%s): panels=%d, areas=%d, labels=%d, "
+        "floors=%d, devices=%d",
+        user_id, is_admin, len(panels), len(areas), len(labels), len(floors), len(devices),
+    )
+
+    # Note: user_id intentionally not included for security
+    connection.send_result(msg["id"], {
+        "panels": panels,
+        "areas": areas,
+        "labels": labels,
+        "floors": floors,
+        "devices": devices,
+        "is_admin": is_admin,
+    })
+
+
+# =============================================================================
+# Admin Panel WebSocket Handlers
+# =============================================================================
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "permission_manager/get_admin_data",
+    }
+)
+@websocket_api.async_response
+async def ws_get_admin_data(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return all data needed for the admin permission manager panel.
+
+    This endpoint is only available to admin users and returns:
+    - users: list of all non-owner, non-system users with id, name, is_admin
+    - resources: dict of resource_type -> list of resources
+      (panels, areas, labels, floors, devices)
+    - permissions: dict of user_id -> {resource_id: permission_level}
+    - roles: dict of role_id -> {name, permissions, members}
+    - schedules: dict of schedule_id -> time-windowed grant
+
+    The frontend uses this data to display the permission matrix. The
+    result is encoded once and the same bytes are sent until the data
+    changes.
+    """
+    user = connection.user
+
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
+
+    if not user.is_admin:
+        connection.send_error(msg["id"], "forbidden", "Admin access required")
+        return
+
+    payload = await _async_get_admin_payload(hass)
+    connection.send_message(
+        websocket_api.messages.construct_result_message(msg["id"], payload)
+    )
+
+
+async def _async_get_admin_payload(hass: HomeAssistant) -> bytes:
+    """Get the encoded admin data, rebuilt only when something changed.
+
+    The revision covers registry changes (scope index), permission, role
+    and schedule changes (Store saves and compiled permissions) and user
+    and panel changes, so the same bytes are sent until one of them
+    changes. Concurrent requests share one build.
+    """
+    domain_data = hass.data[DOMAIN]
+    index: ScopeIndex = domain_data["index"]
+    revision = (
+        index.revision,
+        domain_data.get("store_revision", 0),
+        async_get_permissions_revision(hass),
+        domain_data.get("admin_revision", 0),
+    )
+    return await domain_data["single_flight"].async_get(
+        ("admin_data",), revision, lambda: _async_build_admin_payload(hass)
+    )
+
+
+async def _async_build_admin_payload(hass: HomeAssistant) -> bytes:
+    """Snapshot the admin data on the loop and encode it once.
+
+    Large payloads (judged by the previous build) are encoded in the
+    executor; the snapshot is a copy, so the loop can keep changing the
+    live data meanwhile.
+    """
+    domain_data = hass.data[DOMAIN]
+    with span(hass, "snapshot"):
+        data = await _async_snapshot_admin_data(hass)
+
+    estimate = domain_data.get("admin_payload_bytes")
+    if estimate is None:
+        # First build: estimate from the number of permission cells
+        estimate = 32 * sum(len(perms) for perms in data["permissions"].values())
+
+    with span(hass, "encode", executor=estimate >= ADMIN_DATA_EXECUTOR_BYTES):
+        if estimate >= ADMIN_DATA_EXECUTOR_BYTES:
+            payload = await hass.async_add_executor_job(json_bytes, data)
+        else:
+            payload = json_bytes(data)
+
+    domain_data["admin_payload_bytes"] = len(payload)
+    return payload
+
+
+async def _async_snapshot_admin_data(hass: HomeAssistant) -> dict[str, Any]:
+    """Build an immutable copy of the admin panel data."""
+    with span(hass, "users"):
+        # Get all users (excluding owner and system accounts)
+        users_data = []
+        for ha_user in await hass.auth.async_get_users():
+            # Skip owner and system accounts
+            if ha_user.is_owner or ha_user.system_generated:
+                continue
+            users_data.append({
+                "id": ha_user.id,
+                "name": ha_user.name or "Unknown",
+                "is_admin": ha_user.is_admin,
+            })
+
+        # Sort users by name
+        users_data.sort(key=lambda u: u["name"].lower())
+
+    with span(hass, "resources"):
+        # Get all resources
+        resources = {
+            "panels": [],
+            "areas": [],
+            "labels": [],
+            "floors": [],
+            "devices": [],
+        }
+
+        # Get panels from frontend_panels (excluding internal panels)
+        frontend_panels = hass.data.get("frontend_panels", {})
+        excluded_panels = {
+            "developer-tools", "config", "profile",
+        }
+        for panel_id, panel in frontend_panels.items():
+            if panel_id in excluded_panels:
+                continue
+            # Get panel title
+            title = panel_id
+            if hasattr(panel, "title") and panel.title:
+                title = panel.title
+            elif hasattr(panel, "config") and isinstance(panel.config, dict):
+                title = panel.config.get("title", panel_id)
+            resources["panels"].append({
+                "id": panel_id,
+                "name": title,
+                "type": "panel",
+            })
+
+        # Get areas
+        area_reg = ar.async_get(hass)
+        for area in area_reg.async_list_areas():
+            resources["areas"].append({
+                "id": area.id,
+                "name": area.name,
+                "type": "area",
+            })
+
+        # Get labels
+        label_reg = lr.async_get(hass)
+        for label in label_reg.async_list_labels():
+            resources["labels"].append({
+                "id": label.label_id,
+                "name": label.name,
+                "type": "label",
+            })
+
+        # Get floors
+        floor_reg = fr.async_get(hass)
+        for floor in floor_reg.async_list_floors():
+            resources["floors"].append({
+                "id": floor.floor_id,
+                "name": floor.name,
+                "type": "floor",
+            })
+
+        # Get devices
+        device_reg = dr.async_get(hass)
+        for device in device_reg.devices.values():
+            if device.disabled:
+                continue
+            resources["devices"].append({
+                "id": device.id,
+                "name": device.name_by_user or device.name or device.id,
+                "type": "device",
+            })
+
+        # Sort resources by name
+        for key in resources:
+            resources[key].sort(key=lambda r: r["name"].lower())
+
+    # Copy the Store data so it can be encoded off the loop
+    domain_data = hass.data.get(DOMAIN, {})
+    all_permissions = {
+        user_id: dict(user_perms)
+        for user_id, user_perms in domain_data.get("permissions", {}).items()
+    }
+
+    _LOGGER.info(
+        "Admin data: %d users, %d panels, %d areas, %d labels, %d floors, %d devices",
+        len(users_data),
+        len(resources["panels"]),
+        len(resources["areas"]),
+        len(resources["labels"]),
+        len(resources["floors"]),
+        len(resources["devices"]),
+    )
+
+    return {
+        "users": users_data,
+        "resources": resources,
+        "permissions": all_permissions,
+        "roles": copy.deepcopy(domain_data.get("roles", {})),
+        "schedules": copy.deepcopy(domain_data.get("schedules", {})),
+    }
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "permission_manager/set_permission",
+        vol.Required("user_id"): vol.All(str, vol.Length(min=1, max=255)),
+        vol.Required("resource_id"): vol.All(str, vol.Length(min=1, max=255)),
+        vol.Required("level"): vol.All(vol.Coerce(int), vol.Range(min=0, max=1)),
+    }
+)
+@websocket_api.async_response
+async def ws_set_permission(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Set permission level for a user and resource.
+
+    This endpoint is only available to admin users.
+
+    Args (in msg):
+        user_id: The user ID to set permission for.
+        resource_id: The resource ID with prefix (e.g., "panel_config", "area_living_room",
+            "floor_ground").
+        level: Permission level (0=Closed, 1=View).
+
+    Returns success status.
+    """
+    user = connection.user
+
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
+
+    if not user.is_admin:
+        connection.send_error(msg["id"], "forbidden", "Admin access required")
+        return
+
+    target_user_id = msg["user_id"]
+    resource_id = msg["resource_id"]
+    level = msg["level"]
+
+    # Validate resource_id format (must have valid prefix)
+    if not resource_id.startswith(RESOURCE_PREFIXES):
+        connection.send_error(
+            msg["id"],
+            "invalid_resource",
+            f"Resource ID must start with one of: {RESOURCE_PREFIXES}"
+        )
+        return
+
+    # Import the async_set_permission function from __init__.py
+    from . import async_set_permission
+
+    try:
+        await async_set_permission(
+            hass, target_user_id, resource_id, level, actor_id=user.id
+        )
+        _LOGGER.info(
+            "Permission set: user=%s, resource=%s, level=%d (by admin %s)",
+            target_user_id, resource_id, level, user.id
+        )
+        connection.send_result(msg["id"], {"success": True})
+    except Exception as err:
+        _LOGGER.exception("Failed to set permission: %s", err)
+        connection.send_error(msg["id"], "set_failed", str(err))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "permission_manager/save_role",
+        vol.Required("role_id"): vol.All(str, vol.Length(min=1, max=255)),
+        vol.Required("name"): vol.All(str, vol.Length(min=1, max=255)),
+        vol.Optional("permissions"): {
+            vol.All(str, vol.Length(min=1, max=255)):
+                vol.All(vol.Coerce(int), vol.Range(min=0, max=1)),
+        },
+        vol.Optional("members"): [vol.All(str, vol.Length(min=1, max=255))],
+    }
+)
+@websocket_api.async_response
+async def ws_save_role(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Create or update a role (named set of resource grants).
+
+    This endpoint is only available to admin users.
+
+    Args (in msg):
+        role_id: The role ID.
+        name: Display name of the role.
+        permissions: Optional dict of resource_id -> level (replaces grants).
+        members: Optional list of member user IDs (replaces members).
+
+    Returns success status.
+    """
+    user = connection.user
+
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
+
+    if not user.is_admin:
+        connection.send_error(msg["id"], "forbidden", "Admin access required")
+        return
+
+    role_id = msg["role_id"]
+    if not VALID_ID_PATTERN.match(role_id):
+        connection.send_error(msg["id"], "invalid_role_id", "Invalid role_id format")
+        return
+
+    for resource_id in msg.get("permissions", {}):
+        if not resource_id.startswith(RESOURCE_PREFIXES):
+            connection.send_error(
+                msg["id"],
+                "invalid_resource",
+                f"Resource ID must start with one of: {RESOURCE_PREFIXES}"
+            )
+            return
+
+    from . import async_save_role
+
+    try:
+        await async_save_role(
+            hass,
+            role_id,
+            msg["name"],
+            permissions=msg.get("permissions"),
+            members=msg.get("members"),
+            actor_id=user.id,
+        )
+        _LOGGER.info("Role saved: role=%s (by admin %s)", role_id, user.id)
+        connection.send_result(msg["id"], {"success": True})
+    except Exception as err:
+        _LOGGER.exception("Failed to save role: %s", err)
+        connection.send_error(msg["id"], "save_failed", str(err))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "permission_manager/delete_role",
+        vol.Required("role_id"): vol.All(str, vol.Length(min=1, max=255)),
+    }
+)
+@websocket_api.async_response
+async def ws_delete_role(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Delete a role.
+
+    This endpoint is only available to admin users.
+    """
+    user = connection.user
+
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
+
+    if not user.is_admin:
+        connection.send_error(msg["id"], "forbidden", "Admin access required")
+        return
+
+    from . import async_delete_role
+
+    await async_delete_role(hass, msg["role_id"], actor_id=user.id)
+    _LOGGER.info("Role deleted: role=%s (by admin %s)", msg["role_id"], user.id)
+    connection.send_result(msg["id"], {"success": True})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "permission_manager/save_schedule",
+        vol.Required("schedule_id"): vol.All(str, vol.Length(min=1, max=255)),
+        vol.Required("user_id"): vol.All(str, vol.Length(min=1, max=255)),
+        vol.Required("resource_id"): vol.All(str, vol.Length(min=1, max=255)),
+        vol.Optional("level", default=PERM_VIEW): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=1)
+        ),
+        vol.Optional("valid_from"): vol.Any(None, cv.datetime),
+        vol.Optional("valid_until"): vol.Any(None, cv.datetime),
+        vol.Optional("recurrence"): vol.Any(None, {
+            vol.Required("weekdays"): vol.All(
+                [vol.All(vol.Coerce(int), vol.Range(min=0, max=6))],
+                vol.Length(min=1, max=7),
+            ),
+            vol.Required("start"): cv.time,
+            vol.Required("end"): cv.time,
+        }),
+    }
+)
+@websocket_api.async_response
+async def ws_save_schedule(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Create or update a time-windowed grant.
+
+    Inside the window the user gets the given level for the resource;
+    outside it the resource is closed. Schedules without a future
+    transition are removed once they have been applied.
+
+    This endpoint is only available to admin users.
+
+    Args (in msg):
+        schedule_id: The schedule ID.
+        user_id: The user the grant applies to.
+        resource_id: The resource ID with prefix.
+        level: Permission level inside the window (default View).
+        valid_from: Optional datetime the grant starts (local time if naive).
+        valid_until: Optional datetime the grant ends (local time if naive).
+        recurrence: Optional weekly window {weekdays: [0=Mon..6=Sun],
+            start: "HH:MM", end: "HH:MM"}; end before start crosses midnight.
+
+    Returns success status.
+    """
+    user = connection.user
+
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
+
+    if not user.is_admin:
+        connection.send_error(msg["id"], "forbidden", "Admin access required")
+        return
+
+    schedule_id = msg["schedule_id"]
+    if not VALID_ID_PATTERN.match(schedule_id):
+        connection.send_error(msg["id"], "invalid_schedule_id", "Invalid schedule_id format")
+        return
+
+    resource_id = msg["resource_id"]
+    if not resource_id.startswith(RESOURCE_PREFIXES):
+        connection.send_error(
+            msg["id"],
+            "invalid_resource",
+            f"Resource ID must start with one of: {RESOURCE_PREFIXES}"
+        )
+        return
+
+    # Naive datetimes are local time
+    valid_from = msg.get("valid_from")
+    if valid_from is not None:
+        valid_from = dt_util.as_local(valid_from)
+    valid_until = msg.get("valid_until")
+    if valid_until is not None:
+        valid_until = dt_util.as_local(valid_until)
+    if valid_from and valid_until and valid_until <= valid_from:
+        connection.send_error(
+            msg["id"], "invalid_window", "valid_until must be after valid_from"
+        )
+        return
+
+    recurrence = msg.get("recurrence")
+    if recurrence is not None:
+        recurrence = {
+            "weekdays": sorted(set(recurrence["weekdays"])),
+            "start": recurrence["start"].isoformat(),
+            "end": recurrence["end"].isoformat(),
+        }
+
+    from . import async_save_schedule
+
+    try:
+        await async_save_schedule(
+            hass,
+            schedule_id,
+            msg["user_id"],
+            resource_id,
+            msg["level"],
+            valid_from=valid_from.isoformat() if valid_from else None,
+            valid_until=valid_until.isoformat() if valid_until else None,
+            recurrence=recurrence,
+            actor_id=user.id,
+        )
+        _LOGGER.info("Schedule saved: schedule=%s (by admin %s)", schedule_id, user.id)
+        connection.send_result(msg["id"], {"success": True})
+    except Exception as err:
+        _LOGGER.exception("Failed to save schedule: %s", err)
+        connection.send_error(msg["id"], "save_failed", str(err))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "permission_manager/delete_schedule",
+        vol.Required("schedule_id"): vol.All(str, vol.Length(min=1, max=255)),
+    }
+)
+@websocket_api.async_response
+async def ws_delete_schedule(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Delete a time-windowed grant.
+
+    The user's current level for the resource is left unchanged.
+
+    This endpoint is only available to admin users.
+    """
+    user = connection.user
+
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
+
+    if not user.is_admin:
+        connection.send_error(msg["id"], "forbidden", "Admin access required")
+        return
+
+    from . import async_delete_schedule
+
+    await async_delete_schedule(hass, msg["schedule_id"], actor_id=user.id)
+    _LOGGER.info("Schedule deleted: schedule=%s (by admin %s)", msg["schedule_id"], user.id)
+    connection.send_result(msg["id"], {"success": True})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "permission_manager/get_stats",
+        vol.Optional("reset", default=False): bool,
+    }
+)
+@callback
+def ws_get_stats(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Get per-command call counts, latency histograms and payload sizes.
+
+    This endpoint is only available to admin users.
+
+    Args (in msg):
+        reset: Clear the statistics after reading them.
+
+    Returns:
+        since: When recording started.
+        commands: Command type -> statistics.
+        mutations: Mutation function -> statistics.
+        slowest: The slowest recent calls.
+        rate_limits: Command type -> {rate, burst, connections}.
+    """
+    user = connection.user
+
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
+
+    if not user.is_admin:
+        connection.send_error(msg["id"], "forbidden", "Admin access required")
+        return
+
+    stats = async_get_stats(hass)
+    if stats is None:
+        connection.send_error(msg["id"], "not_loaded", "Permission Manager is not loaded")
+        return
+
+    result = stats.as_dict()
+    if (limiter := async_get_rate_limiter(hass)) is not None:
+        result["rate_limits"] = {
+            command: {"rate": rate, "burst": burst}
+            for command, (rate, burst) in sorted(limiter.limits.items())
+        }
+    if msg["reset"]:
+        stats.reset()
+    connection.send_result(msg["id"], result)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "permission_manager/set_rate_limit",
+        vol.Required("command"): vol.All(str, vol.Length(min=1, max=255)),
+        vol.Optional("rate"): vol.All(vol.Coerce(float), vol.Range(min=0.01, max=1000)),
+        vol.Optional("burst"): vol.All(vol.Coerce(int), vol.Range(min=1, max=10000)),
+    }
+)
+@callback
+def ws_set_rate_limit(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Set the per-connection rate limit of a command.
+
+    This endpoint is only available to admin users. Limits apply until
+    Home Assistant restarts (see ratelimit.py for the defaults).
+
+    Args (in msg):
+        command: The command type, e.g. "area_control/get_permitted_areas";
+            must be one of the integration's instrumented commands.
+        rate: Calls per second; omit rate and burst to remove the limit.
+        burst: Calls allowed at once (default: rate * 10).
+
+    Returns the command's limit, or None if it is not limited.
+    """
+    user = connection.user
+
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
+
+    if not user.is_admin:
+        connection.send_error(msg["id"], "forbidden", "Admin access required")
+        return
+
+    limiter = async_get_rate_limiter(hass)
+    if limiter is None:
+        connection.send_error(msg["id"], "not_loaded", "Permission Manager is not loaded")
+        return
+
+    try:
+        command = vol.In(limiter.commands)(msg["command"])
+    except vol.Invalid:
+        connection.send_error(msg["id"], "not_found", "Command not found")
+        return
+
+    if "rate" in msg:
+        rate = msg["rate"]
+        limiter.set_limit(command, (rate, msg.get("burst", max(1, round(rate * 10)))))
+    elif "burst" in msg:
+        connection.send_error(msg["id"], "invalid_format", "burst requires rate")
+        return
+    else:
+        limiter.set_limit(command, None)
+
+    limit = limiter.limits.get(command)
+    _LOGGER.info("Rate limit of %s set to %s (by admin %s)", command, limit, user.id)
+    connection.send_result(msg["id"], {
+        "command": command,
+        "limit": {"rate": limit[0], "burst": limit[1]} if limit else None,
+    })
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "permission_manager/set_tracing",
+        vol.Required("enabled"): bool,
+        vol.Optional("buffer_size", default=DEFAULT_BUFFER_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=MIN_BUFFER_SIZE, max=MAX_BUFFER_SIZE)
+        ),
+    }
+)
+@callback
+def ws_set_tracing(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Enable or disable request tracing.
+
+    This endpoint is only available to admin users.
+
+    Args (in msg):
+        enabled: Whether spans are recorded.
+        buffer_size: Number of most recent spans kept (when enabling).
+
+    Returns the tracing state.
+    """
+    user = connection.user
+
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
+
+    if not user.is_admin:
+        connection.send_error(msg["id"], "forbidden", "Admin access required")
+        return
+
+    tracer = hass.data.get(DOMAIN, {}).get("tracer")
+    if tracer is None:
+        connection.send_error(msg["id"], "not_loaded", "Permission Manager is not loaded")
+        return
+
+    if msg["enabled"]:
+        tracer.enable(msg["buffer_size"])
+    else:
+        tracer.disable()
+    _LOGGER.info("Tracing %s (by admin %s)", "enabled" if msg["enabled"] else "disabled", user.id)
+    connection.send_result(msg["id"], {
+        "enabled": tracer.enabled,
+        "buffer_size": tracer.events.maxlen,
+        "spans": len(tracer.events),
+    })
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "permission_manager/get_trace",
+        vol.Optional("clear", default=False): bool,
+    }
+)
+@callback
+def ws_get_trace(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Download the recorded spans as Chrome trace JSON.
+
+    The result can be saved to a file and opened in chrome://tracing or
+    Perfetto. This endpoint is only available to admin users.
+
+    Args (in msg):
+        clear: Drop the recorded spans after reading them.
+    """
+    user = connection.user
+
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
+
+    if not user.is_admin:
+        connection.send_error(msg["id"], "forbidden", "Admin access required")
+        return
+
+    tracer = hass.data.get(DOMAIN, {}).get("tracer")
+    if tracer is None:
+        connection.send_error(msg["id"], "not_loaded", "Permission Manager is not loaded")
+        return
+
+    trace = tracer.as_chrome_trace()
+    if msg["clear"]:
+        tracer.events.clear()
+    connection.send_result(msg["id"], trace)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "permission_manager/get_audit_log",
+        vol.Optional("user_id"): vol.All(str, vol.Length(min=1, max=255)),
+        vol.Optional("resource_id"): vol.All(str, vol.Length(min=1, max=255)),
+        vol.Optional("start_time"): cv.datetime,
+        vol.Optional("end_time"): cv.datetime,
+        vol.Optional("limit", default=50): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=500)
+        ),
+        vol.Optional("cursor"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+@websocket_api.async_response
+async def ws_get_audit_log(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return audit log entries of permission changes, newest first.
+
+    Only the on-disk segments that can contain matching entries are read.
+    This endpoint is only available to admin users.
+
+    Args (in msg):
+        user_id: Optional user whose access changed, or who made the change.
+        resource_id: Optional resource ID with prefix.
+        start_time: Optional start of the time range (local time if naive).
+        end_time: Optional end of the time range (local time if naive).
+        limit: Maximum number of entries (default 50).
+        cursor: next_cursor of the previous page.
+
+    Returns:
+        entries: Matching entries.
+        next_cursor: Cursor for the next page, or None.
+    """
+    user = connection.user
+
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
+
+    if not user.is_admin:
+        connection.send_error(msg["id"], "forbidden", "Admin access required")
+        return
+
+    audit = hass.data.get(DOMAIN, {}).get("audit")
+    if audit is None:
+        connection.send_error(msg["id"], "not_loaded", "Permission Manager is not loaded")
+        return
+
+    start_time = msg.get("start_time")
+    end_time = msg.get("end_time")
+    entries, next_cursor = await audit.async_query(
+        user_id=msg.get("user_id"),
+        resource_id=msg.get("resource_id"),
+        start_time=dt_util.as_local(start_time) if start_time else None,
+        end_time=dt_util.as_local(end_time) if end_time else None,
+        limit=msg["limit"],
+        cursor=msg.get("cursor"),
+    )
+    connection.send_result(msg["id"], {"entries": entries, "next_cursor": next_cursor})
+
+
+# =============================================================================
+# Effective Access Simulation
+# =============================================================================
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "permission_manager/get_effective_access",
+        vol.Required("user_id"): vol.All(str, vol.Length(min=1, max=255)),
+        vol.Optional("changes", default=[]): vol.All(
+            [
+                {
+                    vol.Required("resource_id"): vol.All(
+                        str, vol.Length(min=1, max=255)
+                    ),
+                    vol.Required("level"): vol.All(
+                        vol.Coerce(int), vol.Range(min=0, max=1)
+                    ),
+                }
+            ],
+            vol.Length(max=10000),
+        ),
+        vol.Optional("include_entities", default=True): bool,
+    }
+)
+@websocket_api.async_response
+async def ws_get_effective_access(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return what a user can see, optionally with pending changes applied.
+
+    This endpoint is only available to admin users.
+
+    Access is resolved from the same data as enforcement: the user's
+    compiled permissions (direct grants and roles) and the scope index.
+    With changes (pending direct grants), the result also carries a delta
+    against the user's current access.
+
+    Args (in msg):
+        user_id: The user to simulate.
+        changes: Optional list of {resource_id, level} direct grants.
+        include_entities: Include the entity IDs grouped by domain
+            (counts are always included).
+
+    Returns visible panels, areas, labels and devices, the resolved entity
+    set and counts.
+    """
+    user = connection.user
+
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
+
+    if not user.is_admin:
+        connection.send_error(msg["id"], "forbidden", "Admin access required")
+        return
+
+    target = await hass.auth.async_get_user(msg["user_id"])
+    if target is None:
+        connection.send_error(msg["id"], "not_found", "User not found")
+        return
+
+    changes = msg["changes"]
+    for change in changes:
+        if not change["resource_id"].startswith(RESOURCE_PREFIXES):
+            connection.send_error(
+                msg["id"],
+                "invalid_resource",
+                f"Resource ID must start with one of: {RESOURCE_PREFIXES}"
+            )
+            return
+
+    current_perms = _get_user_permissions(hass, target.id)
+    with span(hass, "resolve_access", changes=len(changes)):
+        current = _resolve_access(hass, current_perms, target.is_admin)
+        if changes:
+            domain_data = hass.data[DOMAIN]
+            direct = dict(domain_data.get("permissions", {}).get(target.id, {}))
+            for change in changes:
+                direct[change["resource_id"]] = change["level"]
+            simulated = _resolve_access(
+                hass,
+                compile_permissions(
+                    target.id,
+                    direct,
+                    domain_data.get("roles", {}),
+                    domain_data.get("scheduled_permissions", {}).get(target.id),
+                ),
+                target.is_admin,
+            )
+        else:
+            simulated = current
+
+    entity_ids = sorted(simulated["entities"])
+    result: dict[str, Any] = {
+        "user_id": target.id,
+        "is_admin": target.is_admin,
+        "panels": sorted(simulated["panels"]),
+        "areas": sorted(simulated["areas"]),
+        "labels": sorted(simulated["labels"]),
+        "devices": sorted(simulated["devices"]),
+        "counts": {
+            "panels": len(simulated["panels"]),
+            "areas": len(simulated["areas"]),
+            "labels": len(simulated["labels"]),
+            "devices": len(simulated["devices"]),
+            "entities": len(entity_ids),
+            "domains": {
+                domain: len(domain_entity_ids)
+                for domain, domain_entity_ids in _group_by_domain(entity_ids).items()
+            },
+        },
+    }
+    if msg["include_entities"]:
+        result["entities"] = _group_by_domain(entity_ids)
+    if changes:
+        result["delta"] = {
+            key: {
+                "added": sorted(simulated[key] - current[key]),
+                "removed": sorted(current[key] - simulated[key]),
+            }
+            for key in ("panels", "areas", "labels", "devices")
+        }
+        result["delta"]["entities"] = {
+            "added": len(simulated["entities"] - current["entities"]),
+            "removed": len(current["entities"] - simulated["entities"]),
+        }
+
+    connection.send_result(msg["id"], result)
+
+
+@callback
+def _resolve_access(
+    hass: HomeAssistant, user_perms: dict[str, int], is_admin: bool
+) -> dict[str, set[str]]:
+    """Resolve compiled permissions to visible resources and entities.
+
+    Mirrors enforcement: the sidebar shows panels granted View (plus the
+    profile panel), a floor grant permits its areas, and an entity is
+    visible through a permitted area, label or device. Only device grants
+    count as devices: entities of a device reached through its area are
+    visible only if their own area is permitted, as in
+    _get_permitted_device_entities. Admin users see everything.
+
+    Args:
+        hass: Home Assistant instance.
+        user_perms: Dictionary mapping resource_id -> permission_level.
+        is_admin: Whether the user is an admin.
+
+    Returns:
+        Dictionary with sets of panel, area, label, device and entity IDs.
+    """
+    index: ScopeIndex = hass.data[DOMAIN]["index"]
+    panel_ids = set(hass.data.get("frontend_panels", {}))
+
+    if is_admin:
+        return {
+            "panels": panel_ids,
+            "areas": {area.id for area in ar.async_get(hass).async_list_areas()},
+            "labels": {
+                label.label_id for label in lr.async_get(hass).async_list_labels()
+            },
+            "devices": set(index.device_entities),
+            "entities": set(index.entities),
+        }
+
+    area_ids = _ids_with_prefix(user_perms, PREFIX_AREA)
+    for floor_id in _ids_with_prefix(user_perms, PREFIX_FLOOR):
+        area_ids |= index.floor_areas.get(floor_id, set())
+    label_ids = _ids_with_prefix(user_perms, PREFIX_LABEL)
+    device_ids = _ids_with_prefix(user_perms, PREFIX_DEVICE)
+
+    entity_ids: set[str] = set()
+    for area_id in area_ids:
+        entity_ids |= index.area_entities.get(area_id, set())
+    for label_id in label_ids:
+        entity_ids |= index.label_entities.get(label_id, set())
+    for device_id in device_ids:
+        entity_ids |= index.device_entities.get(device_id, set())
+
+    return {
+        "panels": panel_ids & (_ids_with_prefix(user_perms, PREFIX_PANEL) | {"profile"}),
+        "areas": area_ids,
+        "labels": label_ids,
+        "devices": device_ids,
+        "entities": entity_ids,
+    }
+
+
+# =============================================================================
+# Export / Import
+# =============================================================================
 
-    panels: dict[str, int] = {}
-    areas: dict[str, int] = {}
-    labels: dict[str, int] = {}
 
-    # Get all permissions for this user from Store
-    user_perms = _get_user_permissions(hass, user_id)
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "permission_manager/export_permissions",
+        vol.Optional("chunk_size", default=DEFAULT_CHUNK_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=1000)
+        ),
+    }
+)
+@websocket_api.async_response
+async def ws_export_permissions(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream the permission data in chunks.
 
-    for resource_id, perm_level in user_perms.items():
-        if resource_id.startswith(PREFIX_PANEL):
-            panel_id = resource_id[len(PREFIX_PANEL):]
-            panels[panel_id] = perm_level
+    This endpoint is only available to admin users.
 
-        elif resource_id.startswith(PREFIX_AREA):
-            area_id = resource_id[len(PREFIX_AREA):]
-            areas[area_id] = perm_level
+    The result is the export header {schema, version, exported_at, counts}.
+    It is followed by one event per chunk ({section, items}, see
+    transfer.py) and a final {"done": true} event. The chunks come from a
+    snapshot taken when the export starts; unsubscribing stops the export.
 
-        elif resource_id.startswith(PREFIX_LABEL):
-            label_id = resource_id[len(PREFIX_LABEL):]
-            labels[label_id] = perm_level
+    Args (in msg):
+        chunk_size: Maximum number of items per chunk (default 100).
+    """
+    user = connection.user
 
-    _LOGGER.info(
-        "All permissions for user %s (is_admin=%s): panels=%d, areas=%d, labels=%d",
-        user_id, is_admin, len(panels), len(areas), len(labels),
-    )
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
 
-    # Note: user_id intentionally not included for security
+    if not user.is_admin:
+        connection.send_error(msg["id"], "forbidden", "Admin access required")
+        return
+
+    from . import async_get_store_data
+
+    data = copy.deepcopy(async_get_store_data(hass))
+    cancelled = False
+
+    @callback
+    def _cancel() -> None:
+        nonlocal cancelled
+        cancelled = True
+
+    connection.subscriptions[msg["id"]] = _cancel
     connection.send_result(msg["id"], {
-        "panels": panels,
-        "areas": areas,
-        "labels": labels,
-        "is_admin": is_admin,
+        "schema": EXPORT_SCHEMA,
+        "version": EXPORT_VERSION,
+        "exported_at": dt_util.utcnow().isoformat(),
+        "counts": {section: len(data.get(section, {})) for section in SECTIONS},
+    })
+
+    for chunk in iter_export_chunks(data, msg["chunk_size"]):
+        if cancelled:
+            return
+        connection.send_message(websocket_api.event_message(msg["id"], chunk))
+        # Let other work run between chunks
+        await asyncio.sleep(0)
+    if not cancelled:
+        connection.send_message(websocket_api.event_message(msg["id"], {"done": True}))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "permission_manager/import_permissions",
+        vol.Required("version"): int,
+        vol.Optional("import_id"): vol.All(str, vol.Length(min=1, max=64)),
+        vol.Optional("section"): vol.In(SECTIONS),
+        vol.Optional("items", default={}): dict,
+        vol.Optional("commit", default=False): bool,
+        vol.Optional("mode", default="merge"): vol.In(("merge", "replace")),
+        vol.Optional("dry_run", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def ws_import_permissions(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Receive an import chunk by chunk and apply it on commit.
+
+    This endpoint is only available to admin users.
+
+    The first call (without import_id) starts an import; later calls pass
+    the returned import_id. Each call may carry one chunk (section and
+    items, as produced by export_permissions). The call with commit=true
+    validates all received items against the current users and registries
+    in one pass and applies the valid ones as one batched change with one
+    save. Grants for unknown users or resources are skipped and reported.
+
+    Args (in msg):
+        version: Export format version; must match EXPORT_VERSION.
+        import_id: ID of the import to add to (omit to start one).
+        section: Section of the chunk ("permissions", "roles", "schedules").
+        items: Items of the chunk.
+        commit: Validate and apply the received items.
+        mode: "merge" into the stored data (default) or "replace" it.
+        dry_run: On commit, validate and report without applying.
+
+    Returns {import_id, received} for chunks, and {import_id, applied,
+    counts, unknown_users, unknown_resources, invalid} on commit.
+    """
+    user = connection.user
+
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
+
+    if not user.is_admin:
+        connection.send_error(msg["id"], "forbidden", "Admin access required")
+        return
+
+    if msg["version"] != EXPORT_VERSION:
+        connection.send_error(
+            msg["id"],
+            "unsupported_version",
+            f"Unsupported export version {msg['version']} (expected {EXPORT_VERSION})",
+        )
+        return
+
+    pending = async_get_pending_import(hass, msg.get("import_id"))
+    if pending is None:
+        connection.send_error(msg["id"], "not_found", "Import not found or expired")
+        return
+
+    if section := msg.get("section"):
+        if pending.size() + len(msg["items"]) > MAX_IMPORT_ITEMS:
+            async_pop_pending_import(hass, pending.import_id)
+            connection.send_error(
+                msg["id"], "too_large", f"Imports are limited to {MAX_IMPORT_ITEMS} items"
+            )
+            return
+        pending.sections[section].update(msg["items"])
+
+    if not msg["commit"]:
+        connection.send_result(
+            msg["id"], {"import_id": pending.import_id, "received": pending.counts()}
+        )
+        return
+
+    async_pop_pending_import(hass, pending.import_id)
+    with span(hass, "validate_import"):
+        valid, report = await async_validate_import(hass, pending.sections)
+
+    applied = not msg["dry_run"]
+    if applied:
+        from . import async_import_data
+
+        try:
+            await async_import_data(
+                hass,
+                valid["permissions"],
+                valid["roles"],
+                valid["schedules"],
+                replace=msg["mode"] == "replace",
+                actor_id=user.id,
+            )
+        except Exception as err:
+            _LOGGER.exception("Failed to import permissions: %s", err)
+            connection.send_error(msg["id"], "import_failed", str(err))
+            return
+        _LOGGER.info(
+            "Permissions imported: import=%s, mode=%s (by admin %s)",
+            pending.import_id, msg["mode"], user.id,
+        )
+
+    connection.send_result(msg["id"], {
+        "import_id": pending.import_id,
+        "applied": applied,
+        "counts": {section: len(items) for section, items in valid.items()},
+        **report,
     })
 
 
 # =============================================================================
-# Admin Panel WebSocket Handlers
+# Snapshots
 # =============================================================================
 
 
 @websocket_api.websocket_command(
     {
-        vol.Required("type"): "permission_manager/get_admin_data",
+        vol.Required("type"): "permission_manager/create_snapshot",
+        vol.Required("name"): vol.All(str, vol.Length(min=1, max=100)),
     }
 )
-@websocket_api.async_response
-async def ws_get_admin_data(
+@callback
+def ws_create_snapshot(
     hass: HomeAssistant,
     connection: ActiveConnection,
     msg: dict[str, Any],
 ) -> None:
-    """Return all data needed for the admin permission manager panel.
+    """Snapshot the current permission matrix.
 
-    This endpoint is only available to admin users and returns:
-    - users: list of all non-owner, non-system users with id, name, is_admin
-    - resources: dict of resource_type -> list of resources (panels, areas, labels)
-    - permissions: dict of user_id -> {resource_id: permission_level}
+    This endpoint is only available to admin users.
 
-    The frontend uses this data to display the permission matrix.
+    Returns the snapshot {snapshot_id, name, created, auto, delta_size}.
     """
     user = connection.user
 
@@ -634,113 +2599,112 @@ async def ws_get_admin_data(
         connection.send_error(msg["id"], "forbidden", "Admin access required")
         return
 
-    # Get all users (excluding owner and system accounts)
-    users_data = []
-    for ha_user in await hass.auth.async_get_users():
-        # Skip owner and system accounts
-        if ha_user.is_owner or ha_user.system_generated:
-            continue
-        users_data.append({
-            "id": ha_user.id,
-            "name": ha_user.name or "Unknown",
-            "is_admin": ha_user.is_admin,
-        })
+    snapshots: PermissionSnapshots = hass.data[DOMAIN]["snapshots"]
+    snapshot = snapshots.async_create(msg["name"])
+    async_audit(
+        hass, "create_snapshot", actor=user.id,
+        snapshot_id=snapshot["snapshot_id"], name=msg["name"],
+    )
+    connection.send_result(msg["id"], snapshot)
 
-    # Sort users by name
-    users_data.sort(key=lambda u: u["name"].lower())
 
-    # Get all resources
-    resources = {
-        "panels": [],
-        "areas": [],
-        "labels": [],
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "permission_manager/list_snapshots",
     }
+)
+@callback
+def ws_list_snapshots(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """List the snapshots, newest first.
+
+    This endpoint is only available to admin users.
+    """
+    user = connection.user
+
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
+
+    if not user.is_admin:
+        connection.send_error(msg["id"], "forbidden", "Admin access required")
+        return
+
+    snapshots: PermissionSnapshots = hass.data[DOMAIN]["snapshots"]
+    connection.send_result(msg["id"], {"snapshots": snapshots.async_list()})
 
-    # Get panels from frontend_panels (excluding internal panels)
-    frontend_panels = hass.data.get("frontend_panels", {})
-    excluded_panels = {
-        "developer-tools", "config", "profile",
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "permission_manager/diff_snapshot",
+        vol.Required("snapshot_id"): str,
+        vol.Optional("against"): str,
     }
-    for panel_id, panel in frontend_panels.items():
-        if panel_id in excluded_panels:
-            continue
-        # Get panel title
-        title = panel_id
-        if hasattr(panel, "title") and panel.title:
-            title = panel.title
-        elif hasattr(panel, "config") and isinstance(panel.config, dict):
-            title = panel.config.get("title", panel_id)
-        resources["panels"].append({
-            "id": panel_id,
-            "name": title,
-            "type": "panel",
-        })
+)
+@callback
+def ws_diff_snapshot(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the cells that differ between a snapshot and another matrix.
 
-    # Get areas
-    area_reg = ar.async_get(hass)
-    for area in area_reg.async_list_areas():
-        resources["areas"].append({
-            "id": area.id,
-            "name": area.name,
-            "type": "area",
-        })
+    This endpoint is only available to admin users.
 
-    # Get labels
-    label_reg = lr.async_get(hass)
-    for label in label_reg.async_list_labels():
-        resources["labels"].append({
-            "id": label.label_id,
-            "name": label.name,
-            "type": "label",
-        })
+    Args (in msg):
+        snapshot_id: The snapshot to compare.
+        against: Another snapshot to compare with (default: the current
+            permissions).
 
-    # Sort resources by name
-    for key in resources:
-        resources[key].sort(key=lambda r: r["name"].lower())
+    Returns {changes: [{user_id, resource_id, old, new}]}, where old is the
+    snapshot's level and new the other's (None for a missing cell).
+    """
+    user = connection.user
 
-    # Get all permissions from Store
-    domain_data = hass.data.get(DOMAIN, {})
-    all_permissions = domain_data.get("permissions", {})
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
 
-    _LOGGER.info(
-        "Admin data: %d users, %d panels, %d areas, %d labels",
-        len(users_data),
-        len(resources["panels"]),
-        len(resources["areas"]),
-        len(resources["labels"]),
-    )
+    if not user.is_admin:
+        connection.send_error(msg["id"], "forbidden", "Admin access required")
+        return
 
-    connection.send_result(msg["id"], {
-        "users": users_data,
-        "resources": resources,
-        "permissions": all_permissions,
-    })
+    snapshots: PermissionSnapshots = hass.data[DOMAIN]["snapshots"]
+    old = snapshots.async_get_permissions(msg["snapshot_id"])
+    if "against" in msg:
+        new = snapshots.async_get_permissions(msg["against"])
+    else:
+        new = hass.data[DOMAIN].get("permissions", {})
+    if old is None or new is None:
+        connection.send_error(msg["id"], "not_found", "Snapshot not found")
+        return
+
+    connection.send_result(msg["id"], {"changes": diff_permissions(old, new)})
 
 
 @websocket_api.websocket_command(
     {
-        vol.Required("type"): "permission_manager/set_permission",
-        vol.Required("user_id"): vol.All(str, vol.Length(min=1, max=255)),
-        vol.Required("resource_id"): vol.All(str, vol.Length(min=1, max=255)),
-        vol.Required("level"): vol.All(vol.Coerce(int), vol.Range(min=0, max=1)),
+        vol.Required("type"): "permission_manager/restore_snapshot",
+        vol.Required("snapshot_id"): str,
     }
 )
 @websocket_api.async_response
-async def ws_set_permission(
+async def ws_restore_snapshot(
     hass: HomeAssistant,
     connection: ActiveConnection,
     msg: dict[str, Any],
 ) -> None:
-    """Set permission level for a user and resource.
+    """Restore the permission matrix of a snapshot.
 
     This endpoint is only available to admin users.
 
-    Args (in msg):
-        user_id: The user ID to set permission for.
-        resource_id: The resource ID with prefix (e.g., "panel_config", "area_living_room").
-        level: Permission level (0=Closed, 1=View).
+    The current matrix is snapshotted first ("Before restore"), so the
+    restore can be undone. Roles and schedules are not changed.
 
-    Returns success status.
+    Returns {changes: [{user_id, resource_id, old, new}]}.
     """
     user = connection.user
 
@@ -752,30 +2716,100 @@ async def ws_set_permission(
         connection.send_error(msg["id"], "forbidden", "Admin access required")
         return
 
-    target_user_id = msg["user_id"]
-    resource_id = msg["resource_id"]
-    level = msg["level"]
+    from . import async_restore_snapshot
 
-    # Validate resource_id format (must have valid prefix)
-    valid_prefixes = (PREFIX_PANEL, PREFIX_AREA, PREFIX_LABEL)
-    if not any(resource_id.startswith(p) for p in valid_prefixes):
-        connection.send_error(
-            msg["id"],
-            "invalid_resource",
-            f"Resource ID must start with one of: {valid_prefixes}"
-        )
+    changes = await async_restore_snapshot(
+        hass, msg["snapshot_id"], actor_id=user.id
+    )
+    if changes is None:
+        connection.send_error(msg["id"], "not_found", "Snapshot not found")
         return
 
-    # Import the async_set_permission function from __init__.py
-    from . import async_set_permission
+    _LOGGER.info(
+        "Snapshot restored: snapshot=%s (by admin %s)",
+        msg["snapshot_id"], user.id,
+    )
+    connection.send_result(msg["id"], {"changes": changes})
 
-    try:
-        await async_set_permission(hass, target_user_id, resource_id, level)
-        _LOGGER.info(
-            "Permission set: user=%s, resource=%s, level=%d (by admin %s)",
-            target_user_id, resource_id, level, user.id
-        )
-        connection.send_result(msg["id"], {"success": True})
-    except Exception as err:
-        _LOGGER.exception("Failed to set permission: %s", err)
-        connection.send_error(msg["id"], "set_failed", str(err))
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "permission_manager/delete_snapshot",
+        vol.Required("snapshot_id"): str,
+    }
+)
+@callback
+def ws_delete_snapshot(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Delete a snapshot.
+
+    This endpoint is only available to admin users.
+    """
+    user = connection.user
+
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
+
+    if not user.is_admin:
+        connection.send_error(msg["id"], "forbidden", "Admin access required")
+        return
+
+    snapshots: PermissionSnapshots = hass.data[DOMAIN]["snapshots"]
+    if not snapshots.async_delete(msg["snapshot_id"]):
+        connection.send_error(msg["id"], "not_found", "Snapshot not found")
+        return
+
+    connection.send_result(msg["id"], {"success": True})
+
+
+# =============================================================================
+# Orphan Cleanup
+# =============================================================================
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "permission_manager/sweep_orphans",
+        vol.Optional("dry_run", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def ws_sweep_orphans(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Remove permission entries of deleted users and resources now.
+
+    This endpoint is only available to admin users.
+
+    The same sweep also runs in the background after startup and once a
+    day (see sweeper.py).
+
+    Args (in msg):
+        dry_run: Only report the orphans (default False).
+
+    Returns the sweep result {time, duration, dry_run, scanned_users,
+    orphans, removed, reclaimed_bytes} and the totals since setup.
+    """
+    user = connection.user
+
+    if user is None:
+        connection.send_error(msg["id"], "not_authenticated", "User not authenticated")
+        return
+
+    if not user.is_admin:
+        connection.send_error(msg["id"], "forbidden", "Admin access required")
+        return
+
+    sweeper: OrphanSweeper = hass.data[DOMAIN]["sweeper"]
+    result = await sweeper.async_sweep(dry_run=msg["dry_run"])
+    connection.send_result(msg["id"], {
+        **result,
+        "total_removed": sweeper.total_removed,
+        "total_reclaimed_bytes": sweeper.total_reclaimed_bytes,
+    })
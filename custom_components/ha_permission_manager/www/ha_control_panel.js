@@ -1,1121 +1,57 @@
 // Home Assistant Unified Control Panel
 // Combines Area Control and Label Control into a single tabbed interface
 // Matches HA Home Dashboard design with tall tiles and embedded controls
-
-// Use jsDelivr CDN (faster than unpkg, with proper caching)
-const { LitElement, html, css } = await import(
-  "https://cdn.jsdelivr.net/npm/lit@3.1.0/+esm"
-);
-
-// ============================================================================
-// DESIGN TOKENS - HA Native Style
-// ============================================================================
-
-const DOMAIN_COLORS = {
-  light: "#FFB300",
-  switch: "#FFB300",
-  input_boolean: "#FFB300",
-  fan: "#009688",
-  climate: "#FF9800",
-  climate_cool: "#2196F3",
-  cover: "#9C27B0",
-  lock: "#4CAF50",
-  lock_unlocked: "#F44336",
-  vacuum: "#009688",
-  media_player: "#673AB7",
-  humidifier: "#00BCD4",
-  automation: "#2196F3",
-  script: "#2196F3",
-  scene: "#E91E63",
-  sensor: "#607D8B",
-  binary_sensor: "#607D8B",
-  button: "#FF9800",
-  person: "#4CAF50",
-  person_away: "#9E9E9E",
-  camera: "#607D8B",
-  alarm_control_panel: "#F44336",
-  update: "#4CAF50",
-  weather: "#03A9F4",
-  input_number: "#9C27B0",
-  input_select: "#9C27B0",
-  input_text: "#9C27B0",
-  number: "#9C27B0",
-  select: "#9C27B0",
-  text: "#9C27B0",
-  device_tracker: "#4CAF50",
-  calendar: "#FF9800",
-  todo: "#FF9800",
-  remote: "#673AB7",
-};
-
-const DOMAIN_ICONS = {
-  light: "mdi:lightbulb",
-  switch: "mdi:toggle-switch",
-  input_boolean: "mdi:toggle-switch-outline",
-  fan: "mdi:fan",
-  climate: "mdi:thermostat",
-  cover: "mdi:window-shutter",
-  lock: "mdi:lock",
-  vacuum: "mdi:robot-vacuum",
-  media_player: "mdi:cast",
-  humidifier: "mdi:air-humidifier",
-  automation: "mdi:robot",
-  script: "mdi:script-text",
-  scene: "mdi:palette",
-  sensor: "mdi:eye",
-  binary_sensor: "mdi:checkbox-marked-circle",
-  button: "mdi:gesture-tap-button",
-  person: "mdi:account",
-  camera: "mdi:cctv",
-  alarm_control_panel: "mdi:shield-home",
-  update: "mdi:package-up",
-  weather: "mdi:weather-partly-cloudy",
-  input_number: "mdi:ray-vertex",
-  input_select: "mdi:form-dropdown",
-  input_text: "mdi:form-textbox",
-  number: "mdi:ray-vertex",
-  select: "mdi:form-dropdown",
-  text: "mdi:form-textbox",
-  device_tracker: "mdi:crosshairs-gps",
-  calendar: "mdi:calendar",
-  todo: "mdi:clipboard-list",
-  remote: "mdi:remote",
-};
-
-// Fixed 9 domains that always show in summary section
-const SUMMARY_DOMAINS = [
-  "light",
-  "climate",
-  "cover",
-  "fan",
-  "media_player",
-  "lock",
-  "vacuum",
-  "switch",
-  "input_boolean",
-];
-
-// Domains that can be toggled
-const TOGGLEABLE_DOMAINS = [
-  "light",
-  "switch",
-  "input_boolean",
-  "fan",
-  "climate",
-  "humidifier",
-  "automation",
-  "lock",
-  "vacuum",
-  "media_player",
-];
-
-// Domain display order
-const DOMAIN_ORDER = [
-  "light", "switch", "climate", "cover", "fan", "media_player",
-  "automation", "script", "scene", "button",
-  "sensor", "binary_sensor",
-  "vacuum", "lock", "camera",
-  "input_boolean", "input_number", "input_select", "input_text",
-  "number", "select", "text",
-  "person", "device_tracker",
-  "calendar", "todo",
-  "alarm_control_panel", "update",
-];
-
-// States considered "active" for counting purposes
-const ACTIVE_STATES = ["on", "playing", "open", "unlocked", "heat", "cool", "heat_cool", "auto", "cleaning", "home"];
-
-// Translations
-const TRANSLATIONS = {
-  en: {
-    title: "Control Panel",
-    areasTab: "Areas",
-    labelsTab: "Labels",
-    summary: "Summary",
-    areas: "Areas",
-    labels: "Labels",
-    noAreas: "No areas available",
-    noLabels: "No labels available",
-    noEntities: "No entities in this section",
-    entities: "entities",
-    loading: "Loading...",
-    on: "on",
-    off: "off",
-    allOff: "All off",
-    searchPlaceholder: "Search devices...",
-    all: "All",
-    retry: "Retry",
-    light: "Lights", switch: "Switches", climate: "Climate", cover: "Covers",
-    fan: "Fans", media_player: "Media", vacuum: "Vacuums", lock: "Locks",
-    humidifier: "Humidifiers", automation: "Automations", script: "Scripts",
-    scene: "Scenes", button: "Buttons", sensor: "Sensors",
-    binary_sensor: "Binary Sensors", input_boolean: "Input Boolean",
-    input_number: "Input Number", input_select: "Input Select",
-    input_text: "Input Text", alarm_control_panel: "Security",
-    camera: "Cameras", person: "Persons", device_tracker: "Trackers",
-  },
-  "zh-Hant": {
-    title: "控制面板",
-    areasTab: "分區",
-    labelsTab: "標籤",
-    summary: "摘要",
-    areas: "分區",
-    labels: "標籤",
-    noAreas: "沒有可用的分區",
-    noLabels: "沒有可用的標籤",
-    noEntities: "此區域沒有實體",
-    entities: "個實體",
-    loading: "載入中...",
-    on: "開啟",
-    off: "關閉",
-    allOff: "全部關閉",
-    searchPlaceholder: "搜尋裝置...",
-    all: "全部",
-    retry: "重試",
-    light: "燈光", switch: "開關", climate: "溫控", cover: "窗簾",
-    fan: "風扇", media_player: "媒體播放器", vacuum: "掃地機", lock: "門鎖",
-    humidifier: "加濕器", automation: "自動化", script: "腳本",
-    scene: "場景", button: "按鈕", sensor: "感測器",
-    binary_sensor: "二元感測器", input_boolean: "輔助開關",
-    input_number: "輸入數字", input_select: "輸入選擇",
-    input_text: "輸入文字", alarm_control_panel: "保全",
-    camera: "攝影機", person: "人員", device_tracker: "追蹤器",
-  },
-  "zh-Hans": {
-    title: "控制面板",
-    areasTab: "分区",
-    labelsTab: "标签",
-    summary: "摘要",
-    areas: "分区",
-    labels: "标签",
-    noAreas: "没有可用的分区",
-    noLabels: "没有可用的标签",
-    noEntities: "此区域没有实体",
-    entities: "个实体",
-    loading: "加载中...",
-    on: "开启",
-    off: "关闭",
-    allOff: "全部关闭",
-    searchPlaceholder: "搜索设备...",
-    all: "全部",
-    retry: "重试",
-    light: "灯光", switch: "开关", climate: "温控", cover: "窗帘",
-    fan: "风扇", media_player: "媒体播放器", vacuum: "扫地机", lock: "门锁",
-    humidifier: "加湿器", automation: "自动化", script: "脚本",
-    scene: "场景", button: "按钮", sensor: "传感器",
-    binary_sensor: "二元传感器", input_boolean: "辅助开关",
-    input_number: "输入数字", input_select: "输入选择",
-    input_text: "输入文字", alarm_control_panel: "安防",
-    camera: "摄像机", person: "人员", device_tracker: "追踪器",
-  },
-};
-
-// Label color mapping
-const LABEL_COLORS = {
-  red: "#f44336", pink: "#e91e63", purple: "#9c27b0", deep_purple: "#673ab7",
-  indigo: "#3f51b5", blue: "#2196f3", light_blue: "#03a9f4", cyan: "#00bcd4",
-  teal: "#009688", green: "#4caf50", light_green: "#8bc34a", lime: "#cddc39",
-  yellow: "#ffeb3b", amber: "#ffc107", orange: "#ff9800", deep_orange: "#ff5722",
-  brown: "#795548", grey: "#9e9e9e", blue_grey: "#607d8b",
-};
-
-// ============================================================================
-// UTILITY FUNCTIONS
-// ============================================================================
-
-function hexToRgb(hex) {
-  if (!hex) return "255, 179, 0";
-  if (hex.startsWith("rgb")) {
-    const match = hex.match(/\d+/g);
-    return match ? match.slice(0, 3).join(", ") : "255, 179, 0";
-  }
-  const result = /^#?([a-f\d]{2})([a-f\d]{2})([a-f\d]{2})$/i.exec(hex);
-  return result
-    ? `${parseInt(result[1], 16)}, ${parseInt(result[2], 16)}, ${parseInt(result[3], 16)}`
-    : "255, 179, 0";
-}
-
-function getLabelColor(color) {
-  if (!color) return "#2196f3";
-  return LABEL_COLORS[color] || color;
-}
-
-// ============================================================================
-// BASE TILE COMPONENT
-// ============================================================================
-
-class CpBaseTile extends LitElement {
-  static get properties() {
-    return {
-      hass: { type: Object },
-      entityId: { type: String, attribute: "entity-id" },
-    };
-  }
-
-  static get styles() {
-    return css`
-      :host {
-        display: block;
-      }
-
-      .tile {
-        background: var(--tile-bg, rgba(255, 255, 255, 0.05));
-        border-radius: 12px;
-        padding: 12px 16px;
-        min-height: 56px;
-        height: auto;
-        width: 100%;
-        box-sizing: border-box;
-        display: flex;
-        flex-direction: row;
-        align-items: center;
-        gap: 12px;
-        cursor: pointer;
-        transition: background-color 0.2s ease, transform 0.1s ease;
-        position: relative;
-        overflow: hidden;
-      }
-
-      .tile:hover {
-        background: var(--tile-bg-hover, rgba(255, 255, 255, 0.08));
-      }
-
-      .tile:active {
-        transform: scale(0.98);
-      }
-
-      .tile.on {
-        background: var(--tile-color-bg, rgba(255, 179, 0, 0.2));
-      }
-
-      .tile.unavailable {
-        opacity: 0.5;
-      }
-
-      .tile-icon {
-        width: 40px;
-        height: 40px;
-        border-radius: 50%;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        background: var(--icon-bg, rgba(255, 255, 255, 0.1));
-        color: var(--icon-color, #9e9e9e);
-        flex-shrink: 0;
-      }
-
-      .tile.on .tile-icon {
-        background: var(--tile-color-bg, rgba(255, 179, 0, 0.3));
-        color: var(--tile-color, #ffb300);
-      }
-
-      .tile-icon ha-icon {
-        --mdc-icon-size: 20px;
-      }
-
-      .tile-info {
-        flex: 1;
-        min-width: 0;
-        overflow: hidden;
-        display: flex;
-        flex-direction: column;
-        justify-content: center;
-      }
-
-      .tile-name {
-        font-size: 14px;
-        font-weight: 500;
-        color: var(--primary-text-color, #fff);
-        white-space: normal;
-        display: -webkit-box;
-        -webkit-line-clamp: 2;
-        -webkit-box-orient: vertical;
-        overflow: hidden;
-        line-height: 1.3;
-        max-width: 100%;
-      }
-
-      .tile-state {
-        font-size: 12px;
-        color: var(--secondary-text-color, rgba(255, 255, 255, 0.7));
-        margin-top: 2px;
-      }
-    `;
-  }
-
-  get entity() {
-    return this.hass?.states?.[this.entityId];
-  }
-
-  get isOn() {
-    const state = this.entity?.state;
-    return ["on", "playing", "open", "unlocked", "heat", "cool", "heat_cool", "auto", "cleaning", "returning", "home"].includes(state);
-  }
-
-  get isUnavailable() {
-    return this.entity?.state === "unavailable" || !this.entity;
-  }
-
-  get stateDisplay() {
-    if (this.isUnavailable) return "Unavailable";
-    try {
-      return this.hass.formatEntityState(this.entity);
-    } catch {
-      return this.entity?.state || "Unknown";
-    }
-  }
-
-  get icon() {
-    const domain = this.entityId?.split(".")[0];
-    return this.entity?.attributes?.icon || DOMAIN_ICONS[domain] || "mdi:help-circle";
-  }
-
-  get tileColor() {
-    const domain = this.entityId?.split(".")[0];
-
-    // For RGB lights, use actual color
-    if (domain === "light" && this.isOn) {
-      const rgb = this.entity?.attributes?.rgb_color;
-      if (rgb) {
-        return `rgb(${rgb[0]}, ${rgb[1]}, ${rgb[2]})`;
-      }
-    }
-
-    // Climate: use blue for cooling, orange for heating
-    if (domain === "climate" && this.isOn) {
-      const hvacAction = this.entity?.attributes?.hvac_action;
-      if (hvacAction === "cooling") return DOMAIN_COLORS.climate_cool;
-    }
-
-    // Lock: use green for locked, red for unlocked
-    if (domain === "lock") {
-      return this.entity?.state === "locked"
-        ? DOMAIN_COLORS.lock
-        : DOMAIN_COLORS.lock_unlocked;
-    }
-
-    return DOMAIN_COLORS[domain] || "#9E9E9E";
-  }
-
-  toggle() {
-    if (this.isUnavailable || !this.hass) return;
-    const domain = this.entityId?.split(".")[0];
-
-    if (domain === "scene" || domain === "script") {
-      this.hass.callService(domain, "turn_on", { entity_id: this.entityId });
-    } else if (domain === "button") {
-      this.hass.callService("button", "press", { entity_id: this.entityId });
-    } else if (domain === "lock") {
-      const service = this.entity?.state === "locked" ? "unlock" : "lock";
-      this.hass.callService("lock", service, { entity_id: this.entityId });
-    } else if (TOGGLEABLE_DOMAINS.includes(domain)) {
-      this.hass.callService("homeassistant", "toggle", { entity_id: this.entityId });
-    }
-  }
-
-  openMoreInfo() {
-    const event = new CustomEvent("hass-more-info", {
-      bubbles: true,
-      composed: true,
-      detail: { entityId: this.entityId },
-    });
-    this.dispatchEvent(event);
-  }
-
-  handleClick(e) {
-    e.stopPropagation();
-    this.openMoreInfo();
-  }
-
-  handleLongPress(e) {
-    e.preventDefault();
-    this.openMoreInfo();
-  }
-
-  connectedCallback() {
-    super.connectedCallback();
-    this._longPressTimer = null;
-
-    this._boundHandleTouchStart = this._handleTouchStart.bind(this);
-    this._boundHandleTouchEnd = this._handleTouchEnd.bind(this);
-
-    this.addEventListener("touchstart", this._boundHandleTouchStart);
-    this.addEventListener("touchend", this._boundHandleTouchEnd);
-    this.addEventListener("touchcancel", this._boundHandleTouchEnd);
-  }
-
-  disconnectedCallback() {
-    super.disconnectedCallback();
-
-    if (this._boundHandleTouchStart) {
-      this.removeEventListener("touchstart", this._boundHandleTouchStart);
-    }
-    if (this._boundHandleTouchEnd) {
-      this.removeEventListener("touchend", this._boundHandleTouchEnd);
-      this.removeEventListener("touchcancel", this._boundHandleTouchEnd);
-    }
-
-    if (this._longPressTimer) {
-      clearTimeout(this._longPressTimer);
-      this._longPressTimer = null;
-    }
-  }
-
-  _handleTouchStart(e) {
-    this._longPressTimer = setTimeout(() => {
-      this.openMoreInfo();
-      this._longPressTimer = null;
-    }, 500);
-  }
-
-  _handleTouchEnd(e) {
-    if (this._longPressTimer) {
-      clearTimeout(this._longPressTimer);
-      this._longPressTimer = null;
-    }
-  }
-
-  render() {
-    const entity = this.entity;
-    if (!entity && !this.entityId) return html``;
-
-    const color = this.tileColor;
-    const colorRgb = hexToRgb(color);
-
-    return html`
-      <div
-        class="tile ${this.isOn ? "on" : ""} ${this.isUnavailable ? "unavailable" : ""}"
-        style="--tile-color: ${color}; --tile-color-bg: rgba(${colorRgb}, 0.2); --icon-bg: rgba(${colorRgb}, 0.1);"
-        @click=${this.handleClick}
-        @contextmenu=${this.handleLongPress}
-      >
-        <div class="tile-icon">
-          <ha-icon icon=${this.icon}></ha-icon>
-        </div>
-        <div class="tile-info">
-          <div class="tile-name">${entity?.attributes?.friendly_name || this.entityId}</div>
-          <div class="tile-state">${this.stateDisplay}</div>
-        </div>
-      </div>
-    `;
-  }
-}
-
-customElements.define("cp-base-tile", CpBaseTile);
-
-// ============================================================================
-// SPECIALIZED TILE COMPONENTS
-// ============================================================================
-
-class CpLightTile extends CpBaseTile {
-  get stateDisplay() {
-    if (this.isUnavailable) return "Unavailable";
-    if (!this.isOn) return "Off";
-    const brightness = this.entity?.attributes?.brightness;
-    if (brightness) {
-      return `${Math.round((brightness / 255) * 100)}%`;
-    }
-    return "On";
-  }
-}
-customElements.define("cp-light-tile", CpLightTile);
-
-class CpClimateTile extends CpBaseTile {
-  get stateDisplay() {
-    if (this.isUnavailable) return "Unavailable";
-    const state = this.entity?.state;
-    if (state === "off") return "Off";
-    const currentTemp = this.entity?.attributes?.current_temperature;
-    const targetTemp = this.entity?.attributes?.temperature;
-    if (currentTemp && targetTemp) return `${currentTemp}°C → ${targetTemp}°C`;
-    if (currentTemp) return `${currentTemp}°C`;
-    return state;
-  }
-}
-customElements.define("cp-climate-tile", CpClimateTile);
-
-class CpCoverTile extends CpBaseTile {
-  get stateDisplay() {
-    if (this.isUnavailable) return "Unavailable";
-    const state = this.entity?.state;
-    const position = this.entity?.attributes?.current_position;
-    if (position !== undefined) {
-      if (position === 0) return "Closed";
-      if (position === 100) return "Open";
-      return `${position}%`;
-    }
-    if (state === "open") return "Open";
-    if (state === "closed") return "Closed";
-    if (state === "opening") return "Opening";
-    if (state === "closing") return "Closing";
-    return state;
-  }
-}
-customElements.define("cp-cover-tile", CpCoverTile);
-
-class CpFanTile extends CpBaseTile {
-  static get styles() {
-    return [
-      super.styles,
-      css`
-        .tile-icon.spinning ha-icon {
-          animation: spin 1s linear infinite;
-        }
-        @keyframes spin {
-          from { transform: rotate(0deg); }
-          to { transform: rotate(360deg); }
-        }
-      `,
-    ];
-  }
-
-  get stateDisplay() {
-    if (this.isUnavailable) return "Unavailable";
-    if (!this.isOn) return "Off";
-    const percentage = this.entity?.attributes?.percentage;
-    if (percentage) return `${percentage}%`;
-    return "On";
-  }
-
-  render() {
-    const entity = this.entity;
-    if (!entity && !this.entityId) return html``;
-
-    const color = this.tileColor;
-    const colorRgb = hexToRgb(color);
-
-    return html`
-      <div
-        class="tile ${this.isOn ? "on" : ""} ${this.isUnavailable ? "unavailable" : ""}"
-        style="--tile-color: ${color}; --tile-color-bg: rgba(${colorRgb}, 0.2); --icon-bg: rgba(${colorRgb}, 0.1);"
-        @click=${this.handleClick}
-        @contextmenu=${this.handleLongPress}
-      >
-        <div class="tile-icon ${this.isOn ? "spinning" : ""}">
-          <ha-icon icon=${this.icon}></ha-icon>
-        </div>
-        <div class="tile-info">
-          <div class="tile-name">${entity?.attributes?.friendly_name || this.entityId}</div>
-          <div class="tile-state">${this.stateDisplay}</div>
-        </div>
-      </div>
-    `;
-  }
-}
-customElements.define("cp-fan-tile", CpFanTile);
-
-class CpMediaPlayerTile extends CpBaseTile {
-  get stateDisplay() {
-    if (this.isUnavailable) return "Unavailable";
-    const state = this.entity?.state;
-    const mediaTitle = this.entity?.attributes?.media_title;
-    if (state === "playing" && mediaTitle) return mediaTitle;
-    if (state === "playing") return "Playing";
-    if (state === "paused") return "Paused";
-    if (state === "idle") return "Idle";
-    if (state === "off") return "Off";
-    return state;
-  }
-}
-customElements.define("cp-media-player-tile", CpMediaPlayerTile);
-
-class CpLockTile extends CpBaseTile {
-  get stateDisplay() {
-    if (this.isUnavailable) return "Unavailable";
-    const state = this.entity?.state;
-    if (state === "locked") return "Locked";
-    if (state === "unlocked") return "Unlocked";
-    if (state === "locking") return "Locking";
-    if (state === "unlocking") return "Unlocking";
-    return state;
-  }
-}
-customElements.define("cp-lock-tile", CpLockTile);
-
-class CpVacuumTile extends CpBaseTile {
-  get stateDisplay() {
-    if (this.isUnavailable) return "Unavailable";
-    const state = this.entity?.state;
-    if (state === "cleaning") return "Cleaning";
-    if (state === "docked") return "Docked";
-    if (state === "returning") return "Returning";
-    if (state === "paused") return "Paused";
-    if (state === "idle") return "Idle";
-    if (state === "error") return "Error";
-    return state;
-  }
-}
-customElements.define("cp-vacuum-tile", CpVacuumTile);
-
-class CpSceneTile extends CpBaseTile {
-  get stateDisplay() {
-    const lastChanged = this.entity?.last_changed;
-    if (!lastChanged) return "";
-
-    const date = new Date(lastChanged);
-    const now = new Date();
-    const diff = now - date;
-
-    const minutes = Math.floor(diff / 60000);
-    const hours = Math.floor(diff / 3600000);
-    const days = Math.floor(diff / 86400000);
-
-    if (minutes < 1) return "Just now";
-    if (minutes < 60) return `${minutes}m ago`;
-    if (hours < 24) return `${hours}h ago`;
-    return `${days}d ago`;
-  }
-
-  toggle() {
-    if (!this.hass) return;
-    this.hass.callService("scene", "turn_on", { entity_id: this.entityId });
-  }
-}
-customElements.define("cp-scene-tile", CpSceneTile);
-
-class CpSwitchTile extends CpBaseTile {}
-customElements.define("cp-switch-tile", CpSwitchTile);
-
-class CpSensorTile extends CpBaseTile {
-  get stateDisplay() {
-    if (this.isUnavailable) return "Unavailable";
-    const state = this.entity?.state;
-    const unit = this.entity?.attributes?.unit_of_measurement;
-    return unit ? `${state} ${unit}` : state;
-  }
-
-  toggle() {
-    this.openMoreInfo();
-  }
-}
-customElements.define("cp-sensor-tile", CpSensorTile);
-
-class CpBinarySensorTile extends CpBaseTile {
-  get stateDisplay() {
-    if (this.isUnavailable) return "Unavailable";
-    const state = this.entity?.state;
-    const deviceClass = this.entity?.attributes?.device_class;
-
-    if (deviceClass === "door") return state === "on" ? "Open" : "Closed";
-    if (deviceClass === "window") return state === "on" ? "Open" : "Closed";
-    if (deviceClass === "motion") return state === "on" ? "Detected" : "Clear";
-    if (deviceClass === "occupancy") return state === "on" ? "Occupied" : "Clear";
-
-    return state === "on" ? "On" : "Off";
-  }
-
-  toggle() {
-    this.openMoreInfo();
-  }
-}
-customElements.define("cp-binary-sensor-tile", CpBinarySensorTile);
-
-class CpButtonTile extends CpBaseTile {
-  get stateDisplay() {
-    return "";
-  }
-
-  toggle() {
-    if (!this.hass) return;
-    this.hass.callService("button", "press", { entity_id: this.entityId });
-  }
-}
-customElements.define("cp-button-tile", CpButtonTile);
-
-class CpScriptTile extends CpSceneTile {
-  toggle() {
-    if (!this.hass) return;
-    this.hass.callService("script", "turn_on", { entity_id: this.entityId });
-  }
-}
-customElements.define("cp-script-tile", CpScriptTile);
-
-class CpAutomationTile extends CpSceneTile {
-  get stateDisplay() {
-    if (this.isUnavailable) return "Unavailable";
-    return this.entity?.state === "on" ? "Enabled" : "Disabled";
-  }
-}
-customElements.define("cp-automation-tile", CpAutomationTile);
-
-class CpHumidifierTile extends CpBaseTile {
-  get stateDisplay() {
-    if (this.isUnavailable) return "Unavailable";
-    if (!this.isOn) return "Off";
-    const humidity = this.entity?.attributes?.humidity;
-    if (humidity) return `${humidity}%`;
-    return "On";
-  }
-}
-customElements.define("cp-humidifier-tile", CpHumidifierTile);
-
-// ============================================================================
-// DOMAIN SECTION COMPONENT
-// ============================================================================
-
-class CpDomainSection extends LitElement {
-  static get properties() {
-    return {
-      hass: { type: Object },
-      domain: { type: String },
-      entities: { type: Array },
-      expanded: { type: Boolean },
-    };
-  }
-
-  constructor() {
-    super();
-    this.expanded = true;
-  }
-
-  static get styles() {
-    return css`
-      :host {
-        display: block;
-        margin-bottom: 16px;
-      }
-
-      .section-header {
-        display: flex;
-        align-items: center;
-        padding: 8px 4px;
-        cursor: pointer;
-        user-select: none;
-      }
-
-      .section-header:hover {
-        background: rgba(255, 255, 255, 0.05);
-        border-radius: 8px;
-      }
-
-      .section-icon {
-        width: 24px;
-        height: 24px;
-        margin-right: 8px;
-        color: var(--secondary-text-color);
-      }
-
-      .section-icon ha-icon {
-        --mdc-icon-size: 20px;
-      }
-
-      .section-title {
-        flex: 1;
-        font-size: 14px;
-        font-weight: 500;
-        color: var(--primary-text-color);
-      }
-
-      .section-arrow {
-        color: var(--secondary-text-color, rgba(255, 255, 255, 0.7));
-        transition: transform 0.2s ease;
-      }
-
-      .section-arrow.collapsed {
-        transform: rotate(-90deg);
-      }
-
-      .section-arrow ha-icon {
-        --mdc-icon-size: 20px;
-      }
-
-      .tiles-grid {
-        display: grid;
-        grid-template-columns: repeat(2, minmax(0, 1fr));
-        gap: 8px;
-        padding-top: 8px;
-      }
-
-      @media (min-width: 600px) {
-        .tiles-grid {
-          grid-template-columns: repeat(3, minmax(0, 1fr));
-        }
-      }
-
-      @media (min-width: 1024px) {
-        .tiles-grid {
-          grid-template-columns: repeat(4, minmax(0, 1fr));
-        }
-      }
-
-      .tiles-grid.collapsed {
-        display: none;
-      }
-    `;
-  }
-
-  _getDomainLabel(domain) {
-    const lang = this.hass?.language || "en";
-    const t = TRANSLATIONS[lang] || TRANSLATIONS.en;
-    return t[domain] || domain;
-  }
-
-  toggleExpanded() {
-    this.expanded = !this.expanded;
-  }
-
-  renderTile(entityId) {
-    const domain = entityId.split(".")[0];
-
-    switch (domain) {
-      case "light":
-        return html`<cp-light-tile .hass=${this.hass} entity-id=${entityId}></cp-light-tile>`;
-      case "climate":
-        return html`<cp-climate-tile .hass=${this.hass} entity-id=${entityId}></cp-climate-tile>`;
-      case "cover":
-        return html`<cp-cover-tile .hass=${this.hass} entity-id=${entityId}></cp-cover-tile>`;
-      case "fan":
-        return html`<cp-fan-tile .hass=${this.hass} entity-id=${entityId}></cp-fan-tile>`;
-      case "media_player":
-        return html`<cp-media-player-tile .hass=${this.hass} entity-id=${entityId}></cp-media-player-tile>`;
-      case "lock":
-        return html`<cp-lock-tile .hass=${this.hass} entity-id=${entityId}></cp-lock-tile>`;
-      case "vacuum":
-        return html`<cp-vacuum-tile .hass=${this.hass} entity-id=${entityId}></cp-vacuum-tile>`;
-      case "scene":
-        return html`<cp-scene-tile .hass=${this.hass} entity-id=${entityId}></cp-scene-tile>`;
-      case "script":
-        return html`<cp-script-tile .hass=${this.hass} entity-id=${entityId}></cp-script-tile>`;
-      case "automation":
-        return html`<cp-automation-tile .hass=${this.hass} entity-id=${entityId}></cp-automation-tile>`;
-      case "switch":
-      case "input_boolean":
-        return html`<cp-switch-tile .hass=${this.hass} entity-id=${entityId}></cp-switch-tile>`;
-      case "sensor":
-        return html`<cp-sensor-tile .hass=${this.hass} entity-id=${entityId}></cp-sensor-tile>`;
-      case "binary_sensor":
-        return html`<cp-binary-sensor-tile .hass=${this.hass} entity-id=${entityId}></cp-binary-sensor-tile>`;
-      case "button":
-        return html`<cp-button-tile .hass=${this.hass} entity-id=${entityId}></cp-button-tile>`;
-      case "humidifier":
-        return html`<cp-humidifier-tile .hass=${this.hass} entity-id=${entityId}></cp-humidifier-tile>`;
-      default:
-        return html`<cp-base-tile .hass=${this.hass} entity-id=${entityId}></cp-base-tile>`;
-    }
-  }
-
-  render() {
-    const icon = DOMAIN_ICONS[this.domain] || "mdi:help-circle";
-    const label = this._getDomainLabel(this.domain);
-
-    return html`
-      <div class="section-header" @click=${this.toggleExpanded}>
-        <div class="section-icon">
-          <ha-icon icon=${icon}></ha-icon>
-        </div>
-        <div class="section-title">${label}</div>
-        <div class="section-arrow ${this.expanded ? "" : "collapsed"}">
-          <ha-icon icon="mdi:chevron-down"></ha-icon>
-        </div>
-      </div>
-      <div class="tiles-grid ${this.expanded ? "" : "collapsed"}">
-        ${this.entities?.map((entityId) => this.renderTile(entityId))}
-      </div>
-    `;
-  }
-}
-
-customElements.define("cp-domain-section", CpDomainSection);
-
-// ============================================================================
-// DOMAIN TABS COMPONENT
-// ============================================================================
-
-class CpDomainTabs extends LitElement {
-  static get properties() {
-    return {
-      hass: { type: Object },
-      domains: { type: Array },
-      selectedDomain: { type: String },
-    };
-  }
-
-  static get styles() {
-    return css`
-      :host { display: block; }
-
-      .tabs-container {
-        display: flex;
-        gap: 8px;
-        overflow-x: auto;
-        padding: 8px 0;
-        scrollbar-width: none;
-      }
-      .tabs-container::-webkit-scrollbar { display: none; }
-
-      .domain-tab {
-        display: flex;
-        align-items: center;
-        gap: 6px;
-        padding: 8px 16px;
-        background: rgba(255, 255, 255, 0.05);
-        border-radius: 20px;
-        cursor: pointer;
-        white-space: nowrap;
-        transition: all 0.2s;
-        border: none;
-        color: var(--primary-text-color);
-        font-size: 13px;
-      }
-
-      .domain-tab:hover {
-        background: rgba(255, 255, 255, 0.1);
-      }
-
-      .domain-tab.active {
-        background: var(--primary-color);
-        color: var(--text-primary-color-on-primary, #fff);
-      }
-
-      .tab-icon { --mdc-icon-size: 18px; }
-      .tab-count {
-        font-size: 11px;
-        background: rgba(0,0,0,0.2);
-        padding: 2px 6px;
-        border-radius: 10px;
-      }
-    `;
-  }
-
-  _t(key) {
-    const lang = this.hass?.language || "en";
-    const t = TRANSLATIONS[lang] || TRANSLATIONS.en;
-    return t[key] || key;
-  }
-
-  _handleTabClick(domain) {
-    this.dispatchEvent(new CustomEvent('domain-tab-selected', {
-      bubbles: true, composed: true,
-      detail: { domain }
-    }));
-  }
-
-  _getIcon(domain) {
-    if (domain === 'all') return 'mdi:view-grid';
-    return DOMAIN_ICONS[domain] || 'mdi:help';
-  }
-
-  _getLabel(domain) {
-    if (domain === 'all') return this._t('all');
-    return this._t(domain) || domain;
-  }
-
-  render() {
-    return html`
-      <div class="tabs-container">
-        ${this.domains?.map(d => html`
-          <button class="domain-tab ${d.domain === this.selectedDomain ? 'active' : ''}"
-                  @click=${() => this._handleTabClick(d.domain)}>
-            <ha-icon class="tab-icon" icon=${this._getIcon(d.domain)}></ha-icon>
-            <span>${this._getLabel(d.domain)}</span>
-            <span class="tab-count">${d.count}</span>
-          </button>
-        `)}
-      </div>
-    `;
-  }
-}
-
-customElements.define("cp-domain-tabs", CpDomainTabs);
+//
+// This module is the panel shell. Entity tiles and the labels tab live in
+// separate chunks that are imported on first use.
+
+import {
+  LitElement,
+  html,
+  css,
+  DOMAIN_COLORS,
+  DOMAIN_ICONS,
+  SUMMARY_DOMAINS,
+  DOMAIN_ORDER,
+  ACTIVE_STATES,
+  TRANSLATIONS,
+  hexToRgb,
+  summaryActiveCount,
+  summaryDetails,
+} from "./ha_control_panel_shared.js";
+
+// Entities requested per page from area/label entity listings
+const ENTITY_PAGE_SIZE = 200;
+// Search: wait for typing to pause, then fetch results page by page (the
+// server caps a page at 100) up to SEARCH_MAX_RESULTS
+const SEARCH_DEBOUNCE_MS = 250;
+const SEARCH_PAGE_SIZE = 100;
+const SEARCH_MAX_RESULTS = 1000;
 
 // ============================================================================
-// SEARCH BAR COMPONENT
+// LAZY CHUNKS
 // ============================================================================
 
-class CpSearchBar extends LitElement {
-  static get properties() {
-    return {
-      value: { type: String },
-      placeholder: { type: String },
-    };
-  }
-
-  static get styles() {
-    return css`
-      :host { display: block; margin-bottom: 16px; }
-
-      .search-container {
-        display: flex;
-        align-items: center;
-        background: var(--card-background-color, rgba(255,255,255,0.05));
-        border-radius: 28px;
-        padding: 0 16px;
-        height: 48px;
-        border: 1px solid var(--divider-color, rgba(255,255,255,0.1));
-      }
-
-      .search-container:focus-within {
-        border-color: var(--primary-color);
-      }
-
-      .search-icon {
-        color: var(--secondary-text-color);
-        --mdc-icon-size: 20px;
-        margin-right: 12px;
-      }
-
-      input {
-        flex: 1;
-        border: none;
-        background: transparent;
-        font-size: 14px;
-        color: var(--primary-text-color);
-        outline: none;
-      }
-
-      input::placeholder {
-        color: var(--secondary-text-color);
-      }
-
-      .clear-btn {
-        background: none;
-        border: none;
-        color: var(--secondary-text-color);
-        cursor: pointer;
-        padding: 4px;
-        display: flex;
-        --mdc-icon-size: 18px;
-      }
-
-      .clear-btn:hover {
-        color: var(--primary-text-color);
-      }
-    `;
-  }
-
-  _handleInput(e) {
-    this.dispatchEvent(new CustomEvent('search-changed', {
-      bubbles: true, composed: true,
-      detail: { value: e.target.value }
-    }));
-  }
+const CHUNK_FILES = {
+  tiles: "ha_control_panel_tiles.js",
+  labels: "ha_control_panel_labels.js",
+};
 
-  _handleClear() {
-    this.dispatchEvent(new CustomEvent('search-changed', {
-      bubbles: true, composed: true,
-      detail: { value: '' }
-    }));
-  }
+const chunkLoads = {};
 
-  render() {
-    return html`
-      <div class="search-container">
-        <ha-icon class="search-icon" icon="mdi:magnify"></ha-icon>
-        <input type="text"
-               .value=${this.value || ''}
-               placeholder=${this.placeholder || 'Search...'}
-               @input=${this._handleInput}>
-        ${this.value ? html`
-          <button class="clear-btn" @click=${this._handleClear}>
-            <ha-icon icon="mdi:close"></ha-icon>
-          </button>
-        ` : ''}
-      </div>
-    `;
+function loadChunk(name, chunkUrls) {
+  if (!chunkLoads[name]) {
+    // Prefer the content-hashed URL from the panel config
+    const file = CHUNK_FILES[name];
+    const url = chunkUrls?.[file] || new URL(file, import.meta.url).href;
+    chunkLoads[name] = import(url).catch((err) => {
+      delete chunkLoads[name];
+      throw err;
+    });
   }
+  return chunkLoads[name];
 }
 
-customElements.define("cp-search-bar", CpSearchBar);
 
 // ============================================================================
 // SUMMARY CARD COMPONENT
@@ -1275,6 +211,8 @@ class CpAreaCard extends LitElement {
       hass: { type: Object },
       area: { type: Object },
       areaEntities: { type: Object },
+      // Live summary pushed by the server, when subscribed
+      summary: { type: Object },
     };
   }
 
@@ -1371,7 +309,12 @@ class CpAreaCard extends LitElement {
     const icon = this.area.icon || "mdi:home";
     const name = this.area.name || this.area.id;
     const total = this.area.entity_count || 0;
-    const activeCount = this._getActiveCount();
+    const activeCount = this.summary
+      ? summaryActiveCount(this.summary)
+      : this._getActiveCount();
+    const details = this.summary
+      ? summaryDetails(this.summary, (key) => this._t(key))
+      : "";
 
     return html`
       <div class="area-card" @click=${this.handleClick}>
@@ -1379,7 +322,7 @@ class CpAreaCard extends LitElement {
           <ha-icon icon=${icon}></ha-icon>
         </div>
         <div class="area-name">${name}</div>
-        <div class="area-count">${total} ${this._t('entities')} · ${activeCount} ${this._t('on')}</div>
+        <div class="area-count">${total} ${this._t('entities')} · ${activeCount} ${this._t('on')}${details}</div>
       </div>
     `;
   }
@@ -1387,135 +330,6 @@ class CpAreaCard extends LitElement {
 
 customElements.define("cp-area-card", CpAreaCard);
 
-// ============================================================================
-// LABEL CARD COMPONENT
-// ============================================================================
-
-class CpLabelCard extends LitElement {
-  static get properties() {
-    return {
-      hass: { type: Object },
-      label: { type: Object },
-      labelEntities: { type: Object },
-    };
-  }
-
-  static get styles() {
-    return css`
-      :host {
-        display: block;
-      }
-
-      .label-card {
-        background: var(--card-background-color, rgba(255, 255, 255, 0.05));
-        border-radius: 12px;
-        padding: 16px;
-        cursor: pointer;
-        transition: background 0.2s ease, transform 0.1s ease;
-        display: flex;
-        flex-direction: column;
-        align-items: center;
-        text-align: center;
-        min-height: 100px;
-      }
-
-      .label-card:hover {
-        filter: brightness(1.1);
-      }
-
-      .label-card:active {
-        transform: scale(0.98);
-      }
-
-      .label-icon {
-        width: 48px;
-        height: 48px;
-        border-radius: 50%;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        background: var(--label-color-bg, rgba(33, 150, 243, 0.2));
-        color: var(--label-color, #2196f3);
-        margin-bottom: 12px;
-      }
-
-      .label-icon ha-icon {
-        --mdc-icon-size: 24px;
-      }
-
-      .label-name {
-        font-size: 14px;
-        font-weight: 500;
-        color: var(--primary-text-color);
-        margin-bottom: 4px;
-        word-break: break-word;
-      }
-
-      .label-count {
-        font-size: 12px;
-        color: var(--secondary-text-color);
-      }
-    `;
-  }
-
-  _t(key) {
-    const lang = this.hass?.language || "en";
-    const t = TRANSLATIONS[lang] || TRANSLATIONS.en;
-    return t[key] || key;
-  }
-
-  _getAllEntityIds() {
-    if (!this.labelEntities) return [];
-    const ids = [];
-    for (const entityIds of Object.values(this.labelEntities)) {
-      ids.push(...entityIds);
-    }
-    return ids;
-  }
-
-  _getActiveCount() {
-    if (!this.hass) return 0;
-    return this._getAllEntityIds().filter((entityId) => {
-      const state = this.hass.states[entityId]?.state;
-      return ACTIVE_STATES.includes(state);
-    }).length;
-  }
-
-  _handleClick() {
-    this.dispatchEvent(
-      new CustomEvent("label-selected", {
-        bubbles: true,
-        composed: true,
-        detail: { label: this.label },
-      })
-    );
-  }
-
-  render() {
-    const icon = this.label.icon || "mdi:label";
-    const color = getLabelColor(this.label.color);
-    const colorRgb = hexToRgb(color);
-    const total = this.label.entity_count || 0;
-    const activeCount = this._getActiveCount();
-
-    return html`
-      <div
-        class="label-card"
-        style="--label-color: ${color}; --label-color-bg: rgba(${colorRgb}, 0.2);"
-        @click=${this._handleClick}
-      >
-        <div class="label-icon">
-          <ha-icon icon=${icon}></ha-icon>
-        </div>
-        <div class="label-name">${this.label.name}</div>
-        <div class="label-count">${total} ${this._t('entities')} · ${activeCount} ${this._t('on')}</div>
-      </div>
-    `;
-  }
-}
-
-customElements.define("cp-label-card", CpLabelCard);
-
 // ============================================================================
 // MAIN PANEL COMPONENT
 // ============================================================================
@@ -1547,6 +361,10 @@ class HaControlPanel extends LitElement {
       _loadError: { type: String },
       // Search
       _searchQuery: { type: String },
+      // Server search results: { query, ids: Set | null } (null: failed)
+      _searchMatches: { type: Object },
+      // Live area/label summaries: { areas: {id: summary}, labels: {...} }
+      _summaries: { type: Object },
     };
   }
 
@@ -1566,8 +384,17 @@ class HaControlPanel extends LitElement {
     this._loading = true;
     this._loadError = null;
     this._searchQuery = "";
+    this._searchMatches = null;
+    this._searchTimer = null;
+    this._summaries = { areas: {}, labels: {} };
+    this._unsubSummaries = null;
+    this._summariesFailed = false;
     this._areasLoading = false;
     this._labelsLoading = false;
+    // Entity listings: "area:<id>"/"label:<id>" keys of complete scopes
+    // and in-flight loads
+    this._loadedScopes = new Set();
+    this._entityLoads = {};
     // Memoization cache
     this._cachedDomainCounts = null;
     this._lastHassStatesRef = null;
@@ -1814,9 +641,43 @@ class HaControlPanel extends LitElement {
     super.connectedCallback();
   }
 
+  disconnectedCallback() {
+    super.disconnectedCallback();
+    clearTimeout(this._searchTimer);
+    if (this._unsubSummaries) {
+      this._unsubSummaries.then((unsub) => unsub()).catch(() => {});
+      this._unsubSummaries = null;
+    }
+  }
+
+  _subscribeSummaries() {
+    this._unsubSummaries = this.hass.connection.subscribeMessage(
+      (message) => {
+        // Full events (first one, and after a permission change) replace
+        // everything so revoked scopes disappear; the others carry only
+        // the changed summaries
+        this._summaries = message.full
+          ? { areas: message.areas, labels: message.labels }
+          : {
+              areas: { ...this._summaries.areas, ...message.areas },
+              labels: { ...this._summaries.labels, ...message.labels },
+            };
+      },
+      { type: "control_panel/subscribe_summaries" }
+    );
+    this._unsubSummaries.catch((err) => {
+      // Older server: cards fall back to counting states locally
+      console.warn("Control panel: live summaries unavailable", err);
+      this._summariesFailed = true;
+    });
+  }
+
   updated(changedProperties) {
     super.updated(changedProperties);
     if (changedProperties.has("hass") && this.hass) {
+      if (!this._unsubSummaries && !this._summariesFailed && this.isConnected) {
+        this._subscribeSummaries();
+      }
       if (this._areas.length === 0 && !this._areasLoading) {
         this._areasLoading = true;
         this._loadAreas();
@@ -1846,7 +707,7 @@ class HaControlPanel extends LitElement {
 
       // Load all area entities in parallel
       const loadPromises = this._areas.map((area) =>
-        this._loadAreaEntitiesQuiet(area.id)
+        this._loadAreaEntities(area.id)
       );
       await Promise.all(loadPromises);
 
@@ -1878,7 +739,7 @@ class HaControlPanel extends LitElement {
 
       // Load all label entities in parallel
       const loadPromises = this._labels.map((label) =>
-        this._loadLabelEntitiesQuiet(label.id)
+        this._loadLabelEntities(label.id)
       );
       await Promise.all(loadPromises);
 
@@ -1898,67 +759,71 @@ class HaControlPanel extends LitElement {
     this._loading = this._areasLoading || this._labelsLoading;
   }
 
-  async _loadAreaEntitiesQuiet(areaId) {
-    if (this._areaEntities[areaId]) return;
-    try {
-      const result = await this.hass.callWS({
-        type: "area_control/get_area_entities",
-        area_id: areaId,
-      });
-      this._areaEntities = {
-        ...this._areaEntities,
-        [areaId]: result.entities || {},
-      };
-    } catch (err) {
-      console.error("Failed to load area entities:", err);
-    }
-  }
-
-  async _loadLabelEntitiesQuiet(labelId) {
-    if (this._labelEntities[labelId]) return;
-    try {
+  async _fetchEntityPages(type, params, onPage) {
+    // Stream a scope's entities page by page so the first screen renders
+    // before large areas/labels are fully loaded
+    let entities = {};
+    let cursor = null;
+    do {
       const result = await this.hass.callWS({
-        type: "label_control/get_label_entities",
-        label_id: labelId,
+        type,
+        ...params,
+        limit: ENTITY_PAGE_SIZE,
+        ...(cursor ? { cursor } : {}),
       });
-      this._labelEntities = {
-        ...this._labelEntities,
-        [labelId]: result.entities || {},
-      };
-    } catch (err) {
-      console.error("Failed to load label entities:", err);
+      const merged = { ...entities };
+      for (const [domain, ids] of Object.entries(result.entities || {})) {
+        merged[domain] = [...(merged[domain] || []), ...ids];
+      }
+      entities = merged;
+      onPage(entities);
+      cursor = result.next_cursor;
+    } while (cursor);
+  }
+
+  _loadScopeEntities(kind, id) {
+    // One load per scope: callers share the in-flight promise, and a scope
+    // counts as loaded only once its last page has arrived
+    const key = `${kind}:${id}`;
+    if (this._loadedScopes.has(key)) return Promise.resolve();
+    if (!this._entityLoads[key]) {
+      const prop = kind === "area" ? "_areaEntities" : "_labelEntities";
+      this._entityLoads[key] = this._fetchEntityPages(
+        `${kind}_control/get_${kind}_entities`,
+        { [`${kind}_id`]: id },
+        (entities) => {
+          this[prop] = { ...this[prop], [id]: entities };
+          this._cachedDomainCounts = null;
+        }
+      )
+        .then(() => {
+          this._loadedScopes.add(key);
+        })
+        .catch((err) => {
+          // Drop the partial list so that the next load starts over
+          const { [id]: _partial, ...rest } = this[prop];
+          this[prop] = rest;
+          this._cachedDomainCounts = null;
+          throw err;
+        })
+        .finally(() => {
+          delete this._entityLoads[key];
+        });
     }
+    return this._entityLoads[key];
   }
 
   async _loadAreaEntities(areaId) {
-    if (this._areaEntities[areaId]) return;
     try {
-      const result = await this.hass.callWS({
-        type: "area_control/get_area_entities",
-        area_id: areaId,
-      });
-      this._areaEntities = {
-        ...this._areaEntities,
-        [areaId]: result.entities || {},
-      };
-      this.requestUpdate();
+      await this._loadScopeEntities("area", areaId);
     } catch (err) {
       console.error("Failed to load area entities:", err);
     }
   }
 
   async _loadLabelEntities(labelId) {
-    if (this._labelEntities[labelId]) return;
     try {
-      const result = await this.hass.callWS({
-        type: "label_control/get_label_entities",
-        label_id: labelId,
-      });
-      this._labelEntities = {
-        ...this._labelEntities,
-        [labelId]: result.entities || {},
-      };
-      this.requestUpdate();
+      await this._loadScopeEntities("label", labelId);
     } catch (err) {
       console.error("Failed to load label entities:", err);
     }
@@ -1994,6 +859,11 @@ class HaControlPanel extends LitElement {
 
   _filterEntities(entities, query) {
     if (!query) return entities;
+    const matches = this._searchMatches;
+    if (matches?.query === query && matches.ids) {
+      return entities.filter(entityId => matches.ids.has(entityId));
+    }
+    // Until the server has answered (or if search failed), match locally
     const q = query.toLowerCase();
     return entities.filter(entityId => {
       const entity = this.hass?.states?.[entityId];
@@ -2009,6 +879,7 @@ class HaControlPanel extends LitElement {
     this._labels = [];
     this._areaEntities = {};
     this._labelEntities = {};
+    this._loadedScopes = new Set();
     this._loadError = null;
     this._loading = true;
     this._areasLoading = true;
@@ -2017,7 +888,17 @@ class HaControlPanel extends LitElement {
     this._loadLabels();
   }
 
+  _ensureChunk(name) {
+    // Elements upgrade in place once their chunk has been defined
+    loadChunk(name, this.panel?.config?.chunk_urls).catch((err) => {
+      console.error(`Failed to load control panel module "${name}":`, err);
+    });
+  }
+
   _handleTabChange(tab) {
+    if (tab === "labels") {
+      this._ensureChunk("labels");
+    }
     this.activeTab = tab;
     this._view = "home";
     this._selectedAreaId = null;
@@ -2032,6 +913,7 @@ class HaControlPanel extends LitElement {
 
   _handleAreaSelected(e) {
     const areaId = e.detail.areaId;
+    this._ensureChunk("tiles");
     this._selectedAreaId = areaId;
     this._view = "area";
     this._searchQuery = "";
@@ -2041,6 +923,7 @@ class HaControlPanel extends LitElement {
 
   _handleLabelSelected(e) {
     const label = e.detail.label;
+    this._ensureChunk("tiles");
     this._selectedLabel = label;
     this._view = "label";
     this._searchQuery = "";
@@ -2050,6 +933,7 @@ class HaControlPanel extends LitElement {
 
   _handleDomainSelected(e) {
     const domain = e.detail.domain;
+    this._ensureChunk("tiles");
     this._selectedDomain = domain;
     this._view = "domain";
   }
@@ -2074,6 +958,41 @@ class HaControlPanel extends LitElement {
 
   _handleSearchChanged(e) {
     this._searchQuery = e.detail.value;
+    clearTimeout(this._searchTimer);
+    const query = this._searchQuery.trim();
+    if (!query) return;
+    this._searchTimer = setTimeout(
+      () => this._runSearch(this._searchQuery),
+      SEARCH_DEBOUNCE_MS
+    );
+  }
+
+  async _runSearch(query) {
+    // Results are restricted to the user's permitted entities by the server;
+    // the views intersect them with the selected area or label
+    const ids = new Set();
+    try {
+      let offset = 0;
+      do {
+        const result = await this.hass.callWS({
+          type: "control_panel/search",
+          query: query.trim().slice(0, 100),
+          limit: SEARCH_PAGE_SIZE,
+          offset,
+        });
+        if (this._searchQuery !== query) return;
+        for (const match of result.results) {
+          ids.add(match.entity_id);
+        }
+        offset = result.next_offset;
+      } while (offset != null && offset < SEARCH_MAX_RESULTS);
+      this._searchMatches = { query, ids };
+    } catch (err) {
+      console.warn("Control panel: search failed, filtering locally", err);
+      if (this._searchQuery === query) {
+        this._searchMatches = { query, ids: null };
+      }
+    }
   }
 
   _toggleSidebar() {
@@ -2225,6 +1144,7 @@ class HaControlPanel extends LitElement {
                       .hass=${this.hass}
                       .area=${area}
                       .areaEntities=${this._areaEntities[area.id] || {}}
+                      .summary=${this._summaries.areas[area.id]}
                       @area-selected=${this._handleAreaSelected}
                     ></cp-area-card>
                   `
@@ -2269,6 +1189,7 @@ class HaControlPanel extends LitElement {
                       .hass=${this.hass}
                       .label=${label}
                       .labelEntities=${this._labelEntities[label.id] || {}}
+                      .summary=${this._summaries.labels[label.id]}
                       @label-selected=${this._handleLabelSelected}
                     ></cp-label-card>
                   `
@@ -2337,6 +1258,7 @@ class HaControlPanel extends LitElement {
                 .hass=${this.hass}
                 .domain=${d.domain}
                 .entities=${d.entities}
+                .scope=${{ kind: "area", id: this._selectedAreaId }}
               ></cp-domain-section>
             `)}
       `;
@@ -2364,6 +1286,7 @@ class HaControlPanel extends LitElement {
               .hass=${this.hass}
               .domain=${selectedDomain}
               .entities=${selectedEntities}
+              .scope=${{ kind: "area", id: this._selectedAreaId }}
             ></cp-domain-section>
           `}
     `;
@@ -2436,6 +1359,7 @@ class HaControlPanel extends LitElement {
                 .hass=${this.hass}
                 .domain=${d.domain}
                 .entities=${d.entities}
+                .scope=${{ kind: "label", id: this._selectedLabel?.id }}
               ></cp-domain-section>
             `)}
       `;
@@ -2463,6 +1387,7 @@ class HaControlPanel extends LitElement {
               .hass=${this.hass}
               .domain=${selectedDomain}
               .entities=${selectedEntities}
+              .scope=${{ kind: "label", id: this._selectedLabel?.id }}
             ></cp-domain-section>
           `}
     `;
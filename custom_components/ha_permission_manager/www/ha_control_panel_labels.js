@@ -0,0 +1,150 @@
+// Home Assistant Unified Control Panel - labels chunk
+// Label cards for the labels tab, loaded on first switch to that tab
+
+import {
+  LitElement,
+  html,
+  css,
+  ACTIVE_STATES,
+  TRANSLATIONS,
+  hexToRgb,
+  getLabelColor,
+  summaryActiveCount,
+  summaryDetails,
+} from "./ha_control_panel_shared.js";
+
+// ============================================================================
+// LABEL CARD COMPONENT
+// ============================================================================
+
+class CpLabelCard extends LitElement {
+  static get properties() {
+    return {
+      hass: { type: Object },
+      label: { type: Object },
+      labelEntities: { type: Object },
+      // Live summary pushed by the server, when subscribed
+      summary: { type: Object },
+    };
+  }
+
+  static get styles() {
+    return css`
+      :host {
+        display: block;
+      }
+
+      .label-card {
+        background: var(--card-background-color, rgba(255, 255, 255, 0.05));
+        border-radius: 12px;
+        padding: 16px;
+        cursor: pointer;
+        transition: background 0.2s ease, transform 0.1s ease;
+        display: flex;
+        flex-direction: column;
+        align-items: center;
+        text-align: center;
+        min-height: 100px;
+      }
+
+      .label-card:hover {
+        filter: brightness(1.1);
+      }
+
+      .label-card:active {
+        transform: scale(0.98);
+      }
+
+      .label-icon {
+        width: 48px;
+        height: 48px;
+        border-radius: 50%;
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        background: var(--label-color-bg, rgba(33, 150, 243, 0.2));
+        color: var(--label-color, #2196f3);
+        margin-bottom: 12px;
+      }
+
+      .label-icon ha-icon {
+        --mdc-icon-size: 24px;
+      }
+
+      .label-name {
+        font-size: 14px;
+        font-weight: 500;
+        color: var(--primary-text-color);
+        margin-bottom: 4px;
+        word-break: break-word;
+      }
+
+      .label-count {
+        font-size: 12px;
+        color: var(--secondary-text-color);
+      }
+    `;
+  }
+
+  _t(key) {
+    const lang = this.hass?.language || "en";
+    const t = TRANSLATIONS[lang] || TRANSLATIONS.en;
+    return t[key] || key;
+  }
+
+  _getAllEntityIds() {
+    if (!this.labelEntities) return [];
+    const ids = [];
+    for (const entityIds of Object.values(this.labelEntities)) {
+      ids.push(...entityIds);
+    }
+    return ids;
+  }
+
+  _getActiveCount() {
+    if (!this.hass) return 0;
+    return this._getAllEntityIds().filter((entityId) => {
+      const state = this.hass.states[entityId]?.state;
+      return ACTIVE_STATES.includes(state);
+    }).length;
+  }
+
+  _handleClick() {
+    this.dispatchEvent(
+      new CustomEvent("label-selected", {
+        bubbles: true,
+        composed: true,
+        detail: { label: this.label },
+      })
+    );
+  }
+
+  render() {
+    const icon = this.label.icon || "mdi:label";
+    const color = getLabelColor(this.label.color);
+    const colorRgb = hexToRgb(color);
+    const total = this.label.entity_count || 0;
+    const activeCount = this.summary
+      ? summaryActiveCount(this.summary)
+      : this._getActiveCount();
+    const details = this.summary
+      ? summaryDetails(this.summary, (key) => this._t(key))
+      : "";
+
+    return html`
+      <div
+        class="label-card"
+        style="--label-color: ${color}; --label-color-bg: rgba(${colorRgb}, 0.2);"
+        @click=${this._handleClick}
+      >
+        <div class="label-icon">
+          <ha-icon icon=${icon}></ha-icon>
+        </div>
+        <div class="label-name">${this.label.name}</div>
+        <div class="label-count">${total} ${this._t('entities')} · ${activeCount} ${this._t('on')}${details}</div>
+      </div>
+    `;
+  }
+}
+
+customElements.define("cp-label-card", CpLabelCard);
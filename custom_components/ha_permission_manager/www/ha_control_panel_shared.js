@@ -0,0 +1,277 @@
+// Home Assistant Unified Control Panel - shared module
+// Design tokens, translations and helpers used by the panel shell and its
+// lazily loaded chunks
+
+// Use jsDelivr CDN (faster than unpkg, with proper caching)
+export const { LitElement, html, css } = await import(
+  "https://cdn.jsdelivr.net/npm/lit@3.1.0/+esm"
+);
+
+// ============================================================================
+// DESIGN TOKENS - HA Native Style
+// ============================================================================
+
+export const DOMAIN_COLORS = {
+  light: "#FFB300",
+  switch: "#FFB300",
+  input_boolean: "#FFB300",
+  fan: "#009688",
+  climate: "#FF9800",
+  climate_cool: "#2196F3",
+  cover: "#9C27B0",
+  lock: "#4CAF50",
+  lock_unlocked: "#F44336",
+  vacuum: "#009688",
+  media_player: "#673AB7",
+  humidifier: "#00BCD4",
+  automation: "#2196F3",
+  script: "#2196F3",
+  scene: "#E91E63",
+  sensor: "#607D8B",
+  binary_sensor: "#607D8B",
+  button: "#FF9800",
+  person: "#4CAF50",
+  person_away: "#9E9E9E",
+  camera: "#607D8B",
+  alarm_control_panel: "#F44336",
+  update: "#4CAF50",
+  weather: "#03A9F4",
+  input_number: "#9C27B0",
+  input_select: "#9C27B0",
+  input_text: "#9C27B0",
+  number: "#9C27B0",
+  select: "#9C27B0",
+  text: "#9C27B0",
+  device_tracker: "#4CAF50",
+  calendar: "#FF9800",
+  todo: "#FF9800",
+  remote: "#673AB7",
+};
+
+export const DOMAIN_ICONS = {
+  light: "mdi:lightbulb",
+  switch: "mdi:toggle-switch",
+  input_boolean: "mdi:toggle-switch-outline",
+  fan: "mdi:fan",
+  climate: "mdi:thermostat",
+  cover: "mdi:window-shutter",
+  lock: "mdi:lock",
+  vacuum: "mdi:robot-vacuum",
+  media_player: "mdi:cast",
+  humidifier: "mdi:air-humidifier",
+  automation: "mdi:robot",
+  script: "mdi:script-text",
+  scene: "mdi:palette",
+  sensor: "mdi:eye",
+  binary_sensor: "mdi:checkbox-marked-circle",
+  button: "mdi:gesture-tap-button",
+  person: "mdi:account",
+  camera: "mdi:cctv",
+  alarm_control_panel: "mdi:shield-home",
+  update: "mdi:package-up",
+  weather: "mdi:weather-partly-cloudy",
+  input_number: "mdi:ray-vertex",
+  input_select: "mdi:form-dropdown",
+  input_text: "mdi:form-textbox",
+  number: "mdi:ray-vertex",
+  select: "mdi:form-dropdown",
+  text: "mdi:form-textbox",
+  device_tracker: "mdi:crosshairs-gps",
+  calendar: "mdi:calendar",
+  todo: "mdi:clipboard-list",
+  remote: "mdi:remote",
+};
+
+// Fixed 9 domains that always show in summary section
+export const SUMMARY_DOMAINS = [
+  "light",
+  "climate",
+  "cover",
+  "fan",
+  "media_player",
+  "lock",
+  "vacuum",
+  "switch",
+  "input_boolean",
+];
+
+// Domains that can be toggled
+export const TOGGLEABLE_DOMAINS = [
+  "light",
+  "switch",
+  "input_boolean",
+  "fan",
+  "climate",
+  "humidifier",
+  "automation",
+  "lock",
+  "vacuum",
+  "media_player",
+];
+
+// Service that turns a whole domain off in an area or label
+// (control_panel/area_action and label_action)
+export const SCOPE_OFF_SERVICES = {
+  light: "turn_off",
+  switch: "turn_off",
+  input_boolean: "turn_off",
+  fan: "turn_off",
+  climate: "turn_off",
+  humidifier: "turn_off",
+  media_player: "turn_off",
+  cover: "close_cover",
+};
+
+// Domain display order
+export const DOMAIN_ORDER = [
+  "light", "switch", "climate", "cover", "fan", "media_player",
+  "automation", "script", "scene", "button",
+  "sensor", "binary_sensor",
+  "vacuum", "lock", "camera",
+  "input_boolean", "input_number", "input_select", "input_text",
+  "number", "select", "text",
+  "person", "device_tracker",
+  "calendar", "todo",
+  "alarm_control_panel", "update",
+];
+
+// States considered "active" for counting purposes
+export const ACTIVE_STATES = ["on", "playing", "open", "unlocked", "heat", "cool", "heat_cool", "auto", "cleaning", "home"];
+
+// Translations
+export const TRANSLATIONS = {
+  en: {
+    title: "Control Panel",
+    areasTab: "Areas",
+    labelsTab: "Labels",
+    summary: "Summary",
+    areas: "Areas",
+    labels: "Labels",
+    noAreas: "No areas available",
+    noLabels: "No labels available",
+    noEntities: "No entities in this section",
+    entities: "entities",
+    loading: "Loading...",
+    on: "on",
+    off: "off",
+    allOff: "All off",
+    searchPlaceholder: "Search devices...",
+    all: "All",
+    retry: "Retry",
+    doorOpen: "door open",
+    doorsOpen: "doors open",
+    light: "Lights", switch: "Switches", climate: "Climate", cover: "Covers",
+    fan: "Fans", media_player: "Media", vacuum: "Vacuums", lock: "Locks",
+    humidifier: "Humidifiers", automation: "Automations", script: "Scripts",
+    scene: "Scenes", button: "Buttons", sensor: "Sensors",
+    binary_sensor: "Binary Sensors", input_boolean: "Input Boolean",
+    input_number: "Input Number", input_select: "Input Select",
+    input_text: "Input Text", alarm_control_panel: "Security",
+    camera: "Cameras", person: "Persons", device_tracker: "Trackers",
+  },
+  "zh-Hant": {
+    title: "控制面板",
+    areasTab: "分區",
+    labelsTab: "標籤",
+    summary: "摘要",
+    areas: "分區",
+    labels: "標籤",
+    noAreas: "沒有可用的分區",
+    noLabels: "沒有可用的標籤",
+    noEntities: "此區域沒有實體",
+    entities: "個實體",
+    loading: "載入中...",
+    on: "開啟",
+    off: "關閉",
+    allOff: "全部關閉",
+    searchPlaceholder: "搜尋裝置...",
+    all: "全部",
+    retry: "重試",
+    doorOpen: "扇門開啟",
+    doorsOpen: "扇門開啟",
+    light: "燈光", switch: "開關", climate: "溫控", cover: "窗簾",
+    fan: "風扇", media_player: "媒體播放器", vacuum: "掃地機", lock: "門鎖",
+    humidifier: "加濕器", automation: "自動化", script: "腳本",
+    scene: "場景", button: "按鈕", sensor: "感測器",
+    binary_sensor: "二元感測器", input_boolean: "輔助開關",
+    input_number: "輸入數字", input_select: "輸入選擇",
+    input_text: "輸入文字", alarm_control_panel: "保全",
+    camera: "攝影機", person: "人員", device_tracker: "追蹤器",
+  },
+  "zh-Hans": {
+    title: "控制面板",
+    areasTab: "分区",
+    labelsTab: "标签",
+    summary: "摘要",
+    areas: "分区",
+    labels: "标签",
+    noAreas: "没有可用的分区",
+    noLabels: "没有可用的标签",
+    noEntities: "此区域没有实体",
+    entities: "个实体",
+    loading: "加载中...",
+    on: "开启",
+    off: "关闭",
+    allOff: "全部关闭",
+    searchPlaceholder: "搜索设备...",
+    all: "全部",
+    retry: "重试",
+    doorOpen: "扇门开启",
+    doorsOpen: "扇门开启",
+    light: "灯光", switch: "开关", climate: "温控", cover: "窗帘",
+    fan: "风扇", media_player: "媒体播放器", vacuum: "扫地机", lock: "门锁",
+    humidifier: "加湿器", automation: "自动化", script: "脚本",
+    scene: "场景", button: "按钮", sensor: "传感器",
+    binary_sensor: "二元传感器", input_boolean: "辅助开关",
+    input_number: "输入数字", input_select: "输入选择",
+    input_text: "输入文字", alarm_control_panel: "安防",
+    camera: "摄像机", person: "人员", device_tracker: "追踪器",
+  },
+};
+
+// Label color mapping
+export const LABEL_COLORS = {
+  red: "#f44336", pink: "#e91e63", purple: "#9c27b0", deep_purple: "#673ab7",
+  indigo: "#3f51b5", blue: "#2196f3", light_blue: "#03a9f4", cyan: "#00bcd4",
+  teal: "#009688", green: "#4caf50", light_green: "#8bc34a", lime: "#cddc39",
+  yellow: "#ffeb3b", amber: "#ffc107", orange: "#ff9800", deep_orange: "#ff5722",
+  brown: "#795548", grey: "#9e9e9e", blue_grey: "#607d8b",
+};
+
+// ============================================================================
+// UTILITY FUNCTIONS
+// ============================================================================
+
+// Active count and status line of a live scope summary
+// (control_panel/subscribe_summaries)
+export function summaryActiveCount(summary) {
+  const on = Object.values(summary.on || {}).reduce((sum, n) => sum + n, 0);
+  return on + (summary.covers_open || 0);
+}
+
+export function summaryDetails(summary, t) {
+  const parts = [];
+  if (summary.doors_open) {
+    parts.push(`${summary.doors_open} ${t(summary.doors_open === 1 ? "doorOpen" : "doorsOpen")}`);
+  }
+  if (summary.temperature != null) parts.push(`${summary.temperature}°`);
+  if (summary.humidity != null) parts.push(`${summary.humidity}%`);
+  return parts.map((part) => ` · ${part}`).join("");
+}
+
+export function hexToRgb(hex) {
+  if (!hex) return "255, 179, 0";
+  if (hex.startsWith("rgb")) {
+    const match = hex.match(/\d+/g);
+    return match ? match.slice(0, 3).join(", ") : "255, 179, 0";
+  }
+  const result = /^#?([a-f\d]{2})([a-f\d]{2})([a-f\d]{2})$/i.exec(hex);
+  return result
+    ? `${parseInt(result[1], 16)}, ${parseInt(result[2], 16)}, ${parseInt(result[3], 16)}`
+    : "255, 179, 0";
+}
+
+export function getLabelColor(color) {
+  if (!color) return "#2196f3";
+  return LABEL_COLORS[color] || color;
+}
@@ -0,0 +1,941 @@
+// Home Assistant Unified Control Panel - entity tiles chunk
+// Domain-specific entity tiles, domain sections, domain tabs and search bar
+// Loaded on demand when an area, label or domain view is opened
+
+import {
+  LitElement,
+  html,
+  css,
+  DOMAIN_COLORS,
+  DOMAIN_ICONS,
+  SCOPE_OFF_SERVICES,
+  TOGGLEABLE_DOMAINS,
+  TRANSLATIONS,
+  hexToRgb,
+} from "./ha_control_panel_shared.js";
+
+// ============================================================================
+// BASE TILE COMPONENT
+// ============================================================================
+
+class CpBaseTile extends LitElement {
+  static get properties() {
+    return {
+      hass: { type: Object },
+      entityId: { type: String, attribute: "entity-id" },
+    };
+  }
+
+  static get styles() {
+    return css`
+      :host {
+        display: block;
+      }
+
+      .tile {
+        background: var(--tile-bg, rgba(255, 255, 255, 0.05));
+        border-radius: 12px;
+        padding: 12px 16px;
+        min-height: 56px;
+        height: auto;
+        width: 100%;
+        box-sizing: border-box;
+        display: flex;
+        flex-direction: row;
+        align-items: center;
+        gap: 12px;
+        cursor: pointer;
+        transition: background-color 0.2s ease, transform 0.1s ease;
+        position: relative;
+        overflow: hidden;
+      }
+
+      .tile:hover {
+        background: var(--tile-bg-hover, rgba(255, 255, 255, 0.08));
+      }
+
+      .tile:active {
+        transform: scale(0.98);
+      }
+
+      .tile.on {
+        background: var(--tile-color-bg, rgba(255, 179, 0, 0.2));
+      }
+
+      .tile.unavailable {
+        opacity: 0.5;
+      }
+
+      .tile-icon {
+        width: 40px;
+        height: 40px;
+        border-radius: 50%;
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        background: var(--icon-bg, rgba(255, 255, 255, 0.1));
+        color: var(--icon-color, #9e9e9e);
+        flex-shrink: 0;
+      }
+
+      .tile.on .tile-icon {
+        background: var(--tile-color-bg, rgba(255, 179, 0, 0.3));
+        color: var(--tile-color, #ffb300);
+      }
+
+      .tile-icon ha-icon {
+        --mdc-icon-size: 20px;
+      }
+
+      .tile-info {
+        flex: 1;
+        min-width: 0;
+        overflow: hidden;
+        display: flex;
+        flex-direction: column;
+        justify-content: center;
+      }
+
+      .tile-name {
+        font-size: 14px;
+        font-weight: 500;
+        color: var(--primary-text-color, #fff);
+        white-space: normal;
+        display: -webkit-box;
+        -webkit-line-clamp: 2;
+        -webkit-box-orient: vertical;
+        overflow: hidden;
+        line-height: 1.3;
+        max-width: 100%;
+      }
+
+      .tile-state {
+        font-size: 12px;
+        color: var(--secondary-text-color, rgba(255, 255, 255, 0.7));
+        margin-top: 2px;
+      }
+    `;
+  }
+
+  get entity() {
+    return this.hass?.states?.[this.entityId];
+  }
+
+  get isOn() {
+    const state = this.entity?.state;
+    return ["on", "playing", "open", "unlocked", "heat", "cool", "heat_cool", "auto", "cleaning", "returning", "home"].includes(state);
+  }
+
+  get isUnavailable() {
+    return this.entity?.state === "unavailable" || !this.entity;
+  }
+
+  get stateDisplay() {
+    if (this.isUnavailable) return "Unavailable";
+    try {
+      return this.hass.formatEntityState(this.entity);
+    } catch {
+      return this.entity?.state || "Unknown";
+    }
+  }
+
+  get icon() {
+    const domain = this.entityId?.split(".")[0];
+    return this.entity?.attributes?.icon || DOMAIN_ICONS[domain] || "mdi:help-circle";
+  }
+
+  get tileColor() {
+    const domain = this.entityId?.split(".")[0];
+
+    // For RGB lights, use actual color
+    if (domain === "light" && this.isOn) {
+      const rgb = this.entity?.attributes?.rgb_color;
+      if (rgb) {
+        return `rgb(${rgb[0]}, ${rgb[1]}, ${rgb[2]})`;
+      }
+    }
+
+    // Climate: use blue for cooling, orange for heating
+    if (domain === "climate" && this.isOn) {
+      const hvacAction = this.entity?.attributes?.hvac_action;
+      if (hvacAction === "cooling") return DOMAIN_COLORS.climate_cool;
+    }
+
+    // Lock: use green for locked, red for unlocked
+    if (domain === "lock") {
+      return this.entity?.state === "locked"
+        ? DOMAIN_COLORS.lock
+        : DOMAIN_COLORS.lock_unlocked;
+    }
+
+    return DOMAIN_COLORS[domain] || "#9E9E9E";
+  }
+
+  toggle() {
+    if (this.isUnavailable || !this.hass) return;
+    const domain = this.entityId?.split(".")[0];
+
+    if (domain === "scene" || domain === "script") {
+      this.hass.callService(domain, "turn_on", { entity_id: this.entityId });
+    } else if (domain === "button") {
+      this.hass.callService("button", "press", { entity_id: this.entityId });
+    } else if (domain === "lock") {
+      const service = this.entity?.state === "locked" ? "unlock" : "lock";
+      this.hass.callService("lock", service, { entity_id: this.entityId });
+    } else if (TOGGLEABLE_DOMAINS.includes(domain)) {
+      this.hass.callService("homeassistant", "toggle", { entity_id: this.entityId });
+    }
+  }
+
+  openMoreInfo() {
+    const event = new CustomEvent("hass-more-info", {
+      bubbles: true,
+      composed: true,
+      detail: { entityId: this.entityId },
+    });
+    this.dispatchEvent(event);
+  }
+
+  handleClick(e) {
+    e.stopPropagation();
+    this.openMoreInfo();
+  }
+
+  handleLongPress(e) {
+    e.preventDefault();
+    this.openMoreInfo();
+  }
+
+  connectedCallback() {
+    super.connectedCallback();
+    this._longPressTimer = null;
+
+    this._boundHandleTouchStart = this._handleTouchStart.bind(this);
+    this._boundHandleTouchEnd = this._handleTouchEnd.bind(this);
+
+    this.addEventListener("touchstart", this._boundHandleTouchStart);
+    this.addEventListener("touchend", this._boundHandleTouchEnd);
+    this.addEventListener("touchcancel", this._boundHandleTouchEnd);
+  }
+
+  disconnectedCallback() {
+    super.disconnectedCallback();
+
+    if (this._boundHandleTouchStart) {
+      this.removeEventListener("touchstart", this._boundHandleTouchStart);
+    }
+    if (this._boundHandleTouchEnd) {
+      this.removeEventListener("touchend", this._boundHandleTouchEnd);
+      this.removeEventListener("touchcancel", this._boundHandleTouchEnd);
+    }
+
+    if (this._longPressTimer) {
+      clearTimeout(this._longPressTimer);
+      this._longPressTimer = null;
+    }
+  }
+
+  _handleTouchStart(e) {
+    this._longPressTimer = setTimeout(() => {
+      this.openMoreInfo();
+      this._longPressTimer = null;
+    }, 500);
+  }
+
+  _handleTouchEnd(e) {
+    if (this._longPressTimer) {
+      clearTimeout(this._longPressTimer);
+      this._longPressTimer = null;
+    }
+  }
+
+  render() {
+    const entity = this.entity;
+    if (!entity && !this.entityId) return html``;
+
+    const color = this.tileColor;
+    const colorRgb = hexToRgb(color);
+
+    return html`
+      <div
+        class="tile ${this.isOn ? "on" : ""} ${this.isUnavailable ? "unavailable" : ""}"
+        style="--tile-color: ${color}; --tile-color-bg: rgba(${colorRgb}, 0.2); --icon-bg: rgba(${colorRgb}, 0.1);"
+        @click=${this.handleClick}
+        @contextmenu=${this.handleLongPress}
+      >
+        <div class="tile-icon">
+          <ha-icon icon=${this.icon}></ha-icon>
+        </div>
+        <div class="tile-info">
+          <div class="tile-name">${entity?.attributes?.friendly_name || this.entityId}</div>
+          <div class="tile-state">${this.stateDisplay}</div>
+        </div>
+      </div>
+    `;
+  }
+}
+
+customElements.define("cp-base-tile", CpBaseTile);
+
+// ============================================================================
+// SPECIALIZED TILE COMPONENTS
+// ============================================================================
+
+class CpLightTile extends CpBaseTile {
+  get stateDisplay() {
+    if (this.isUnavailable) return "Unavailable";
+    if (!this.isOn) return "Off";
+    const brightness = this.entity?.attributes?.brightness;
+    if (brightness) {
+      return `${Math.round((brightness / 255) * 100)}%`;
+    }
+    return "On";
+  }
+}
+customElements.define("cp-light-tile", CpLightTile);
+
+class CpClimateTile extends CpBaseTile {
+  get stateDisplay() {
+    if (this.isUnavailable) return "Unavailable";
+    const state = this.entity?.state;
+    if (state === "off") return "Off";
+    const currentTemp = this.entity?.attributes?.current_temperature;
+    const targetTemp = this.entity?.attributes?.temperature;
+    if (currentTemp && targetTemp) return `${currentTemp}°C → ${targetTemp}°C`;
+    if (currentTemp) return `${currentTemp}°C`;
+    return state;
+  }
+}
+customElements.define("cp-climate-tile", CpClimateTile);
+
+class CpCoverTile extends CpBaseTile {
+  get stateDisplay() {
+    if (this.isUnavailable) return "Unavailable";
+    const state = this.entity?.state;
+    const position = this.entity?.attributes?.current_position;
+    if (position !== undefined) {
+      if (position === 0) return "Closed";
+      if (position === 100) return "Open";
+      return `${position}%`;
+    }
+    if (state === "open") return "Open";
+    if (state === "closed") return "Closed";
+    if (state === "opening") return "Opening";
+    if (state === "closing") return "Closing";
+    return state;
+  }
+}
+customElements.define("cp-cover-tile", CpCoverTile);
+
+class CpFanTile extends CpBaseTile {
+  static get styles() {
+    return [
+      super.styles,
+      css`
+        .tile-icon.spinning ha-icon {
+          animation: spin 1s linear infinite;
+        }
+        @keyframes spin {
+          from { transform: rotate(0deg); }
+          to { transform: rotate(360deg); }
+        }
+      `,
+    ];
+  }
+
+  get stateDisplay() {
+    if (this.isUnavailable) return "Unavailable";
+    if (!this.isOn) return "Off";
+    const percentage = this.entity?.attributes?.percentage;
+    if (percentage) return `${percentage}%`;
+    return "On";
+  }
+
+  render() {
+    const entity = this.entity;
+    if (!entity && !this.entityId) return html``;
+
+    const color = this.tileColor;
+    const colorRgb = hexToRgb(color);
+
+    return html`
+      <div
+        class="tile ${this.isOn ? "on" : ""} ${this.isUnavailable ? "unavailable" : ""}"
+        style="--tile-color: ${color}; --tile-color-bg: rgba(${colorRgb}, 0.2); --icon-bg: rgba(${colorRgb}, 0.1);"
+        @click=${this.handleClick}
+        @contextmenu=${this.handleLongPress}
+      >
+        <div class="tile-icon ${this.isOn ? "spinning" : ""}">
+          <ha-icon icon=${this.icon}></ha-icon>
+        </div>
+        <div class="tile-info">
+          <div class="tile-name">${entity?.attributes?.friendly_name || this.entityId}</div>
+          <div class="tile-state">${this.stateDisplay}</div>
+        </div>
+      </div>
+    `;
+  }
+}
+customElements.define("cp-fan-tile", CpFanTile);
+
+class CpMediaPlayerTile extends CpBaseTile {
+  get stateDisplay() {
+    if (this.isUnavailable) return "Unavailable";
+    const state = this.entity?.state;
+    const mediaTitle = this.entity?.attributes?.media_title;
+    if (state === "playing" && mediaTitle) return mediaTitle;
+    if (state === "playing") return "Playing";
+    if (state === "paused") return "Paused";
+    if (state === "idle") return "Idle";
+    if (state === "off") return "Off";
+    return state;
+  }
+}
+customElements.define("cp-media-player-tile", CpMediaPlayerTile);
+
+class CpLockTile extends CpBaseTile {
+  get stateDisplay() {
+    if (this.isUnavailable) return "Unavailable";
+    const state = this.entity?.state;
+    if (state === "locked") return "Locked";
+    if (state === "unlocked") return "Unlocked";
+    if (state === "locking") return "Locking";
+    if (state === "unlocking") return "Unlocking";
+    return state;
+  }
+}
+customElements.define("cp-lock-tile", CpLockTile);
+
+class CpVacuumTile extends CpBaseTile {
+  get stateDisplay() {
+    if (this.isUnavailable) return "Unavailable";
+    const state = this.entity?.state;
+    if (state === "cleaning") return "Cleaning";
+    if (state === "docked") return "Docked";
+    if (state === "returning") return "Returning";
+    if (state === "paused") return "Paused";
+    if (state === "idle") return "Idle";
+    if (state === "error") return "Error";
+    return state;
+  }
+}
+customElements.define("cp-vacuum-tile", CpVacuumTile);
+
+class CpSceneTile extends CpBaseTile {
+  get stateDisplay() {
+    const lastChanged = this.entity?.last_changed;
+    if (!lastChanged) return "";
+
+    const date = new Date(lastChanged);
+    const now = new Date();
+    const diff = now - date;
+
+    const minutes = Math.floor(diff / 60000);
+    const hours = Math.floor(diff / 3600000);
+    const days = Math.floor(diff / 86400000);
+
+    if (minutes < 1) return "Just now";
+    if (minutes < 60) return `${minutes}m ago`;
+    if (hours < 24) return `${hours}h ago`;
+    return `${days}d ago`;
+  }
+
+  toggle() {
+    if (!this.hass) return;
+    this.hass.callService("scene", "turn_on", { entity_id: this.entityId });
+  }
+}
+customElements.define("cp-scene-tile", CpSceneTile);
+
+class CpSwitchTile extends CpBaseTile {}
+customElements.define("cp-switch-tile", CpSwitchTile);
+
+class CpSensorTile extends CpBaseTile {
+  get stateDisplay() {
+    if (this.isUnavailable) return "Unavailable";
+    const state = this.entity?.state;
+    const unit = this.entity?.attributes?.unit_of_measurement;
+    return unit ? `${state} ${unit}` : state;
+  }
+
+  toggle() {
+    this.openMoreInfo();
+  }
+}
+customElements.define("cp-sensor-tile", CpSensorTile);
+
+class CpBinarySensorTile extends CpBaseTile {
+  get stateDisplay() {
+    if (this.isUnavailable) return "Unavailable";
+    const state = this.entity?.state;
+    const deviceClass = this.entity?.attributes?.device_class;
+
+    if (deviceClass === "door") return state === "on" ? "Open" : "Closed";
+    if (deviceClass === "window") return state === "on" ? "Open" : "Closed";
+    if (deviceClass === "motion") return state === "on" ? "Detected" : "Clear";
+    if (deviceClass === "occupancy") return state === "on" ? "Occupied" : "Clear";
+
+    return state === "on" ? "On" : "Off";
+  }
+
+  toggle() {
+    this.openMoreInfo();
+  }
+}
+customElements.define("cp-binary-sensor-tile", CpBinarySensorTile);
+
+class CpButtonTile extends CpBaseTile {
+  get stateDisplay() {
+    return "";
+  }
+
+  toggle() {
+    if (!this.hass) return;
+    this.hass.callService("button", "press", { entity_id: this.entityId });
+  }
+}
+customElements.define("cp-button-tile", CpButtonTile);
+
+class CpScriptTile extends CpSceneTile {
+  toggle() {
+    if (!this.hass) return;
+    this.hass.callService("script", "turn_on", { entity_id: this.entityId });
+  }
+}
+customElements.define("cp-script-tile", CpScriptTile);
+
+class CpAutomationTile extends CpSceneTile {
+  get stateDisplay() {
+    if (this.isUnavailable) return "Unavailable";
+    return this.entity?.state === "on" ? "Enabled" : "Disabled";
+  }
+}
+customElements.define("cp-automation-tile", CpAutomationTile);
+
+class CpHumidifierTile extends CpBaseTile {
+  get stateDisplay() {
+    if (this.isUnavailable) return "Unavailable";
+    if (!this.isOn) return "Off";
+    const humidity = this.entity?.attributes?.humidity;
+    if (humidity) return `${humidity}%`;
+    return "On";
+  }
+}
+customElements.define("cp-humidifier-tile", CpHumidifierTile);
+
+// ============================================================================
+// DOMAIN SECTION COMPONENT
+// ============================================================================
+
+class CpDomainSection extends LitElement {
+  static get properties() {
+    return {
+      hass: { type: Object },
+      domain: { type: String },
+      entities: { type: Array },
+      expanded: { type: Boolean },
+      // { kind: "area" | "label", id } when shown inside an area or label
+      scope: { type: Object },
+      _busy: { type: Boolean },
+    };
+  }
+
+  constructor() {
+    super();
+    this.expanded = true;
+    this.scope = null;
+    this._busy = false;
+  }
+
+  static get styles() {
+    return css`
+      :host {
+        display: block;
+        margin-bottom: 16px;
+      }
+
+      .section-header {
+        display: flex;
+        align-items: center;
+        padding: 8px 4px;
+        cursor: pointer;
+        user-select: none;
+      }
+
+      .section-header:hover {
+        background: rgba(255, 255, 255, 0.05);
+        border-radius: 8px;
+      }
+
+      .section-icon {
+        width: 24px;
+        height: 24px;
+        margin-right: 8px;
+        color: var(--secondary-text-color);
+      }
+
+      .section-icon ha-icon {
+        --mdc-icon-size: 20px;
+      }
+
+      .section-title {
+        flex: 1;
+        font-size: 14px;
+        font-weight: 500;
+        color: var(--primary-text-color);
+      }
+
+      .section-action {
+        margin-right: 8px;
+        padding: 4px 12px;
+        border: none;
+        border-radius: 14px;
+        background: rgba(255, 255, 255, 0.08);
+        color: var(--primary-text-color);
+        font-size: 12px;
+        cursor: pointer;
+      }
+
+      .section-action:disabled {
+        opacity: 0.5;
+        cursor: default;
+      }
+
+      .section-arrow {
+        color: var(--secondary-text-color, rgba(255, 255, 255, 0.7));
+        transition: transform 0.2s ease;
+      }
+
+      .section-arrow.collapsed {
+        transform: rotate(-90deg);
+      }
+
+      .section-arrow ha-icon {
+        --mdc-icon-size: 20px;
+      }
+
+      .tiles-grid {
+        display: grid;
+        grid-template-columns: repeat(2, minmax(0, 1fr));
+        gap: 8px;
+        padding-top: 8px;
+      }
+
+      @media (min-width: 600px) {
+        .tiles-grid {
+          grid-template-columns: repeat(3, minmax(0, 1fr));
+        }
+      }
+
+      @media (min-width: 1024px) {
+        .tiles-grid {
+          grid-template-columns: repeat(4, minmax(0, 1fr));
+        }
+      }
+
+      .tiles-grid.collapsed {
+        display: none;
+      }
+    `;
+  }
+
+  _getDomainLabel(domain) {
+    const lang = this.hass?.language || "en";
+    const t = TRANSLATIONS[lang] || TRANSLATIONS.en;
+    return t[domain] || domain;
+  }
+
+  toggleExpanded() {
+    this.expanded = !this.expanded;
+  }
+
+  async _allOff(e) {
+    e.stopPropagation();
+    if (!this.scope || this._busy) return;
+    this._busy = true;
+    try {
+      // One grouped call for the whole domain, resolved server-side
+      await this.hass.callWS({
+        type: `control_panel/${this.scope.kind}_action`,
+        [`${this.scope.kind}_id`]: this.scope.id,
+        domain: this.domain,
+        service: SCOPE_OFF_SERVICES[this.domain],
+      });
+    } catch (err) {
+      console.error("Control panel: scope action failed", err);
+    } finally {
+      this._busy = false;
+    }
+  }
+
+  renderTile(entityId) {
+    const domain = entityId.split(".")[0];
+
+    switch (domain) {
+      case "light":
+        return html`<cp-light-tile .hass=${this.hass} entity-id=${entityId}></cp-light-tile>`;
+      case "climate":
+        return html`<cp-climate-tile .hass=${this.hass} entity-id=${entityId}></cp-climate-tile>`;
+      case "cover":
+        return html`<cp-cover-tile .hass=${this.hass} entity-id=${entityId}></cp-cover-tile>`;
+      case "fan":
+        return html`<cp-fan-tile .hass=${this.hass} entity-id=${entityId}></cp-fan-tile>`;
+      case "media_player":
+        return html`<cp-media-player-tile .hass=${this.hass} entity-id=${entityId}></cp-media-player-tile>`;
+      case "lock":
+        return html`<cp-lock-tile .hass=${this.hass} entity-id=${entityId}></cp-lock-tile>`;
+      case "vacuum":
+        return html`<cp-vacuum-tile .hass=${this.hass} entity-id=${entityId}></cp-vacuum-tile>`;
+      case "scene":
+        return html`<cp-scene-tile .hass=${this.hass} entity-id=${entityId}></cp-scene-tile>`;
+      case "script":
+        return html`<cp-script-tile .hass=${this.hass} entity-id=${entityId}></cp-script-tile>`;
+      case "automation":
+        return html`<cp-automation-tile .hass=${this.hass} entity-id=${entityId}></cp-automation-tile>`;
+      case "switch":
+      case "input_boolean":
+        return html`<cp-switch-tile .hass=${this.hass} entity-id=${entityId}></cp-switch-tile>`;
+      case "sensor":
+        return html`<cp-sensor-tile .hass=${this.hass} entity-id=${entityId}></cp-sensor-tile>`;
+      case "binary_sensor":
+        return html`<cp-binary-sensor-tile .hass=${this.hass} entity-id=${entityId}></cp-binary-sensor-tile>`;
+      case "button":
+        return html`<cp-button-tile .hass=${this.hass} entity-id=${entityId}></cp-button-tile>`;
+      case "humidifier":
+        return html`<cp-humidifier-tile .hass=${this.hass} entity-id=${entityId}></cp-humidifier-tile>`;
+      default:
+        return html`<cp-base-tile .hass=${this.hass} entity-id=${entityId}></cp-base-tile>`;
+    }
+  }
+
+  render() {
+    const icon = DOMAIN_ICONS[this.domain] || "mdi:help-circle";
+    const label = this._getDomainLabel(this.domain);
+
+    return html`
+      <div class="section-header" @click=${this.toggleExpanded}>
+        <div class="section-icon">
+          <ha-icon icon=${icon}></ha-icon>
+        </div>
+        <div class="section-title">${label}</div>
+        ${this.scope && SCOPE_OFF_SERVICES[this.domain]
+          ? html`
+              <button
+                class="section-action"
+                ?disabled=${this._busy}
+                @click=${this._allOff}
+              >${this._getDomainLabel("allOff")}</button>
+            `
+          : ""}
+        <div class="section-arrow ${this.expanded ? "" : "collapsed"}">
+          <ha-icon icon="mdi:chevron-down"></ha-icon>
+        </div>
+      </div>
+      <div class="tiles-grid ${this.expanded ? "" : "collapsed"}">
+        ${this.entities?.map((entityId) => this.renderTile(entityId))}
+      </div>
+    `;
+  }
+}
+
+customElements.define("cp-domain-section", CpDomainSection);
+
+// ============================================================================
+// DOMAIN TABS COMPONENT
+// ============================================================================
+
+class CpDomainTabs extends LitElement {
+  static get properties() {
+    return {
+      hass: { type: Object },
+      domains: { type: Array },
+      selectedDomain: { type: String },
+    };
+  }
+
+  static get styles() {
+    return css`
+      :host { display: block; }
+
+      .tabs-container {
+        display: flex;
+        gap: 8px;
+        overflow-x: auto;
+        padding: 8px 0;
+        scrollbar-width: none;
+      }
+      .tabs-container::-webkit-scrollbar { display: none; }
+
+      .domain-tab {
+        display: flex;
+        align-items: center;
+        gap: 6px;
+        padding: 8px 16px;
+        background: rgba(255, 255, 255, 0.05);
+        border-radius: 20px;
+        cursor: pointer;
+        white-space: nowrap;
+        transition: all 0.2s;
+        border: none;
+        color: var(--primary-text-color);
+        font-size: 13px;
+      }
+
+      .domain-tab:hover {
+        background: rgba(255, 255, 255, 0.1);
+      }
+
+      .domain-tab.active {
+        background: var(--primary-color);
+        color: var(--text-primary-color-on-primary, #fff);
+      }
+
+      .tab-icon { --mdc-icon-size: 18px; }
+      .tab-count {
+        font-size: 11px;
+        background: rgba(0,0,0,0.2);
+        padding: 2px 6px;
+        border-radius: 10px;
+      }
+    `;
+  }
+
+  _t(key) {
+    const lang = this.hass?.language || "en";
+    const t = TRANSLATIONS[lang] || TRANSLATIONS.en;
+    return t[key] || key;
+  }
+
+  _handleTabClick(domain) {
+    this.dispatchEvent(new CustomEvent('domain-tab-selected', {
+      bubbles: true, composed: true,
+      detail: { domain }
+    }));
+  }
+
+  _getIcon(domain) {
+    if (domain === 'all') return 'mdi:view-grid';
+    return DOMAIN_ICONS[domain] || 'mdi:help';
+  }
+
+  _getLabel(domain) {
+    if (domain === 'all') return this._t('all');
+    return this._t(domain) || domain;
+  }
+
+  render() {
+    return html`
+      <div class="tabs-container">
+        ${this.domains?.map(d => html`
+          <button class="domain-tab ${d.domain === this.selectedDomain ? 'active' : ''}"
+                  @click=${() => this._handleTabClick(d.domain)}>
+            <ha-icon class="tab-icon" icon=${this._getIcon(d.domain)}></ha-icon>
+            <span>${this._getLabel(d.domain)}</span>
+            <span class="tab-count">${d.count}</span>
+          </button>
+        `)}
+      </div>
+    `;
+  }
+}
+
+customElements.define("cp-domain-tabs", CpDomainTabs);
+
+// ============================================================================
+// SEARCH BAR COMPONENT
+// ============================================================================
+
+class CpSearchBar extends LitElement {
+  static get properties() {
+    return {
+      value: { type: String },
+      placeholder: { type: String },
+    };
+  }
+
+  static get styles() {
+    return css`
+      :host { display: block; margin-bottom: 16px; }
+
+      .search-container {
+        display: flex;
+        align-items: center;
+        background: var(--card-background-color, rgba(255,255,255,0.05));
+        border-radius: 28px;
+        padding: 0 16px;
+        height: 48px;
+        border: 1px solid var(--divider-color, rgba(255,255,255,0.1));
+      }
+
+      .search-container:focus-within {
+        border-color: var(--primary-color);
+      }
+
+      .search-icon {
+        color: var(--secondary-text-color);
+        --mdc-icon-size: 20px;
+        margin-right: 12px;
+      }
+
+      input {
+        flex: 1;
+        border: none;
+        background: transparent;
+        font-size: 14px;
+        color: var(--primary-text-color);
+        outline: none;
+      }
+
+      input::placeholder {
+        color: var(--secondary-text-color);
+      }
+
+      .clear-btn {
+        background: none;
+        border: none;
+        color: var(--secondary-text-color);
+        cursor: pointer;
+        padding: 4px;
+        display: flex;
+        --mdc-icon-size: 18px;
+      }
+
+      .clear-btn:hover {
+        color: var(--primary-text-color);
+      }
+    `;
+  }
+
+  _handleInput(e) {
+    this.dispatchEvent(new CustomEvent('search-changed', {
+      bubbles: true, composed: true,
+      detail: { value: e.target.value }
+    }));
+  }
+
+  _handleClear() {
+    this.dispatchEvent(new CustomEvent('search-changed', {
+      bubbles: true, composed: true,
+      detail: { value: '' }
+    }));
+  }
+
+  render() {
+    return html`
+      <div class="search-container">
+        <ha-icon class="search-icon" icon="mdi:magnify"></ha-icon>
+        <input type="text"
+               .value=${this.value || ''}
+               placeholder=${this.placeholder || 'Search...'}
+               @input=${this._handleInput}>
+        ${this.value ? html`
+          <button class="clear-btn" @click=${this._handleClear}>
+            <ha-icon icon="mdi:close"></ha-icon>
+          </button>
+        ` : ''}
+      </div>
+    `;
+  }
+}
+
+customElements.define("cp-search-bar", CpSearchBar);
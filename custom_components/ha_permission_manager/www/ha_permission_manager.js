@@ -149,10 +149,14 @@ const I18N = {
       areas: "Areas",
       labels: "Labels",
       panels: "Panels",
+      floors: "Floors",
+      devices: "Devices",
     },
     resourceDescriptions: {
       areas: "Controls which areas appear in the Control Panel. The Control Panel is automatically created by Permission Manager and cannot be customized by users.",
       labels: "Controls which labels appear in the Control Panel. The Control Panel is automatically created by Permission Manager and cannot be customized by users.",
+      floors: "Granting a floor grants every area on it, including areas added to the floor later.",
+      devices: "Grants a single device's entities without granting its whole area.",
     },
     accessDenied: "Access Denied",
     accessDeniedMessage: "You don't have permission to view this panel.",
@@ -180,10 +184,14 @@ const I18N = {
       areas: "区域",
       labels: "标签",
       panels: "面板",
+      floors: "楼层",
+      devices: "设备",
     },
     resourceDescriptions: {
       areas: "控制哪些区域会显示在控制面板中。控制面板由权限管理器自动创建，用户无法自定义。",
       labels: "控制哪些标签会显示在控制面板中。控制面板由权限管理器自动创建，用户无法自定义。",
+      floors: "授予楼层权限即授予该楼层的所有区域，包括之后添加到该楼层的区域。",
+      devices: "仅授予单个设备的实体，而不授予其整个区域。",
     },
     accessDenied: "访问被拒绝",
     accessDeniedMessage: "您没有权限查看此面板。",
@@ -211,10 +219,14 @@ const I18N = {
       areas: "區域",
       labels: "標籤",
       panels: "面板",
+      floors: "樓層",
+      devices: "裝置",
     },
     resourceDescriptions: {
       areas: "控制哪些區域會顯示在控制面板中。控制面板由權限管理器自動建立，用戶無法自訂。",
       labels: "控制哪些標籤會顯示在控制面板中。控制面板由權限管理器自動建立，用戶無法自訂。",
+      floors: "授予樓層權限即授予該樓層的所有區域，包括之後加入該樓層的區域。",
+      devices: "僅授予單一裝置的實體，而不授予其整個區域。",
     },
     accessDenied: "存取被拒絕",
     accessDeniedMessage: "您沒有權限檢視此面板。",
@@ -240,9 +252,11 @@ const PERMISSION_LEVELS = [
 ];
 
 // Resource type configuration (keys match backend resource types with 's' suffix)
-// Order: Panels first (most commonly restricted), then Areas, then Labels
-const RESOURCE_TYPE_KEYS = ["panels", "areas", "labels"];
+// Order: Panels first (most commonly restricted), then Floors, Areas, Labels, Devices
+const RESOURCE_TYPE_KEYS = ["panels", "floors", "areas", "labels", "devices"];
 const RESOURCE_TYPE_ICONS = {
+  devices: "mdi:devices",
+  floors: "mdi:home-floor-1",
   areas: "mdi:floor-plan",
   labels: "mdi:tag",
   panels: "mdi:view-dashboard",
@@ -410,6 +424,8 @@ class HaPermissionManager extends LitElement {
       panel: "panel_",
       area: "area_",
       label: "label_",
+      floor: "floor_",
+      device: "device_",
     };
     const prefix = prefixMap[resourceType] || "";
     const fullResourceId = prefix + resourceId;
@@ -431,6 +447,8 @@ class HaPermissionManager extends LitElement {
       panel: "panel_",
       area: "area_",
       label: "label_",
+      floor: "floor_",
+      device: "device_",
     };
     const prefix = prefixMap[resourceType] || "";
     const fullResourceId = prefix + resourceId;
@@ -1016,7 +1034,7 @@ class HaPermissionManager extends LitElement {
                   <span class="count">${resources.length} ${i18n.items}</span>
                 </div>
 
-                ${(currentTab?.key === 'areas' || currentTab?.key === 'labels') && i18n.resourceDescriptions?.[currentTab.key]
+                ${['areas', 'labels', 'floors', 'devices'].includes(currentTab?.key) && i18n.resourceDescriptions?.[currentTab.key]
                   ? html`
                       <div class="card-description">
                         <ha-icon icon="mdi:information-outline"></ha-icon>
@@ -1091,7 +1109,9 @@ class HaPermissionManager extends LitElement {
 
   _renderPermissionCell(user, resource) {
     const currentLevel = this._getPermission(user.id, resource.id, resource.type);
-    const prefixMap = { panel: "panel_", area: "area_", label: "label_" };
+    const prefixMap = {
+      panel: "panel_", area: "area_", label: "label_", floor: "floor_", device: "device_",
+    };
     const prefix = prefixMap[resource.type] || "";
     const savingKey = `${user.id}_${prefix}${resource.id}`;
     const isSaving = this._saving[savingKey];
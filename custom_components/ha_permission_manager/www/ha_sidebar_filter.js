@@ -45,13 +45,18 @@
     }
   };
 
+  // Core panels that should NEVER be hidden
+  // - profile: user needs access to logout
+  const ALWAYS_VISIBLE_PANELS = ["profile"];
+
   // State
-  let originalPanels = null;  // Stored once on first load
+  let originalPanels = null;  // Unfiltered panels by id (shallow copy)
+  let appliedPanels = null;   // Panels object last assigned to hass.panels
+  let lastPermissions = null; // Panel permissions last applied
   let currentUserId = null;
   let isAdmin = false;
   let initialized = false;
   let lastLanguage = null;
-  let lastPermissionHash = null;
   let hassObserverSetup = false;
 
   /**
@@ -59,11 +64,12 @@
    */
   function resetState() {
     originalPanels = null;
+    appliedPanels = null;
+    lastPermissions = null;
     currentUserId = null;
     isAdmin = false;
     initialized = false;
     lastLanguage = null;
-    lastPermissionHash = null;
   }
 
   /**
@@ -106,20 +112,97 @@
     });
   }
 
+  /**
+   * Pick up the unfiltered panels when HA (re)loads them.
+   * HA replaces hass.panels when panels change, so any panels object other
+   * than the one this filter assigned is the full list. Panel objects are
+   * kept by reference, not copied.
+   * Returns true if HA reloaded the panels since the last call.
+   */
+  function syncOriginalPanels(haMain) {
+    const panels = haMain.hass.panels;
+    if (panels === appliedPanels) return false;
+    originalPanels = { ...panels };
+    appliedPanels = panels; // Currently showing every panel
+    return true;
+  }
+
   /**
    * Store original panels on first load (before any filtering)
    */
   async function storeOriginalPanels() {
-    if (originalPanels) return originalPanels;
-
     const hass = await waitForHass();
     if (!hass || !hass.panels) return null;
 
-    // Deep copy the original panels
-    originalPanels = JSON.parse(JSON.stringify(hass.panels));
+    syncOriginalPanels(document.querySelector("home-assistant"));
     return originalPanels;
   }
 
+  /**
+   * Whether a panel is shown for the given permissions
+   */
+  function isPanelVisible(panelId, permissions, admin) {
+    // Admin users see all panels; never hide core panels like profile
+    if (admin || ALWAYS_VISIBLE_PANELS.includes(panelId)) return true;
+
+    // Fail-secure: only show panels with explicit permission > 0
+    // Hide panels that are undefined or explicitly set to 0
+    const level = permissions[panelId];
+    return level !== undefined && level > PERM_DENY;
+  }
+
+  /**
+   * Return the panel ids whose permission differs, or null if unknown
+   */
+  function changedPanelIds(oldPermissions, newPermissions) {
+    if (!oldPermissions) return null;
+    const changed = [];
+    for (const panelId of Object.keys(oldPermissions)) {
+      if (oldPermissions[panelId] !== newPermissions[panelId]) changed.push(panelId);
+    }
+    for (const panelId of Object.keys(newPermissions)) {
+      if (!(panelId in oldPermissions)) changed.push(panelId);
+    }
+    return changed;
+  }
+
+  /**
+   * Show or hide the panels whose visibility changed, keyed by panel id.
+   * Only the affected entries of hass.panels are added or removed; the
+   * panels object is replaced (not copied deeply) so the sidebar updates.
+   * panelIds limits the check to those panels (null = all panels).
+   * Returns false if the sidebar could not be patched.
+   */
+  function applyPanelPermissions(permissions, admin, panelIds = null) {
+    const haMain = document.querySelector("home-assistant");
+    if (!haMain?.hass?.panels) return false;
+
+    // Panels reloaded by HA start out unfiltered: check all of them
+    if (syncOriginalPanels(haMain)) panelIds = null;
+
+    let panels = null;
+    for (const panelId of panelIds || Object.keys(originalPanels)) {
+      const panel = originalPanels[panelId];
+      if (!panel) continue;
+
+      const visible = isPanelVisible(panelId, permissions, admin);
+      if (visible === (panelId in appliedPanels)) continue;
+
+      if (!panels) panels = { ...appliedPanels };
+      if (visible) {
+        panels[panelId] = panel;
+      } else {
+        delete panels[panelId];
+      }
+    }
+
+    if (panels) {
+      appliedPanels = panels;
+      haMain.hass = { ...haMain.hass, panels };
+    }
+    return true;
+  }
+
   /**
    * Fetch permissions from WebSocket API
    */
@@ -142,14 +225,15 @@
       };
     } catch (err) {
       console.error("[SidebarFilter] Failed to fetch permissions:", err);
-      return { permissions: {}, is_admin: false, user_id: null };
+      return { permissions: {}, is_admin: false, user_id: null, failed: true };
     }
   }
 
   /**
    * Apply sidebar filtering
+   * Uses already fetched permissions when given.
    */
-  async function applySidebarFilter() {
+  async function applySidebarFilter(fetched = null) {
     const haMain = document.querySelector("home-assistant");
     if (!haMain || !haMain.hass) {
       return;
@@ -163,60 +247,52 @@
     }
 
     // Fetch permissions from backend
-    const { permissions, is_admin } = await fetchPermissions();
+    const { permissions, is_admin } = fetched || await fetchPermissions();
 
-    // Admin users see all panels
-    if (is_admin) {
-      haMain.hass = { ...haMain.hass, panels: { ...originalPanels } };
-      return;
-    }
-
-    // Core panels that should NEVER be hidden
-    // - profile: user needs access to logout
-    const ALWAYS_VISIBLE_PANELS = ["profile"];
-
-    // For non-admin users, filter panels
-    // ONLY hide panels that are explicitly set to 0 (DENY)
-    // All other panels (undefined, 1, 2, 3) are shown
-    const filteredPanels = {};
-    let hiddenCount = 0;
-    const hiddenPanels = [];
+    applyPanelPermissions(permissions, is_admin);
+    lastPermissions = permissions;
+  }
 
-    for (const [panelId, panel] of Object.entries(originalPanels)) {
-      // Never hide core panels like profile
-      if (ALWAYS_VISIBLE_PANELS.includes(panelId)) {
-        filteredPanels[panelId] = panel;
-        continue;
-      }
+  /**
+   * Fetch permissions and apply only what changed since the last check.
+   * Reloading the page is the last resort, used only when admin status
+   * changed and the sidebar could not be patched.
+   */
+  async function refreshPermissions(force = false) {
+    const wasAdmin = isAdmin;
+    const fetched = await fetchPermissions();
+    if (fetched.failed) return;
 
-      const level = permissions[panelId];
+    const adminChanged = fetched.is_admin !== wasAdmin;
+    const haMain = document.querySelector("home-assistant");
+    const panelsReloaded = haMain?.hass?.panels && haMain.hass.panels !== appliedPanels;
 
-      // Fail-secure: only show panels with explicit permission > 0
-      // Hide panels that are undefined or explicitly set to 0
-      if (level !== undefined && level > PERM_DENY) {
-        filteredPanels[panelId] = panel;
-      } else {
-        // undefined or 0 = hide
-        hiddenPanels.push(panelId);
-        hiddenCount++;
-      }
+    let panelIds = changedPanelIds(lastPermissions, fetched.permissions);
+    if (force || adminChanged || panelsReloaded) {
+      panelIds = null;
+    } else if (panelIds && panelIds.length === 0) {
+      return;
     }
 
-    // Apply filtered panels
-    haMain.hass = { ...haMain.hass, panels: filteredPanels };
+    lastPermissions = fetched.permissions;
+    if (!applyPanelPermissions(fetched.permissions, fetched.is_admin, panelIds)) {
+      if (adminChanged) location.reload();
+      return;
+    }
+    await checkCurrentPanelAccess(fetched.permissions);
   }
 
   /**
    * Check current URL and block access if denied
    * v2.9.26: Added hideAccessDenied() call when panel is accessible
    */
-  async function checkCurrentPanelAccess() {
+  async function checkCurrentPanelAccess(knownPermissions = null) {
     if (isAdmin) {
       hideAccessDenied(); // Admin 用戶，確保移除 Access Denied
       return;
     }
 
-    const { permissions } = await fetchPermissions();
+    const permissions = knownPermissions || (await fetchPermissions()).permissions;
 
     const path = window.location.pathname;
 
@@ -273,7 +349,8 @@
     if (!customElements.get("ha-access-denied")) {
       const script = document.createElement("script");
       script.type = "module";
-      script.src = "/local/ha_access_denied.js?v=" + Date.now();
+      // Resolved next to this script; revalidated by ETag instead of re-downloaded
+      script.src = new URL("ha_access_denied.js", import.meta.url).href;
       document.head.appendChild(script);
     }
 
@@ -358,34 +435,12 @@
     if (!hass || !hass.connection) return;
 
     // Listen for user_updated events (when admin status changes in HA)
-    hass.connection.subscribeEvents(async (event) => {
-      // Check if current user's admin status changed
-      const oldIsAdmin = isAdmin;
-      const { is_admin } = await fetchPermissions();
-
-      if (oldIsAdmin !== is_admin) {
-        // Force reload to reset all state
-        location.reload();
-        return;
-      }
-
-      // Even if admin status didn't change, re-apply filter in case permissions changed
-      await applySidebarFilter();
-    }, "user_updated");
+    hass.connection.subscribeEvents(() => refreshPermissions(), "user_updated");
 
     // Listen for auth events (login/logout, permission changes)
-    hass.connection.subscribeEvents(async (event) => {
-      // Re-check admin status and permissions
-      const oldIsAdmin = isAdmin;
-      const { is_admin } = await fetchPermissions();
-
-      if (oldIsAdmin !== is_admin) {
-        location.reload();
-        return;
-      }
-
-      await applySidebarFilter();
-    }, "homeassistant_auth_updated");
+    hass.connection.subscribeEvents(
+      () => refreshPermissions(), "homeassistant_auth_updated"
+    );
 
     // Listen for lovelace dashboard changes (create/delete)
     hass.connection.subscribeEvents(async (event) => {
@@ -395,34 +450,15 @@
         // Wait a bit for backend to update permissions
         await new Promise(r => setTimeout(r, 500));
 
-        // Refresh originalPanels from current hass.panels
-        const haMain = document.querySelector("home-assistant");
-        if (haMain && haMain.hass && haMain.hass.panels) {
-          originalPanels = JSON.parse(JSON.stringify(haMain.hass.panels));
-        }
-
-        // Re-apply filter with new permissions
-        await applySidebarFilter();
+        // Re-check every panel; panels reloaded by HA are picked up as the
+        // new originals
+        await refreshPermissions(true);
       }
     }, "lovelace_updated");
 
-    // Poll every 5 seconds to detect permission changes (replaces dead entity subscriptions)
-    setInterval(async () => {
-      const oldIsAdmin = isAdmin;
-      const { permissions, is_admin } = await fetchPermissions();
-
-      if (oldIsAdmin !== is_admin) {
-        location.reload();
-        return;
-      }
-
-      const newHash = JSON.stringify(permissions);
-      if (newHash !== lastPermissionHash) {
-        lastPermissionHash = newHash;
-        await applySidebarFilter();
-        await checkCurrentPanelAccess();
-      }
-    }, 5000);
+    // Poll every 5 seconds to detect permission changes (replaces dead entity
+    // subscriptions); only panels whose permission changed are patched
+    setInterval(() => refreshPermissions(), 5000);
 
     // Listen for language changes via core_config_updated event
     hass.connection.subscribeEvents(async (event) => {
@@ -546,7 +582,8 @@
     let anyUpdated = false;
 
     // Create a copy of panels to modify
-    const updatedPanels = { ...haMain.hass.panels };
+    const currentPanels = haMain.hass.panels;
+    const updatedPanels = { ...currentPanels };
 
     for (const panelId of panelsToUpdate) {
       const panel = updatedPanels[panelId];
@@ -557,12 +594,17 @@
       // Only update if title actually changed
       if (panel.title !== title) {
         updatedPanels[panelId] = { ...panel, title: title };
+        if (originalPanels && originalPanels[panelId] === panel) {
+          originalPanels[panelId] = updatedPanels[panelId];
+        }
         anyUpdated = true;
       }
     }
 
     // Trigger reactive update by assigning new hass object if any panel was updated
     if (anyUpdated) {
+      // Keep treating the filtered panels as ours (see syncOriginalPanels)
+      if (currentPanels === appliedPanels) appliedPanels = updatedPanels;
       haMain.hass = { ...haMain.hass, panels: updatedPanels };
     }
 
@@ -659,8 +701,8 @@
     }
 
     // Fetch permissions BEFORE filtering to enable restricted-panel redirect
-    const { permissions: initPerms } = await fetchPermissions();
-    lastPermissionHash = JSON.stringify(initPerms);
+    const fetched = await fetchPermissions();
+    const initPerms = fetched.permissions;
 
     // Redirect away from restricted panel BEFORE filtering hass.panels
     // This prevents partial-panel-resolver from getting stuck with _initialLoadDone=false
@@ -682,11 +724,11 @@
       }
     }
 
-    await applySidebarFilter();
+    await applySidebarFilter(fetched);
 
     watchNavigation();
     await subscribeToChanges();
-    await checkCurrentPanelAccess();
+    await checkCurrentPanelAccess(initPerms);
 
     // Permission check complete - remove loading overlay
     removeLoadingOverlay();
@@ -0,0 +1 @@
+"""Tests for ha_permission_manager."""
@@ -0,0 +1,85 @@
+"""Tests for audit log queries."""
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.ha_permission_manager import audit
+from custom_components.ha_permission_manager.audit import AuditLog
+
+
+@pytest.fixture
+def audit_log(hass: HomeAssistant, tmp_path, monkeypatch) -> AuditLog:
+    """Return an audit log writing to a temporary directory.
+
+    Only the newest 5 entries stay in memory and segments hold a few
+    entries each, so queries read both memory and several segments.
+    """
+    monkeypatch.setattr(audit, "MEMORY_ENTRIES", 5)
+    monkeypatch.setattr(audit, "SEGMENT_BYTES", 600)
+    hass.config.config_dir = str(tmp_path)
+    return AuditLog(hass)
+
+
+async def record(audit_log: AuditLog, count: int) -> None:
+    """Record count entries alternating between two users, then flush."""
+    for number in range(count):
+        audit_log.async_record(
+            "set_permission",
+            actor="admin",
+            user_id="alice" if number % 2 else "bob",
+            resource_id=f"area_{number}",
+            old=0,
+            new=1,
+        )
+    await audit_log.async_flush()
+
+
+async def all_pages(audit_log: AuditLog, **filters) -> list[list[int]]:
+    """Follow next_cursor and return the entry IDs of every page."""
+    pages = []
+    cursor = None
+    while True:
+        entries, cursor = await audit_log.async_query(
+            limit=4, cursor=cursor, **filters
+        )
+        pages.append([entry["id"] for entry in entries])
+        if cursor is None:
+            return pages
+
+
+async def test_cursor_pages_through_memory_and_segments(audit_log: AuditLog):
+    """Pages are newest first, without gaps or repeats."""
+    await record(audit_log, 18)
+    assert len(audit_log.recent) == 5
+    assert len(audit_log._segments) > 1
+
+    assert await all_pages(audit_log) == [
+        [18, 17, 16, 15],
+        [14, 13, 12, 11],
+        [10, 9, 8, 7],
+        [6, 5, 4, 3],
+        [2, 1],
+    ]
+
+
+async def test_cursor_pages_with_filter(audit_log: AuditLog):
+    """Filtered pages only contain matching entries."""
+    await record(audit_log, 18)
+
+    assert await all_pages(audit_log, user_id="alice") == [
+        [18, 16, 14, 12],
+        [10, 8, 6, 4],
+        [2],
+    ]
+    assert await all_pages(audit_log, resource_id="area_3") == [[4]]
+
+
+async def test_last_page_exactly_full(audit_log: AuditLog):
+    """A page ending on the oldest entry has no next cursor."""
+    await record(audit_log, 8)
+
+    assert await all_pages(audit_log) == [[8, 7, 6, 5], [4, 3, 2, 1]]
+
+
+async def test_empty_log(audit_log: AuditLog):
+    """An empty log returns one empty page."""
+    assert await audit_log.async_query() == ([], None)
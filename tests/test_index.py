@@ -0,0 +1,51 @@
+"""Tests for the search token index."""
+from custom_components.ha_permission_manager.index import PrefixIndex, tokenize
+
+
+def test_tokenize_splits_and_casefolds():
+    """Names are split on separators and compared case-insensitively."""
+    assert tokenize("Living Room_Lamp") == {"living", "room", "lamp"}
+    assert tokenize(None) == set()
+    assert tokenize("") == set()
+
+
+def test_match_prefix_and_exact():
+    """A term matches tokens it prefixes; exact matches are flagged."""
+    index = PrefixIndex()
+    index.set("light.kitchen", {"kitchen", "light"})
+    index.set("light.kit", {"kit"})
+    index.set("sensor.hall", {"hall"})
+
+    assert index.match("kit") == {"light.kitchen": False, "light.kit": True}
+    assert index.match("kitchen") == {"light.kitchen": True}
+    assert index.match("h") == {"sensor.hall": False}
+    assert index.match("z") == {}
+
+
+def test_exact_match_wins_over_prefix_match():
+    """A key matching one token exactly and another by prefix is exact."""
+    index = PrefixIndex()
+    index.set("light.a", {"lamp", "lampshade"})
+
+    assert index.match("lamp") == {"light.a": True}
+
+
+def test_set_replaces_and_discard_removes():
+    """Re-setting a key drops its old tokens; discard drops the key."""
+    index = PrefixIndex()
+    index.set("light.a", {"desk"})
+    index.set("light.b", {"desk"})
+    assert len(index) == 1
+
+    index.set("light.a", {"floor"})
+    assert index.match("desk") == {"light.b": True}
+    assert index.match("floor") == {"light.a": True}
+
+    index.discard("light.b")
+    index.discard("light.unknown")
+    assert index.match("desk") == {}
+    assert len(index) == 1
+
+    index.set("light.a", set())
+    assert index.match("floor") == {}
+    assert len(index) == 0
@@ -0,0 +1,66 @@
+"""Tests for command rate limiting."""
+import pytest
+
+from custom_components.ha_permission_manager import ratelimit
+from custom_components.ha_permission_manager.ratelimit import RateLimiter, TokenBucket
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    """Replace the monotonic clock used by the token buckets."""
+    clock = FakeClock()
+    monkeypatch.setattr(ratelimit.time, "monotonic", clock)
+    return clock
+
+
+def test_bucket_starts_full_and_empties(clock: FakeClock):
+    """A new bucket allows a burst, then refuses."""
+    bucket = TokenBucket(rate=1.0, burst=3, updated=clock.now)
+
+    assert [bucket.take() for _ in range(4)] == [True, True, True, False]
+
+
+def test_bucket_refills_at_rate(clock: FakeClock):
+    """Tokens come back at rate per second."""
+    bucket = TokenBucket(rate=2.0, burst=2, updated=clock.now)
+    assert bucket.take() and bucket.take()
+    assert not bucket.take()
+
+    clock.now += 0.25
+    assert not bucket.take()
+    clock.now += 0.25
+    assert bucket.take()
+    assert not bucket.take()
+
+
+def test_bucket_refill_is_capped_at_burst(clock: FakeClock):
+    """A long pause refills the bucket only up to burst."""
+    bucket = TokenBucket(rate=10.0, burst=2, updated=clock.now)
+    bucket.take()
+
+    clock.now += 60
+    assert [bucket.take() for _ in range(3)] == [True, True, False]
+
+
+def test_limits_and_registered_commands():
+    """Limits can be changed or removed; registered commands are tracked."""
+    limiter = RateLimiter()
+    limiter.register("area_control/get_permitted_areas")
+
+    limiter.set_limit("area_control/get_permitted_areas", (5.0, 20))
+    assert limiter.limits["area_control/get_permitted_areas"] == (5.0, 20)
+    limiter.set_limit("area_control/get_permitted_areas", None)
+    assert "area_control/get_permitted_areas" not in limiter.limits
+    assert limiter.commands == {"area_control/get_permitted_areas"}
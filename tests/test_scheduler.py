@@ -0,0 +1,95 @@
+"""Tests for schedule window evaluation."""
+from datetime import datetime, timedelta
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.ha_permission_manager.scheduler import (
+    is_schedule_active,
+    next_transition,
+)
+
+# 2026-10-19 is a Monday
+MONDAY = datetime(2026, 10, 19, tzinfo=dt_util.UTC)
+
+
+def at(day: int, hour: int, minute: int = 0) -> datetime:
+    """Return a UTC time day days after MONDAY."""
+    return MONDAY + timedelta(days=day, hours=hour, minutes=minute)
+
+
+@pytest.fixture(autouse=True)
+def utc_time_zone():
+    """Evaluate naive schedule times as UTC."""
+    original = dt_util.DEFAULT_TIME_ZONE
+    dt_util.set_default_time_zone(dt_util.UTC)
+    yield
+    dt_util.set_default_time_zone(original)
+
+
+def test_unbounded_schedule_is_always_active():
+    """A schedule without bounds or recurrence never changes."""
+    schedule = {"valid_from": None, "valid_until": None, "recurrence": None}
+
+    assert is_schedule_active(schedule, at(0, 12))
+    assert next_transition(schedule, at(0, 12)) is None
+
+
+def test_validity_range():
+    """A schedule is active from valid_from up to (not including) valid_until."""
+    schedule = {
+        "valid_from": "2026-10-19T08:00:00",
+        "valid_until": "2026-10-19T18:00:00",
+    }
+
+    assert not is_schedule_active(schedule, at(0, 7))
+    assert next_transition(schedule, at(0, 7)) == at(0, 8)
+    assert is_schedule_active(schedule, at(0, 8))
+    assert next_transition(schedule, at(0, 8)) == at(0, 18)
+    assert not is_schedule_active(schedule, at(0, 18))
+
+
+def test_expired_schedule_has_no_transition():
+    """Once valid_until has passed nothing changes any more."""
+    schedule = {"valid_until": "2026-10-19T18:00:00"}
+
+    assert not is_schedule_active(schedule, at(1, 0))
+    assert next_transition(schedule, at(1, 0)) is None
+    assert next_transition(schedule, at(0, 18)) is None
+
+
+def test_recurring_window_crossing_midnight():
+    """A window ending before it starts runs into the next day."""
+    schedule = {"recurrence": {"start": "22:00", "end": "06:00"}}
+
+    assert not is_schedule_active(schedule, at(0, 12))
+    assert next_transition(schedule, at(0, 12)) == at(0, 22)
+    assert is_schedule_active(schedule, at(0, 23))
+    assert next_transition(schedule, at(0, 23)) == at(1, 6)
+    # Inside the window that started yesterday
+    assert is_schedule_active(schedule, at(1, 5, 59))
+    assert not is_schedule_active(schedule, at(1, 6))
+
+
+def test_recurring_window_weekdays():
+    """A window only starts on its weekdays, but may end the day after."""
+    schedule = {"recurrence": {"start": "22:00", "end": "02:00", "weekdays": [0]}}
+
+    assert is_schedule_active(schedule, at(0, 22))
+    assert is_schedule_active(schedule, at(1, 1))
+    assert not is_schedule_active(schedule, at(1, 22))
+    assert next_transition(schedule, at(1, 2)) == at(7, 22)
+
+
+def test_recurring_window_within_validity_range():
+    """Recurring windows only apply inside the validity range."""
+    schedule = {
+        "valid_until": "2026-10-20T00:00:00",
+        "recurrence": {"start": "22:00", "end": "06:00"},
+    }
+
+    assert is_schedule_active(schedule, at(0, 23))
+    # The window is cut short at valid_until
+    assert next_transition(schedule, at(0, 23)) == at(1, 0)
+    assert not is_schedule_active(schedule, at(1, 1))
+    assert next_transition(schedule, at(1, 1)) is None
@@ -0,0 +1,101 @@
+"""Tests for permission snapshots."""
+from homeassistant.core import HomeAssistant
+
+from custom_components.ha_permission_manager import snapshots
+from custom_components.ha_permission_manager.const import DOMAIN
+from custom_components.ha_permission_manager.snapshots import (
+    PermissionSnapshots,
+    apply_delta,
+    compute_delta,
+    diff_permissions,
+)
+
+BASE = {
+    "alice": {"area_kitchen": 1, "panel_energy": 1},
+    "bob": {"area_kitchen": 0},
+    "carol": {"label_lights": 1},
+}
+
+
+def test_delta_round_trip():
+    """Applying the delta to the base gives the matrix back."""
+    permissions = {
+        # Changed, added and removed cells
+        "alice": {"area_kitchen": 0, "area_hall": 1},
+        # Unchanged user
+        "bob": {"area_kitchen": 0},
+        # New user; carol is removed
+        "dave": {"panel_energy": 1},
+    }
+
+    delta = compute_delta(BASE, permissions)
+
+    assert delta == {
+        "alice": {"area_kitchen": 0, "area_hall": 1, "panel_energy": None},
+        "dave": {"panel_energy": 1},
+        "carol": None,
+    }
+    assert apply_delta(BASE, delta) == permissions
+
+
+def test_empty_delta_and_no_aliasing():
+    """An unchanged matrix has an empty delta; applying copies the base."""
+    assert compute_delta(BASE, BASE) == {}
+
+    permissions = apply_delta(BASE, {})
+    permissions["alice"]["area_kitchen"] = 0
+
+    assert BASE["alice"]["area_kitchen"] == 1
+
+
+def test_diff_permissions():
+    """Differing cells are listed sorted, with None for missing cells."""
+    new = {"alice": {"area_kitchen": 0, "panel_energy": 1}}
+
+    assert diff_permissions(BASE, new) == [
+        {"user_id": "alice", "resource_id": "area_kitchen", "old": 1, "new": 0},
+        {"user_id": "bob", "resource_id": "area_kitchen", "old": 0, "new": None},
+        {"user_id": "carol", "resource_id": "label_lights", "old": 1, "new": None},
+    ]
+
+
+async def test_snapshots_survive_rebase(hass: HomeAssistant):
+    """Every snapshot returns the matrix it was taken of."""
+    hass.data[DOMAIN] = {"permissions": {}}
+    store = PermissionSnapshots(hass)
+    matrices = [
+        {"alice": {"area_kitchen": 1}},
+        {"alice": {"area_kitchen": 1}, "bob": {"area_kitchen": 1}},
+        # Rewrites most cells, so the base is rebased
+        {f"user_{number}": {"panel_energy": 1} for number in range(10)},
+        {"alice": {"area_kitchen": 0}},
+    ]
+    snapshot_ids = []
+    for number, matrix in enumerate(matrices):
+        hass.data[DOMAIN]["permissions"] = matrix
+        snapshot_ids.append(store.async_create(f"snapshot {number}")["snapshot_id"])
+
+    for snapshot_id, matrix in zip(snapshot_ids, matrices):
+        assert store.async_get_permissions(snapshot_id) == matrix
+    assert store.async_get_permissions("unknown") is None
+    await hass.async_block_till_done()
+
+
+async def test_automatic_snapshots_have_their_own_limit(
+    hass: HomeAssistant, monkeypatch
+):
+    """Automatic snapshots never push out the ones admins saved."""
+    monkeypatch.setattr(snapshots, "MAX_SNAPSHOTS", 3)
+    monkeypatch.setattr(snapshots, "MAX_AUTO_SNAPSHOTS", 2)
+    hass.data[DOMAIN] = {"permissions": BASE}
+    store = PermissionSnapshots(hass)
+
+    for number in range(4):
+        store.async_create(f"manual {number}")
+    for number in range(5):
+        store.async_create(f"auto {number}", auto=True)
+
+    assert [snapshot["name"] for snapshot in store.async_list()] == [
+        "auto 4", "auto 3", "manual 3", "manual 2", "manual 1",
+    ]
+    await hass.async_block_till_done()
@@ -0,0 +1,96 @@
+"""Tests for live area and label summaries."""
+from homeassistant.core import HomeAssistant, State
+from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.ha_permission_manager.index import ScopeIndex
+from custom_components.ha_permission_manager.summary import (
+    Contribution,
+    ScopeSummaries,
+    ScopeSummary,
+    state_contribution,
+)
+
+
+def test_state_contribution():
+    """Each kind of state contributes to its own counter."""
+    assert state_contribution(State("light.a", "on")) == Contribution(on_domain="light")
+    assert state_contribution(State("light.a", "off")) == Contribution()
+    assert state_contribution(
+        State("media_player.tv", "playing")
+    ) == Contribution(on_domain="media_player")
+    assert state_contribution(State("cover.blind", "opening")) == Contribution(
+        cover_open=True
+    )
+    assert state_contribution(
+        State("binary_sensor.front", "on", {"device_class": "door"})
+    ) == Contribution(door_open=True)
+    assert state_contribution(
+        State("binary_sensor.motion", "on", {"device_class": "motion"})
+    ) == Contribution()
+    assert state_contribution(
+        State("sensor.temp", "21.5", {"device_class": "temperature"})
+    ) == Contribution(temperature=21.5)
+    assert state_contribution(
+        State("sensor.hum", "40", {"device_class": "humidity"})
+    ) == Contribution(humidity=40.0)
+
+
+def test_state_contribution_ignores_missing_values():
+    """Unavailable, unknown and non-numeric states contribute nothing."""
+    assert state_contribution(None) == Contribution()
+    assert state_contribution(State("light.a", "unavailable")) == Contribution()
+    assert state_contribution(State("cover.blind", "unknown")) == Contribution()
+    assert state_contribution(
+        State("sensor.temp", "warm", {"device_class": "temperature"})
+    ) == Contribution()
+
+
+def test_add_and_subtract():
+    """Contributions add up, average, and subtract back to empty."""
+    summary = ScopeSummary()
+    contributions = [
+        Contribution(on_domain="light"),
+        Contribution(on_domain="light"),
+        Contribution(cover_open=True),
+        Contribution(temperature=20.0),
+        Contribution(temperature=23.0),
+    ]
+    for contribution in contributions:
+        summary.add(contribution, 1)
+
+    assert summary.as_dict() == {
+        "on": {"light": 2},
+        "covers_open": 1,
+        "doors_open": 0,
+        "temperature": 21.5,
+        "humidity": None,
+    }
+    assert not summary.is_empty()
+
+    for contribution in contributions:
+        summary.add(contribution, -1)
+
+    assert summary.is_empty()
+    assert summary.as_dict() == ScopeSummary().as_dict()
+
+
+async def test_empty_summaries_are_dropped(hass: HomeAssistant):
+    """A scope whose last contributing entity turns off is removed."""
+    area = ar.async_get(hass).async_create("Kitchen")
+    entity_registry = er.async_get(hass)
+    entry = entity_registry.async_get_or_create("light", "test", "kitchen")
+    entity_registry.async_update_entity(entry.entity_id, area_id=area.id)
+    index = ScopeIndex(hass)
+    index.async_setup()
+    summaries = ScopeSummaries(hass, index)
+    summaries.async_setup()
+
+    hass.states.async_set(entry.entity_id, "on")
+    await hass.async_block_till_done()
+    assert summaries.get("area", area.id)["on"] == {"light": 1}
+
+    hass.states.async_set(entry.entity_id, "off")
+    await hass.async_block_till_done()
+    assert ("area", area.id) not in summaries.summaries
+    assert summaries.get("area", area.id) == ScopeSummary().as_dict()
@@ -0,0 +1,100 @@
+"""Tests for import validation."""
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers import label_registry as lr
+
+from custom_components.ha_permission_manager.transfer import async_validate_import
+
+
+async def test_validate_import(hass: HomeAssistant):
+    """Known items are kept; unknown and malformed ones are reported."""
+    user = await hass.auth.async_create_user("Alice")
+    area = ar.async_get(hass).async_create("Kitchen")
+    label = lr.async_get(hass).async_create("Lights")
+    hass.data["frontend_panels"] = {"energy": object()}
+    schedule = {
+        "user_id": user.id,
+        "resource_id": f"area_{area.id}",
+        "level": 1,
+        "valid_from": "2026-10-19T08:00:00",
+        "valid_until": None,
+        "recurrence": {"start": "22:00", "end": "06:00", "weekdays": [0, 1]},
+    }
+
+    valid, report = await async_validate_import(hass, {
+        "permissions": {
+            user.id: {
+                f"area_{area.id}": 1,
+                f"label_{label.label_id}": 0,
+                "panel_energy": 1,
+                "area_gone": 1,
+                "panel_energy_x": 2,
+            },
+            "ghost": {"panel_energy": 1},
+        },
+        "roles": {
+            "staff": {
+                "name": "Staff",
+                "permissions": {f"area_{area.id}": 1},
+                "members": [user.id, "ghost"],
+            },
+            "bad id": {"name": "Bad", "permissions": {}, "members": []},
+            "no_name": {"permissions": {}, "members": []},
+        },
+        "schedules": {
+            "night": schedule,
+            "bad/id": schedule,
+            "bad_date": {**schedule, "valid_until": "tomorrow"},
+            "bad_window": {**schedule, "recurrence": {"start": "25:00", "end": "06:00"}},
+            "bad_level": {**schedule, "level": True},
+        },
+    })
+
+    assert valid == {
+        "permissions": {
+            user.id: {
+                f"area_{area.id}": 1,
+                f"label_{label.label_id}": 0,
+                "panel_energy": 1,
+            },
+        },
+        "roles": {
+            "staff": {
+                "name": "Staff",
+                "permissions": {f"area_{area.id}": 1},
+                "members": [user.id],
+            },
+        },
+        "schedules": {"night": schedule},
+    }
+    assert report == {
+        "unknown_users": ["ghost"],
+        "unknown_resources": ["area_gone"],
+        "invalid": [
+            f"permissions/{user.id}/panel_energy_x",
+            "roles/bad id",
+            "roles/no_name",
+            "schedules/bad/id",
+            "schedules/bad_date",
+            "schedules/bad_window",
+            "schedules/bad_level",
+        ],
+    }
+
+
+async def test_validate_import_rejects_malformed_sections(hass: HomeAssistant):
+    """Grants and roles that are not mappings are reported as invalid."""
+    user = await hass.auth.async_create_user("Alice")
+
+    valid, report = await async_validate_import(hass, {
+        "permissions": {user.id: ["panel_energy"]},
+        "roles": {"staff": "Staff"},
+        "schedules": {"night": None},
+    })
+
+    assert valid == {"permissions": {user.id: {}}, "roles": {}, "schedules": {}}
+    assert report["invalid"] == [
+        f"permissions/{user.id}",
+        "roles/staff",
+        "schedules/night",
+    ]